@@ -0,0 +1,5 @@
+import sys
+
+from basicbot.cli import main
+
+sys.exit(main())
@@ -0,0 +1,168 @@
+"""Single command line entry point: ``python -m basicbot <scrape|dashboard|bench|migrate>``.
+
+Every subcommand imports its dependencies only when it runs, so ``--help``,
+``migrate`` and ``bench`` never pay for discord, selenium or Flask.
+"""
+import argparse
+import importlib
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# Module each subcommand loads, used by `bench startup`
+SUBCOMMAND_MODULES = {
+    "scrape": "auto_scraper",
+    "dashboard": "dashboard",
+    "migrate": "storage",
+    "bench": "database",
+}
+
+IMPORTTIME_RE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)")
+
+# ============================== SUBCOMMANDS ==============================
+def cmd_scrape(args):
+    module = importlib.import_module("manual_scraper" if args.manual else "auto_scraper")
+    module.main()
+    return 0
+
+def cmd_dashboard(args):
+    import dashboard
+    dashboard.main(host=args.host, port=args.port, debug=args.debug)
+    return 0
+
+def cmd_migrate(args):
+    import storage
+    try:
+        manager = storage.get_manager(args.db)
+        print(f"{args.db or storage.DB_FILE}: schema version {storage.schema_version(manager.connection())}")
+        if args.import_legacy:
+            posts, comments = storage.import_legacy(args.import_legacy, db_file=args.db)
+            print(f"Imported {posts} posts and {comments} comments from {args.import_legacy}")
+    finally:
+        storage.close_all()
+    return 0
+
+def cmd_bench(args):
+    names = args.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}. Choose from: {', '.join(BENCHMARKS)}", file=sys.stderr)
+        return 2
+    for name in names:
+        print(f"== {name}")
+        BENCHMARKS[name](args)
+    return 0
+
+# ============================== BENCHMARKS ==============================
+def import_time(module):
+    """Return the cumulative import time of `module` in milliseconds, measured in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match and not match.group(2) and match.group(3) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+def bench_startup(args):
+    """Import cost of each subcommand's module, via -X importtime."""
+    for command, module in SUBCOMMAND_MODULES.items():
+        try:
+            print(f"{command:<10} {module:<14} {import_time(module):8.1f} ms")
+        except RuntimeError as ex:
+            print(f"{command:<10} {module:<14} failed: {ex}")
+
+def bench_database(args):
+    """Bulk insert, lookup and export throughput of Database."""
+    from database import Database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(db_name=os.path.join(tmp, "bench.db"))
+        rows = args.rows
+        try:
+            start = time.perf_counter()
+            db.insert_posts_many(("Reddit", f"id{i}", "bench", "content", "") for i in range(rows))
+            _report("insert_posts_many", rows, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            db.existing_post_ids(f"id{i}" for i in range(0, 2 * rows, 2))
+            _report("existing_post_ids", rows, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            db.export_posts(os.path.join(tmp, "posts.csv"))
+            _report("export_posts (csv)", rows, time.perf_counter() - start)
+        finally:
+            db.close()
+
+# Representative result-card text per platform for the normalize benchmark
+SAMPLE_POSTS = {
+    "Twitter": ("Jane Dev\n@janedev\n·\n5m\nHiring a python expert for a scraper, $40-$60/hr. DM me\n12\n3\n1.2K\nShow more",
+                "https://x.com/janedev/status/{i}?s=20"),
+    "LinkedIn": ("Jane Doe\n• 2nd\nFounder at Acme\n3d •\nNeed automation help, budget $2k. jane@example.com\n…see more\n45\n3 comments",
+                 "https://www.linkedin.com/feed/update/urn:li:activity:{i}/?trk=feed"),
+    "Reddit": ("r/forhire\nPosted by u/someone\n[Hiring] Python developer for a trading bot\n5 hours ago\n12 comments",
+               "/r/forhire/comments/{i}/hiring_python_developer/"),
+    "Upwork": ("Python scraper\nPosted 2 hours ago\nHourly: $30.00-$50.00\nBuild a Selenium scraper\nPayment verified\nProposals: 5 to 10",
+               "/jobs/Python-scraper_~01{i:016x}/?referrer=search"),
+}
+
+def bench_normalize(args):
+    """Throughput of the lead normalization stage over synthetic result pages."""
+    from normalize import normalize_page
+
+    for platform, (text, link) in SAMPLE_POSTS.items():
+        page = [(text, link.format(i=i), "Python scraper") for i in range(10_000_000, 10_000_000 + args.posts)]
+        start = time.perf_counter()
+        normalize_page(platform, page)
+        _report(f"normalize {platform}", args.posts, time.perf_counter() - start)
+
+def _report(label, count, seconds):
+    print(f"{label:<22} {count:>9} rows {seconds:8.3f} s {count / seconds if seconds else 0:>12,.0f} rows/s")
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "database": bench_database,
+    "normalize": bench_normalize,
+}
+
+# ============================== PARSER ==============================
+def build_parser():
+    parser = argparse.ArgumentParser(prog="basicbot", description="Trading leads scraper and dashboard.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    scrape = subcommands.add_parser("scrape", help="Run the scrapers and Discord alerts.")
+    scrape.add_argument("--manual", action="store_true", help="Use the manual-review scraper.")
+    scrape.set_defaults(func=cmd_scrape)
+
+    dashboard = subcommands.add_parser("dashboard", help="Serve the leads dashboard.")
+    dashboard.add_argument("--host", default="127.0.0.1")
+    dashboard.add_argument("--port", type=int, default=5000)
+    dashboard.add_argument("--debug", action="store_true")
+    dashboard.set_defaults(func=cmd_dashboard)
+
+    bench = subcommands.add_parser("bench", help="Run micro-benchmarks.")
+    bench.add_argument("benchmarks", nargs="*", metavar="NAME",
+                       help=f"Benchmarks to run ({', '.join(BENCHMARKS)}); default all.")
+    bench.add_argument("--rows", type=int, default=100_000, help="Rows for database benchmarks.")
+    bench.add_argument("--posts", type=int, default=20_000, help="Posts per platform for the normalize benchmark.")
+    bench.set_defaults(func=cmd_bench)
+
+    migrate = subcommands.add_parser("migrate", help="Apply pending schema migrations.")
+    migrate.add_argument("--db", help="Database file (default: LEADS_DB or leads.db).")
+    migrate.add_argument("--import-legacy", metavar="PATH", help="Also copy posts/comments from a scraper_data.db.")
+    migrate.set_defaults(func=cmd_migrate)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -1,11 +1,4 @@
-from pathlib import Path
-import sys
+"""Re-export of the project settings as ``basicbot.config``."""
+from config import Config, ConfigError, PlatformSettings, config
 
-# Ensure the parent directory (project root) is in the path
-ROOT_DIR = Path(__file__).resolve().parents[1]
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
-
-from config import Config, config  # type: ignore
-
-__all__ = ["Config", "config"]
+__all__ = ["Config", "ConfigError", "PlatformSettings", "config"]
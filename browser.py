@@ -0,0 +1,257 @@
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+from config import config
+from memory import RecyclingDriver
+
+PAGE_LOAD_TIMEOUT = 20  # Seconds to wait for a page or its results to render
+
+# Requests the lean browser never makes: we only read text and links
+BLOCKED_URL_PATTERNS = [
+    # Images, fonts and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.m4a",
+    "*pbs.twimg.com/media*", "*video.twimg.com*", "*i.redd.it*", "*preview.redd.it*",
+    "*v.redd.it*", "*media.licdn.com*",
+    # Analytics and ad trackers
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*ads-twitter.com*", "*analytics.twitter.com*", "*scorecardresearch.com*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*", "*hotjar.com*", "*alb.reddit.com*",
+]
+
+# Content settings value 2 = block
+LEAN_CONTENT_SETTINGS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.managed_default_content_settings.notifications": 2,
+    "profile.managed_default_content_settings.geolocation": 2,
+}
+
+LEAN_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--autoplay-policy=user-gesture-required",
+    "--mute-audio",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--no-first-run",
+]
+
+# Files copied from the configured profile so logged-in sessions survive, without
+# dragging caches, history and extensions into every scrape
+PROFILE_SEED_PATHS = [
+    "Local State",
+    os.path.join("Default", "Preferences"),
+    os.path.join("Default", "Cookies"),
+    os.path.join("Default", "Network", "Cookies"),
+    os.path.join("Default", "Login Data"),
+    os.path.join("Default", "Web Data"),
+    os.path.join("Default", "Local Storage"),
+]
+
+def seed_profile(source_dir, target_dir=None):
+    """Create a trimmed copy of the Chrome profile at `source_dir` holding only session state.
+
+    Returns the path of the new profile directory.
+    """
+    target_dir = target_dir or tempfile.mkdtemp(prefix="lean-chrome-")
+    for relative in PROFILE_SEED_PATHS:
+        source = os.path.join(source_dir, relative)
+        target = os.path.join(target_dir, relative)
+        if os.path.isdir(source):
+            shutil.copytree(source, target, dirs_exist_ok=True)
+        elif os.path.isfile(source):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(source, target)
+    return target_dir
+
+class BrowserMetrics:
+    """Accumulates bytes transferred, load time and JS heap per page for one browser session."""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.pages = 0
+        self.bytes = 0
+        self.load_seconds = 0.0
+        self.peak_heap = 0
+
+    def record(self, driver, elapsed, navigation=True):
+        """Add one page view. Pass navigation=False for in-page (SPA) navigations such as a search."""
+        self.pages += 1
+        self.load_seconds += elapsed
+        try:
+            # Resource timings are cleared after each read so SPA pages are not counted twice
+            transferred = driver.execute_script(
+                "const entries = performance.getEntriesByType('resource')"
+                ".concat(arguments[0] ? performance.getEntriesByType('navigation') : []);"
+                "const total = entries.reduce((sum, e) => sum + (e.transferSize || 0), 0);"
+                "performance.clearResourceTimings();"
+                "return total;",
+                navigation,
+            )
+            self.bytes += int(transferred or 0)
+            metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+            heap = next((m["value"] for m in metrics if m["name"] == "JSHeapUsedSize"), 0)
+            self.peak_heap = max(self.peak_heap, int(heap))
+        except WebDriverException as ex:
+            logging.debug(f"Could not read page metrics: {ex}")
+
+    def summary(self):
+        if not self.pages:
+            return {"mode": self.mode, "pages": 0}
+        return {
+            "mode": self.mode,
+            "pages": self.pages,
+            "kib_per_page": self.bytes / self.pages / 1024,
+            "seconds_per_page": self.load_seconds / self.pages,
+            "peak_js_heap_mib": self.peak_heap / 1024 / 1024,
+        }
+
+class ScraperChrome(webdriver.Chrome):
+    """Chrome driver that reports its page metrics and removes its temporary profile on quit."""
+
+    profile_dir = None
+    metrics = None
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            if self.metrics and self.metrics.pages:
+                s = self.metrics.summary()
+                logging.info(
+                    f"Browser ({s['mode']}): {s['pages']} pages, {s['kib_per_page']:.0f} KiB/page, "
+                    f"{s['seconds_per_page']:.2f}s/page, peak JS heap {s['peak_js_heap_mib']:.1f} MiB"
+                )
+            if self.profile_dir:
+                shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+def get_driver(lean=None):
+    """Setup and return a Selenium Chrome WebDriver using configuration settings.
+
+    In lean mode (config.LEAN_BROWSER) images, fonts, media and trackers are
+    blocked, the window is a fixed small viewport and Chrome runs on a trimmed
+    temporary copy of CHROME_PROFILE_PATH.
+    """
+    lean = config.LEAN_BROWSER if lean is None else lean
+    options = Options()
+    if config.HEADLESS_MODE:
+        options.add_argument("--headless")
+    profile_dir = None
+    if lean:
+        options.add_argument(f"--window-size={config.BROWSER_WINDOW_SIZE}")
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", LEAN_CONTENT_SETTINGS)
+        if config.CHROME_PROFILE_PATH and os.path.isdir(config.CHROME_PROFILE_PATH):
+            profile_dir = seed_profile(config.CHROME_PROFILE_PATH)
+            options.add_argument(f"user-data-dir={profile_dir}")
+    else:
+        options.add_argument("--start-maximized")
+        if config.CHROME_PROFILE_PATH:
+            options.add_argument(f"user-data-dir={config.CHROME_PROFILE_PATH}")
+    try:
+        service = Service(ChromeDriverManager().install())
+        driver = ScraperChrome(service=service, options=options)
+    except BaseException:
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    driver.profile_dir = profile_dir
+    driver.metrics = BrowserMetrics("lean" if lean else "full")
+    if lean:
+        try:
+            # Request interception: blocked URLs never leave the browser
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except BaseException:
+            driver.quit()  # Also removes the temporary profile
+            raise
+    logging.info(f"Chrome WebDriver initialized ({driver.metrics.mode} mode).")
+    return driver
+
+def managed_driver(on_start=None, lean=None):
+    """Context manager for a driver that is always quit and is restarted when memory passes MEMORY_CEILING_MB.
+
+    `on_start(driver)` runs after every start, so a recycled browser can reopen its page.
+    """
+    return RecyclingDriver(lambda: get_driver(lean=lean), on_start=on_start)
+
+def wait_for_page(driver, timeout=PAGE_LOAD_TIMEOUT):
+    """Block until the current document has finished loading."""
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+
+def wait_for_elements(driver, xpath, timeout=PAGE_LOAD_TIMEOUT):
+    """Wait for at least one element matching `xpath`. Returns False if none appeared in time."""
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.XPATH, xpath)))
+        return True
+    except TimeoutException:
+        return False
+
+def load_page(driver, url, timeout=PAGE_LOAD_TIMEOUT):
+    """Navigate to `url` and wait for it to finish loading."""
+    start = time.monotonic()
+    driver.get(url)
+    wait_for_page(driver, timeout)
+    if getattr(driver, "metrics", None) is not None:
+        driver.metrics.record(driver, time.monotonic() - start)
+
+def submit_search(driver, input_xpath, text, results_xpath, timeout=PAGE_LOAD_TIMEOUT):
+    """Type `text` into the search box at `input_xpath`, submit it and wait for its results to render.
+
+    Results left over from the previous search must go stale first, so they are
+    never read as this search's. Raises TimeoutException when no new results
+    appear, so rate-limited callers retry the search.
+    """
+    start = time.monotonic()
+    previous = driver.find_elements(By.XPATH, results_xpath)
+    search_box = driver.find_element(By.XPATH, input_xpath)
+    search_box.clear()
+    search_box.send_keys(text)
+    search_box.send_keys(Keys.RETURN)
+    if previous:
+        try:
+            WebDriverWait(driver, timeout).until(EC.staleness_of(previous[0]))
+        except TimeoutException:
+            raise TimeoutException(f"Results for {text!r} did not replace the previous search after {timeout}s")
+    if not wait_for_elements(driver, results_xpath, timeout):
+        raise TimeoutException(f"No results for {text!r} after {timeout}s")
+    if getattr(driver, "metrics", None) is not None:
+        driver.metrics.record(driver, time.monotonic() - start, navigation=False)
+
+def compare_modes(urls):
+    """Load `urls` in a full and then a lean browser and return both metric summaries."""
+    results = []
+    for lean in (False, True):
+        with get_driver(lean=lean) as driver:
+            for url in urls:
+                load_page(driver, url)
+            results.append(driver.metrics.summary())
+    return results
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    for summary in compare_modes(sys.argv[1:] or ["https://www.reddit.com/search/?q=trading%20bot"]):
+        print(summary)
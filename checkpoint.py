@@ -0,0 +1,179 @@
+import logging
+import sqlite3
+import threading
+import time
+
+import storage
+from config import config
+
+ALL_QUERIES = "*"  # Unit recorded when a platform's whole scrape finished
+
+class CycleJournal:
+    """Durable record of scrape progress, so a restarted bot resumes instead of starting over.
+
+    A cycle is a run over every enabled platform. Each finished (platform,
+    query) unit is recorded as it completes; a cycle left unfinished by a crash
+    is resumed by the next `begin_cycle()` unless it is older than
+    CHECKPOINT_MAX_AGE_MINUTES. New leads are saved together with the alert
+    and draft reply they still owe, in one transaction, and `recover()` replays
+    whatever was owed when the process died.
+    """
+
+    def __init__(self, db_file=None, clock=time.time):
+        self.db_file = db_file
+        self.clock = clock
+        self.cycle_id = None
+        self.resumed = False
+        self._done = set()
+        self._lock = threading.Lock()
+
+    @property
+    def manager(self):
+        return storage.get_manager(self.db_file)
+
+    # ------------------------------ cycles ------------------------------
+    def begin_cycle(self):
+        """Start a cycle, or resume the one a crash interrupted. Returns the cycle id."""
+        conn = self.manager.connection()
+        row = conn.execute(
+            """SELECT id, MAX(started_at, COALESCE((SELECT MAX(completed_at) FROM cycle_units WHERE cycle_id = cycles.id), 0))
+            FROM cycles WHERE finished_at IS NULL ORDER BY id DESC LIMIT 1"""
+        ).fetchone()
+        now = self.clock()
+        if row is not None and now - row[1] <= config.CHECKPOINT_MAX_AGE_MINUTES * 60:
+            cycle_id = row[0]
+            done = {tuple(unit) for unit in conn.execute(
+                "SELECT platform, query FROM cycle_units WHERE cycle_id = ?", (cycle_id,)
+            )}
+            logging.info(
+                f"Resuming interrupted cycle {cycle_id} after {now - row[1]:.0f}s down: "
+                f"{len(done)} completed units will be skipped."
+            )
+            resumed = True
+        else:
+            if row is not None:
+                logging.info(f"Interrupted cycle {row[0]} is too old to resume; starting over.")
+            cycle_id = self.manager.write(self._start_cycle, now)
+            done = set()
+            resumed = False
+        with self._lock:
+            self.cycle_id, self.resumed, self._done = cycle_id, resumed, done
+        return cycle_id
+
+    @staticmethod
+    def _start_cycle(conn, now):
+        conn.execute("UPDATE cycles SET finished_at = ? WHERE finished_at IS NULL", (now,))
+        # Only the running cycle's units are ever read back
+        conn.execute("DELETE FROM cycle_units")
+        return conn.execute("INSERT INTO cycles (started_at) VALUES (?)", (now,)).lastrowid
+
+    def finish_cycle(self):
+        """Mark the current cycle complete, so the next start begins a fresh one."""
+        with self._lock:
+            cycle_id, self.cycle_id, self._done = self.cycle_id, None, set()
+        if cycle_id is not None:
+            self.manager.write(lambda conn: conn.execute(
+                "UPDATE cycles SET finished_at = ? WHERE id = ?", (self.clock(), cycle_id)
+            ))
+
+    # ------------------------------ units ------------------------------
+    def is_done(self, platform, query=ALL_QUERIES):
+        with self._lock:
+            return (platform.lower(), query) in self._done
+
+    def remaining(self, platform, queries):
+        """The `queries` of `platform` this cycle has not completed yet, in order."""
+        with self._lock:
+            done = {query for name, query in self._done if name == platform.lower()}
+        skipped = [query for query in queries if query in done]
+        if skipped:
+            logging.info(f"Skipping {len(skipped)} {platform} queries already done this cycle.")
+        return [query for query in queries if query not in done]
+
+    def complete(self, platform, query=ALL_QUERIES):
+        """Record that `platform`/`query` finished in the current cycle."""
+        with self._lock:
+            cycle_id = self.cycle_id
+            self._done.add((platform.lower(), query))
+        if cycle_id is not None:
+            self.manager.write(lambda conn: conn.execute(
+                "INSERT OR REPLACE INTO cycle_units (cycle_id, platform, query, completed_at) VALUES (?, ?, ?, ?)",
+                (cycle_id, platform.lower(), query, self.clock())
+            ))
+
+    # ------------------------------ deliveries ------------------------------
+    def save_lead(self, platform, post_id, title, content, link, alert=True, draft=False, **details):
+        """Save a lead and the deliveries it owes atomically.
+
+        Returns the pending delivery as a dict (platform, post_id, title,
+        content, link, alert, draft), or None if the lead already existed.
+        """
+        pending = {"platform": platform, "post_id": post_id, "title": title, "content": content, "link": link,
+                   "alert": int(alert), "draft": int(draft)}
+
+        def write(conn):
+            storage.insert_lead(conn, platform, post_id, title, content, link, **details)
+            if alert or draft:
+                conn.execute(
+                    """INSERT OR REPLACE INTO pending_leads (post_id, platform, title, content, link, alert, draft, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (post_id, platform, title, content, link, int(alert), int(draft), self.clock())
+                )
+
+        try:
+            self.manager.write(write)
+        except sqlite3.IntegrityError:
+            logging.info(f"Duplicate lead found, skipping: {platform} | {post_id}")
+            return None
+        logging.info(f"New lead saved: {platform} | {post_id}")
+        return pending
+
+    def resolve(self, post_id, kind):
+        """Record that the lead's `kind` ("alert" or "draft") delivery is done. Safe to call from any thread."""
+        if kind not in ("alert", "draft"):
+            raise ValueError(f"Unknown delivery kind: {kind}")
+
+        def write(conn):
+            conn.execute(f"UPDATE pending_leads SET {kind} = 0 WHERE post_id = ?", (post_id,))
+            conn.execute("DELETE FROM pending_leads WHERE post_id = ? AND alert = 0 AND draft = 0", (post_id,))
+
+        return self.manager.submit(write)
+
+    def pending(self):
+        """Deliveries still owed, oldest first, as dicts like `save_lead` returns."""
+        rows = self.manager.connection().execute(
+            "SELECT platform, post_id, title, content, link, alert, draft FROM pending_leads ORDER BY created_at"
+        ).fetchall()
+        keys = ("platform", "post_id", "title", "content", "link", "alert", "draft")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def recover(self, dispatch):
+        """Replay owed deliveries through `dispatch(pending)` and report what was recovered.
+
+        Returns a dict with the replayed alert and draft counts and the seconds spent.
+        """
+        start = time.monotonic()
+        alerts = drafts = 0
+        for pending in self.pending():
+            try:
+                dispatch(pending)
+            except Exception as ex:
+                logging.error(f"Could not replay delivery for {pending['platform']} | {pending['post_id']}: {ex}")
+                continue
+            alerts += pending["alert"]
+            drafts += pending["draft"]
+        report = {"alerts": alerts, "drafts": drafts, "seconds": time.monotonic() - start}
+        if alerts or drafts:
+            logging.info(f"Recovered {alerts} alerts and {drafts} drafts in {report['seconds']:.2f}s.")
+        return report
+
+_journal = None
+_journal_lock = threading.Lock()
+
+def get_journal():
+    """Return the process-wide CycleJournal for the leads database."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = CycleJournal()
+        return _journal
@@ -1,77 +1,316 @@
+import json
+import logging
 import os
+import threading
+from typing import NamedTuple
+
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+class ConfigError(ValueError):
+    """Raised when settings cannot be parsed or fail validation."""
+
+# ============================== PARSERS & CHECKS ==============================
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "1", "yes", "on"):
+        return True
+    if text in ("false", "0", "no", "off", ""):
+        return False
+    raise ValueError(f"expected true/false, got {value!r}")
+
+def parse_list(value):
+    if isinstance(value, (list, tuple)):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+def positive(value):
+    return None if value > 0 else "must be greater than 0"
+
+def non_negative(value):
+    return None if value >= 0 else "must be 0 or greater"
+
+def numeric_id(value):
+    return None if not value or value.isdigit() else "must be a numeric ID"
+
+def one_of(*choices):
+    def check(value):
+        return None if value in choices else f"must be one of {', '.join(choices)}"
+    return check
+
+class Setting:
+    """Declares a typed setting: parser, default, optional check and environment variable (the attribute name)."""
+
+    def __init__(self, parse, default, check=None):
+        self.parse = parse
+        self.default = default
+        self.check = check
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        # Loaded values live in the instance __dict__; class access returns the declaration
+        return self
+
+    def resolve(self, sources, errors):
+        raw = next((source[self.name] for source in sources if self.name in source), self.default)
+        try:
+            value = self.parse(raw) if raw is not None else None
+        except (TypeError, ValueError) as ex:
+            errors.append(f"{self.name}={raw!r}: {ex}")
+            return self.parse(self.default) if self.default is not None else None
+        problem = self.check(value) if self.check and value is not None else None
+        if problem:
+            errors.append(f"{self.name}={raw!r}: {problem}")
+        return value
+
+# ============================== PLATFORMS ==============================
+# (login env var, password env var) per platform with stored credentials
+CREDENTIAL_ENV = {
+    name: (f"{name.upper()}_USERNAME" if name == "reddit" else f"{name.upper()}_EMAIL", f"{name.upper()}_PASSWORD")
+    for name in ("linkedin", "reddit", "facebook", "tiktok", "quora", "stocktwits", "tradingview", "discord",
+                 "seekingalpha")
+}
+SCRAPED_PLATFORMS = ("twitter", "linkedin", "reddit", "upwork")
+FETCH_BACKENDS = ("browser", "http")
+HTTP_BACKEND_PLATFORMS = ("reddit",)  # Platforms with a JSON API fetch path
+
+class PlatformSettings(NamedTuple):
+    """Per-platform scraping knobs; unset values fall back to the global settings."""
+
+    name: str
+    enabled: bool = True
+    concurrency: int = 1  # Requests allowed back-to-back before pacing kicks in
+    rate_limit_per_minute: float = 12.0  # Starting rate for the platform's hosts
+    rate_limit_max_per_minute: float = 60.0  # Cap the adaptive rate never grows past
+    queries: tuple = ()  # Empty: use the scraper's built-in keywords
+    fetch_backend: str = "browser"
+    email: str = ""
+    password: str = ""
+
+def _platform_settings(name, environ, overrides, defaults, errors):
+    prefix = name.upper()
+    source = {key.upper(): value for key, value in overrides.get(name, {}).items()}
+    sources = (source, {k[len(prefix) + 1:]: v for k, v in environ.items() if k.startswith(prefix + "_")})
+
+    def value(key, parse, default, check=None):
+        setting = Setting(parse, default, check)
+        setting.name = key
+        return setting.resolve(sources, errors)
+
+    login_env, password_env = CREDENTIAL_ENV.get(name, ("", ""))
+    backend = value("FETCH_BACKEND", str, "browser", one_of(*FETCH_BACKENDS))
+    if backend == "http" and name not in HTTP_BACKEND_PLATFORMS:
+        errors.append(f"{prefix}_FETCH_BACKEND: http is only supported for {', '.join(HTTP_BACKEND_PLATFORMS)}")
+    rate = value("RATE_LIMIT_PER_MINUTE", float, defaults["RATE_LIMIT_PER_MINUTE"], positive)
+    max_rate = value("RATE_LIMIT_MAX_PER_MINUTE", float, defaults["RATE_LIMIT_MAX_PER_MINUTE"], positive)
+    if rate is not None and max_rate is not None and rate > max_rate:
+        errors.append(f"{prefix}_RATE_LIMIT_PER_MINUTE must not exceed {prefix}_RATE_LIMIT_MAX_PER_MINUTE ({max_rate:g})")
+    return PlatformSettings(
+        name=name,
+        enabled=value("ENABLED", parse_bool, True),
+        concurrency=value("CONCURRENCY", int, 1, positive),
+        rate_limit_per_minute=rate,
+        rate_limit_max_per_minute=max_rate,
+        queries=tuple(value("QUERIES", parse_list, [])),
+        fetch_backend=backend,
+        email=environ.get(login_env, "") if login_env else "",
+        password=environ.get(password_env, "") if password_env else "",
+    )
+
+# ============================== CONFIG ==============================
 class Config:
-    """Configuration settings for the Social Media Lead Generation tool."""
-
-    # Social Media Credentials (For automation & scraping)
-    SOCIAL_MEDIA_CREDENTIALS = {
-        "linkedin": {
-            "email": os.getenv("LINKEDIN_EMAIL", ""),
-            "password": os.getenv("LINKEDIN_PASSWORD", ""),
-        },
-        "reddit": {
-            "email": os.getenv("REDDIT_USERNAME", ""),
-            "password": os.getenv("REDDIT_PASSWORD", ""),
-        },
-        "facebook": {
-            "email": os.getenv("FACEBOOK_EMAIL", ""),
-            "password": os.getenv("FACEBOOK_PASSWORD", ""),
-        },
-        "tiktok": {
-            "email": os.getenv("TIKTOK_EMAIL", ""),
-            "password": os.getenv("TIKTOK_PASSWORD", ""),
-        },
-        "quora": {
-            "email": os.getenv("QUORA_EMAIL", ""),
-            "password": os.getenv("QUORA_PASSWORD", ""),
-        },
-        "stocktwits": {
-            "email": os.getenv("STOCKTWITS_EMAIL", ""),
-            "password": os.getenv("STOCKTWITS_PASSWORD", ""),
-        },
-        "tradingview": {
-            "email": os.getenv("TRADINGVIEW_EMAIL", ""),
-            "password": os.getenv("TRADINGVIEW_PASSWORD", ""),
-        },
-        "discord": {
-            "email": os.getenv("DISCORD_EMAIL", ""),
-            "password": os.getenv("DISCORD_PASSWORD", ""),
-        },
-        "seekingalpha": {
-            "email": os.getenv("SEEKINGALPHA_EMAIL", ""),
-            "password": os.getenv("SEEKINGALPHA_PASSWORD", ""),
-        },
-    }
+    """Configuration settings for the Social Media Lead Generation tool.
+
+    Settings are parsed and validated once per load, from (highest first) the
+    JSON settings file, the environment and the defaults below. When the file
+    changes, `reload_if_changed()` swaps in the new values and notifies
+    `on_reload` listeners, so throughput knobs can be retuned on a running
+    scraper. An invalid file is logged and the previous values kept.
+    """
 
     # Scraper & Lead Gen Settings
-    SEARCH_QUERIES = [
+    SEARCH_QUERIES = Setting(parse_list, [
         "best trading strategy",
         "how to automate trading",
         "day trading mistakes",
         "best stock trading bots",
         "does trading with AI work?",
         "seekingalpha trading bot reviews",
-    ]
-    MAX_SCRAPE_DAYS = int(os.getenv("MAX_SCRAPE_DAYS", 90))  # Extended tracking period
-    SCRAPE_INTERVAL = int(os.getenv("SCRAPE_INTERVAL", 60))  # Check every 60 minutes
-    MAX_RESULTS_PER_QUERY = int(os.getenv("MAX_RESULTS_PER_QUERY", 50))
+    ])
+    MAX_SCRAPE_DAYS = Setting(int, 90, positive)  # Extended tracking period
+    SCRAPE_INTERVAL = Setting(int, 60, positive)  # Minutes between cycles
+    MAX_RESULTS_PER_QUERY = Setting(int, 50, positive)
+    MAX_COMMENTS_PER_THREAD = Setting(int, 200, positive)  # Cap per harvested thread
+    COMMENT_BATCH_SIZE = Setting(int, 500, positive)  # Comments per insert transaction
+    CHECKPOINT_MAX_AGE_MINUTES = Setting(float, 180, non_negative)  # Older interrupted cycles start over
+
+    # Discord Settings
+    DISCORD_CHANNEL_ID = Setting(str, "", numeric_id)
+
+    # Traffic Control Settings (per domain)
+    RATE_LIMIT_PER_MINUTE = Setting(float, 12, positive)  # Starting rate, one request per 5s
+    RATE_LIMIT_MIN_PER_MINUTE = Setting(float, 2, positive)
+    RATE_LIMIT_MAX_PER_MINUTE = Setting(float, 60, positive)
+    RATE_LIMIT_TARGET_LATENCY = Setting(float, 3.0, positive)  # Seconds per page
+    MAX_RETRIES = Setting(int, 3, positive)  # Attempts per request, including the first
+    BACKOFF_BASE_SECONDS = Setting(float, 2.0, non_negative)
+    BACKOFF_MAX_SECONDS = Setting(float, 60.0, non_negative)
+    CIRCUIT_FAILURE_THRESHOLD = Setting(int, 5, positive)
+    CIRCUIT_RESET_SECONDS = Setting(float, 300, non_negative)
+
+    # Page Cache Settings
+    PAGE_CACHE_PATH = Setting(str, "page_cache.db")
+    PAGE_CACHE_TTL = Setting(int, 300, non_negative)  # Seconds before a cached page is revalidated
+    PAGE_CACHE_MAX_MB = Setting(int, 200, positive)
+
+    # Dashboard Settings
+    STATS_CACHE_TTL = Setting(int, 30, non_negative)  # Seconds to cache /api/stats responses
+    LEAD_FEED_POLL_SECONDS = Setting(float, 1.0, positive)  # How often /stream checks for new leads
+    LEAD_FEED_HEARTBEAT_SECONDS = Setting(int, 15, positive)
+
+    # Notification Settings
+    NOTIFY_SINKS = Setting(str, "discord")  # Comma-separated: discord, telegram, email, webhook
+    NOTIFY_DIGEST_MINUTES = Setting(float, 0, non_negative)  # 0 = one message per batch of leads
+    NOTIFY_BATCH_SIZE = Setting(int, 10, positive)  # Leads per message, capped by each sink
+    NOTIFY_BATCH_SECONDS = Setting(float, 5, non_negative)  # Wait this long to fill a batch
+    NOTIFY_RATE_PER_MINUTE = Setting(float, 20, positive)  # Messages per sink
+    NOTIFY_QUEUE_SIZE = Setting(int, 1000, positive)
+    NOTIFY_DRY_RUN = Setting(parse_bool, False)  # Log instead of sending
+    TELEGRAM_BOT_TOKEN = Setting(str, "")
+    TELEGRAM_CHAT_ID = Setting(str, "")
+    SMTP_HOST = Setting(str, "")
+    SMTP_PORT = Setting(int, 587, positive)
+    SMTP_USERNAME = Setting(str, "")
+    SMTP_PASSWORD = Setting(str, "")
+    ALERT_EMAIL_FROM = Setting(str, "")
+    ALERT_EMAIL_TO = Setting(str, "")  # Comma-separated recipients
+    ALERT_WEBHOOK_URL = Setting(str, "")
 
     # Chrome WebDriver Settings
-    CHROME_PROFILE_PATH = os.getenv("CHROME_PROFILE_PATH", "chrome_profile")
-    HEADLESS_MODE = os.getenv("HEADLESS_MODE", "False").lower() == "true"
+    CHROME_PROFILE_PATH = Setting(str, "chrome_profile")
+    HEADLESS_MODE = Setting(parse_bool, False)
+    LEAN_BROWSER = Setting(parse_bool, True)  # Block images, fonts, media and trackers
+    BROWSER_WINDOW_SIZE = Setting(str, "1280,800")
+    MEMORY_CEILING_MB = Setting(int, 2048, non_negative)  # Bot plus Chrome RSS that triggers a browser restart; 0 = off
+    MEMORY_TRACE = Setting(parse_bool, False)  # Run tracemalloc from startup for per-stage Python heap peaks
 
     # General Settings
-    LOG_DIR = os.getenv("LOG_DIR", "logs")
-    STARTING_CASH = float(os.getenv("STARTING_CASH", 10000))  # Reserved for potential monetization tracking
+    LOG_DIR = Setting(str, "logs")
+    STARTING_CASH = Setting(float, 10000)  # Reserved for potential monetization tracking
+
+    def __init__(self, settings_file=None, environ=None):
+        self.settings_file = settings_file or os.getenv("SETTINGS_FILE", "settings.json")
+        self._environ = environ
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._apply(self._load())
+
+    @classmethod
+    def settings(cls):
+        """Return every declared Setting, in declaration order."""
+        return [value for value in vars(cls).values() if isinstance(value, Setting)]
+
+    def _read_file(self):
+        try:
+            mtime = os.stat(self.settings_file).st_mtime
+        except OSError:
+            return None, {}
+        try:
+            with open(self.settings_file, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError) as ex:
+            raise ConfigError(f"{self.settings_file}: {ex}")
+        if not isinstance(data, dict):
+            raise ConfigError(f"{self.settings_file}: expected a JSON object")
+        return mtime, data
+
+    def _load(self):
+        """Parse and validate every setting. Raises ConfigError listing all problems."""
+        environ = dict(os.environ if self._environ is None else self._environ)
+        mtime, data = self._read_file()
+        platforms = data.pop("platforms", {}) or {}
+        sources = ({key.upper(): value for key, value in data.items()}, environ)
+        errors = []
+        values = {setting.name: setting.resolve(sources, errors) for setting in self.settings()}
+        if not errors and values["RATE_LIMIT_MIN_PER_MINUTE"] > values["RATE_LIMIT_MAX_PER_MINUTE"]:
+            errors.append("RATE_LIMIT_MIN_PER_MINUTE must not exceed RATE_LIMIT_MAX_PER_MINUTE")
+        platforms = {str(name).lower(): settings for name, settings in platforms.items()}
+        names = dict.fromkeys(SCRAPED_PLATFORMS + tuple(CREDENTIAL_ENV) + tuple(platforms))
+        values["_platforms"] = {
+            name: _platform_settings(name, environ, platforms, values, errors) for name in names
+        }
+        if errors:
+            raise ConfigError("Invalid settings: " + "; ".join(errors))
+        values["_mtime"] = mtime
+        return values
+
+    def _apply(self, values):
+        self._mtime = values.pop("_mtime")
+        self.__dict__.update(values)
+
+    # ------------------------------ access ------------------------------
+    @property
+    def SOCIAL_MEDIA_CREDENTIALS(self):
+        """Login details per platform, as {"email": ..., "password": ...}."""
+        return {
+            name: {"email": self._platforms[name].email, "password": self._platforms[name].password}
+            for name in CREDENTIAL_ENV
+        }
+
+    def platform(self, name):
+        """Return the PlatformSettings for `name` (case-insensitive)."""
+        key = name.lower()
+        settings = self._platforms.get(key)
+        if settings is None:
+            settings = PlatformSettings(name=key, rate_limit_per_minute=self.RATE_LIMIT_PER_MINUTE,
+                                        rate_limit_max_per_minute=self.RATE_LIMIT_MAX_PER_MINUTE)
+        return settings
 
     @staticmethod
     def get_env(var_name, default_value=None):
         """Helper function to get environment variables safely."""
         return os.getenv(var_name, default_value)
 
+    # ------------------------------ reload ------------------------------
+    def on_reload(self, callback):
+        """Call `callback(config)` after every successful reload."""
+        self._listeners.append(callback)
+
+    def reload(self):
+        """Re-read the environment and settings file. Returns False (keeping old values) if they are invalid."""
+        with self._lock:
+            try:
+                values = self._load()
+            except ConfigError as ex:
+                logging.error(f"Settings reload rejected, keeping previous values: {ex}")
+                return False
+            self._apply(values)
+        logging.info(f"Settings reloaded from {self.settings_file}.")
+        for callback in list(self._listeners):
+            try:
+                callback(self)
+            except Exception as ex:
+                logging.error(f"Settings reload listener failed: {ex}")
+        return True
+
+    def reload_if_changed(self):
+        """Reload when the settings file's mtime changed since the last load. Cheap enough to call every cycle."""
+        try:
+            mtime = os.stat(self.settings_file).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime  # A rejected file is not re-parsed until it changes again
+        return self.reload()
+
 # Create a single config instance
-config = Config()
\ No newline at end of file
+config = Config()
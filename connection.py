@@ -0,0 +1,142 @@
+import itertools
+import logging
+import queue
+import sqlite3
+import threading
+import weakref
+from concurrent.futures import Future
+
+# Applied to every connection the manager opens. WAL lets readers (dashboard,
+# parallel scrapers) proceed while the single writer commits.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -20000,  # Negative values are KiB, i.e. ~20 MB per connection
+    "temp_store": "MEMORY",
+}
+
+_memory_ids = itertools.count()
+
+class _ThreadConnection:
+    """Holds a thread's connection in thread-local storage; collected when the thread exits."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn):
+        self.conn = conn
+
+def _release(conn, connections, lock):
+    with lock:
+        if conn in connections:
+            connections.remove(conn)
+    try:
+        conn.close()
+    except sqlite3.Error as exc:
+        logging.warning(f"Failed to close SQLite connection: {exc}")
+
+
+class ConnectionManager:
+    """Hands out one SQLite connection per thread and serializes writes through a single writer thread.
+
+    Reads go through `connection()`, which lazily opens a tuned connection for the
+    calling thread and closes it again when that thread exits. Writes are submitted as callables via `write()`/`submit()` and
+    run one at a time, each in its own transaction, on a dedicated writer thread,
+    so concurrent scrapers never race for the write lock.
+    """
+
+    def __init__(self, db_name, pragmas=None, timeout=30.0):
+        self.db_name = db_name
+        self.pragmas = dict(DEFAULT_PRAGMAS, **(pragmas or {}))
+        self.timeout = timeout
+        self._uri = False
+        if db_name == ":memory:":
+            # Plain :memory: would give each thread its own empty database
+            self.db_name = f"file:leadsmem{next(_memory_ids)}?mode=memory&cache=shared"
+            self._uri = True
+
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = None
+        self._closed = False
+        if self._uri:
+            # Keep the shared in-memory database alive for the manager's lifetime
+            self.connection()
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_name, timeout=self.timeout, check_same_thread=False, uri=self._uri)
+        for name, value in self.pragmas.items():
+            if self._uri and name == "journal_mode":
+                continue  # In-memory databases cannot use WAL
+            conn.execute(f"PRAGMA {name}={value}")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def connection(self):
+        """Return the calling thread's connection, opening it on first use."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("ConnectionManager is closed.")
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = self._local.holder = _ThreadConnection(self._open())
+            # Short-lived threads (e.g. one per Flask request) must not leave their connection open
+            weakref.finalize(holder, _release, holder.conn, self._connections, self._lock)
+        return holder.conn
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue `fn(conn, *args, **kwargs)` for the writer thread and return a Future for its result."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("ConnectionManager is closed.")
+        future = Future()
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="sqlite-writer", daemon=True)
+                self._writer.start()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def write(self, fn, *args, **kwargs):
+        """Run `fn(conn, *args, **kwargs)` on the writer thread inside a transaction and return its result."""
+        if threading.current_thread() is self._writer:
+            # Nested write from inside a writer job: already serialized
+            return fn(self.connection(), *args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    def _write_loop(self):
+        conn = self.connection()
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            fn, args, kwargs, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                with conn:
+                    result = fn(conn, *args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def close(self):
+        """Drain pending writes, stop the writer and close every connection."""
+        if self._closed:
+            return
+        writer = self._writer
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+        self._closed = True
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as exc:
+                logging.warning(f"Failed to close SQLite connection: {exc}")
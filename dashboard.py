@@ -1,9 +1,9 @@
-from flask import Flask, render_template_string
-import sqlite3
-import os
+from flask import Flask, Response, jsonify, render_template_string, request, stream_with_context
+import rollups
+from lead_feed import get_lead_feed
+import storage
 
 app = Flask(__name__)
-DB_FILE = "leads.db"
 
 HTML_TEMPLATE = """
 <!doctype html>
@@ -16,11 +16,19 @@ HTML_TEMPLATE = """
       table { border-collapse: collapse; width: 100%; }
       th, td { padding: 0.5em; border: 1px solid #ccc; text-align: left; }
       th { background-color: #f4f4f4; }
+      .stats { display: flex; gap: 2em; margin-bottom: 2em; }
+      .stats section { flex: 1; }
+      .bar { background: #4a90d9; height: 0.8em; }
     </style>
   </head>
   <body>
     <h1>Freelance Leads Dashboard</h1>
-    <table>
+    <div class="stats">
+      <section><h3>Leads per hour (24h)</h3><table id="stats-hourly"></table></section>
+      <section><h3>Keyword yield</h3><table id="stats-keywords"></table></section>
+      <section><h3>Draft conversion</h3><table id="stats-conversion"></table></section>
+    </div>
+    <table id="leads">
       <tr>
         <th>ID</th>
         <th>Platform</th>
@@ -42,23 +50,97 @@ HTML_TEMPLATE = """
       </tr>
       {% endfor %}
     </table>
+    <script>
+      // Live feed: the server pushes only leads newer than the ones rendered above
+      function addLead(lead) {
+        const row = document.createElement("tr");
+        const content = lead.content || "";
+        const cells = [lead.id, lead.platform, lead.post_id, lead.title,
+                       content.length > 150 ? content.slice(0, 150) + "..." : content, null, lead.timestamp];
+        cells.forEach((value, i) => {
+          const cell = row.insertCell();
+          if (i === 5) {
+            const link = cell.appendChild(document.createElement("a"));
+            link.href = lead.link;
+            link.target = "_blank";
+            link.textContent = "View";
+          } else {
+            cell.textContent = value;
+          }
+        });
+        const header = document.getElementById("leads").rows[0];
+        header.parentNode.insertBefore(row, header.nextSibling);
+      }
+      const feed = new EventSource("/stream?after={{ last_id }}");
+      feed.addEventListener("lead", event => addLead(JSON.parse(event.data)));
+
+      function renderBars(id, rows, label, value, text) {
+        const max = Math.max(1, ...rows.map(value));
+        const table = document.getElementById(id);
+        table.replaceChildren();
+        rows.forEach(r => {
+          const row = table.insertRow();
+          row.insertCell().textContent = label(r);
+          const barCell = row.insertCell();
+          barCell.style.width = "50%";
+          const bar = barCell.appendChild(document.createElement("div"));
+          bar.className = "bar";
+          bar.style.width = `${100 * value(r) / max}%`;
+          row.insertCell().textContent = text(r);
+        });
+      }
+      fetch("/api/stats/hourly").then(r => r.json()).then(rows =>
+        renderBars("stats-hourly", rows, r => `${r.bucket.slice(5, 13)}h ${r.platform}`, r => r.leads, r => r.leads));
+      fetch("/api/stats/keywords").then(r => r.json()).then(rows =>
+        renderBars("stats-keywords", rows, r => r.keyword, r => r.leads, r => r.leads));
+      fetch("/api/stats/conversion").then(r => r.json()).then(rows =>
+        renderBars("stats-conversion", rows, r => r.platform, r => r.conversion,
+                   r => `${Math.round(100 * r.conversion)}% of ${r.leads}`));
+    </script>
   </body>
 </html>
 """
 
 def get_leads():
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM leads ORDER BY timestamp DESC")
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+    return storage.get_leads()
 
 @app.route("/")
 def index():
     rows = get_leads()
-    return render_template_string(HTML_TEMPLATE, rows=rows)
+    last_id = max((row[0] for row in rows), default=0)
+    return render_template_string(HTML_TEMPLATE, rows=rows, last_id=last_id)
+
+@app.route("/stream")
+def stream():
+    """Server-Sent Events feed of leads added after `after` (or the browser's Last-Event-ID on reconnect)."""
+    last_event_id = request.headers.get("Last-Event-ID", type=int)
+    if last_event_id is None:
+        last_event_id = request.args.get("after", type=int)
+    events = get_lead_feed().stream(last_event_id)
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.route("/api/stats/hourly")
+def stats_hourly():
+    hours = request.args.get("hours", default=24, type=int)
+    return jsonify(rollups.leads_per_hour(hours=hours, platform=request.args.get("platform")))
+
+@app.route("/api/stats/keywords")
+def stats_keywords():
+    return jsonify(rollups.keyword_yield(limit=request.args.get("limit", default=20, type=int)))
+
+@app.route("/api/stats/conversion")
+def stats_conversion():
+    return jsonify(rollups.draft_conversion())
+
+def main(host="127.0.0.1", port=5000, debug=False):
+    """Run the dashboard with Flask's built-in server."""
+    # Threaded so each open /stream connection gets its own worker
+    app.run(host=host, port=port, debug=debug, threaded=True)
 
 if __name__ == "__main__":
     # Run the dashboard on port 5000
-    app.run(debug=True, port=5000)
+    main(debug=True)
@@ -1,63 +1,186 @@
+import csv
 import sqlite3
+import threading
 from datetime import datetime
 
+import storage
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds
+MAX_SQL_VARIABLES = 900
+POST_COLUMNS = ("id", "platform", "post_id", "author", "content", "url", "timestamp")
+
 class Database:
-    """Handles SQLite database operations for storing scraped data."""
+    """Handles SQLite database operations for storing scraped data.
+
+    Safe to share between threads: each thread reads through its own connection
+    and all writes are serialized through the ConnectionManager's writer thread.
+    """
 
-    def __init__(self, db_name="scraper_data.db"):
+    def __init__(self, db_name=storage.DB_FILE, manager=None):
         """Initialize database connection and create tables if they don't exist."""
-        self.conn = sqlite3.connect(db_name)
-        self.cursor = self.conn.cursor()
+        # Share storage's manager for the file so the process keeps a single writer thread.
+        # A manager passed in stays owned by the caller.
+        self._shared = manager is None
+        self._released = False
+        self.db_name = db_name
+        self.manager = storage.retain_manager(db_name) if self._shared else manager
+        self._local = threading.local()
         self._create_tables()
 
+    @property
+    def conn(self):
+        """The calling thread's connection."""
+        return self.manager.connection()
+
+    @property
+    def cursor(self):
+        """A cursor on the calling thread's connection, reused across calls."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self.conn.cursor()
+        return cursor
+
     def _create_tables(self):
-        """Creates necessary tables for storing posts and comments."""
-        self.cursor.execute("""
-        CREATE TABLE IF NOT EXISTS posts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            platform TEXT NOT NULL,
-            post_id TEXT UNIQUE NOT NULL,
-            author TEXT,
-            content TEXT,
-            url TEXT,
-            timestamp TEXT DEFAULT CURRENT_TIMESTAMP
-        )""")
-
-        self.cursor.execute("""
-        CREATE TABLE IF NOT EXISTS comments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            platform TEXT NOT NULL,
-            post_id TEXT NOT NULL,
-            comment_id TEXT UNIQUE NOT NULL,
-            author TEXT,
-            content TEXT,
-            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (post_id) REFERENCES posts (post_id) ON DELETE CASCADE
-        )""")
-
-        self.conn.commit()
+        """Creates necessary tables for storing posts and comments by applying pending migrations."""
+        self.manager.write(storage.migrate)
 
     def insert_post(self, platform, post_id, author, content, url):
         """Insert a new post if it doesn't already exist."""
         try:
-            self.cursor.execute("""
-            INSERT INTO posts (platform, post_id, author, content, url) 
+            self.manager.write(lambda conn: conn.execute("""
+            INSERT INTO posts (platform, post_id, author, content, url)
             VALUES (?, ?, ?, ?, ?)""",
-            (platform, post_id, author, content, url))
-            self.conn.commit()
+            (platform, post_id, author, content, url)))
         except sqlite3.IntegrityError:
             pass  # Post already exists
 
     def insert_comment(self, platform, post_id, comment_id, author, content):
         """Insert a new comment if it doesn't already exist."""
         try:
-            self.cursor.execute("""
-            INSERT INTO comments (platform, post_id, comment_id, author, content) 
+            self.manager.write(lambda conn: conn.execute("""
+            INSERT INTO comments (platform, post_id, comment_id, author, content)
             VALUES (?, ?, ?, ?, ?)""",
-            (platform, post_id, comment_id, author, content))
-            self.conn.commit()
+            (platform, post_id, comment_id, author, content)))
         except sqlite3.IntegrityError:
-            pass  # Comment already exists
+            pass  # Comment already exists or its post is missing
+
+    def insert_posts_many(self, posts):
+        """Insert an iterable of (platform, post_id, author, content, url) rows in one transaction.
+
+        Rows whose post_id already exists are skipped. Returns the number of new rows.
+        """
+        def insert(conn):
+            before = conn.total_changes
+            conn.executemany("""
+            INSERT OR IGNORE INTO posts (platform, post_id, author, content, url)
+            VALUES (?, ?, ?, ?, ?)""", posts)
+            return conn.total_changes - before
+
+        return self.manager.write(insert)
+
+    def insert_comments_many(self, comments):
+        """Insert an iterable of (platform, post_id, comment_id, author, content) rows in one transaction.
+
+        Rows whose comment_id already exists are skipped; every post_id must already
+        be stored since foreign keys are enforced. Returns the number of new rows.
+        """
+        def insert(conn):
+            before = conn.total_changes
+            conn.executemany("""
+            INSERT OR IGNORE INTO comments (platform, post_id, comment_id, author, content)
+            VALUES (?, ?, ?, ?, ?)""", comments)
+            return conn.total_changes - before
+
+        return self.manager.write(insert)
+
+    def existing_post_ids(self, post_ids):
+        """Return the subset of post_ids that are already stored, using chunked IN queries."""
+        post_ids = list(dict.fromkeys(post_ids))
+        found = set()
+        cursor = self.conn.cursor()
+        for start in range(0, len(post_ids), MAX_SQL_VARIABLES):
+            chunk = post_ids[start:start + MAX_SQL_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"SELECT post_id FROM posts WHERE post_id IN ({placeholders})", chunk)
+            found.update(row[0] for row in cursor.fetchall())
+        cursor.close()
+        return found
+
+    def iter_posts(self, platform=None, batch_size=1000):
+        """Yield stored posts one row at a time, fetching `batch_size` rows per round trip."""
+        cursor = self.conn.cursor()
+        query = f"SELECT {', '.join(POST_COLUMNS)} FROM posts"
+        params = ()
+        if platform:
+            query += " WHERE platform = ?"
+            params = (platform,)
+        try:
+            cursor.execute(query + " ORDER BY id", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def export_posts(self, path, fmt=None, platform=None, batch_size=10000):
+        """Stream posts to a CSV or Parquet file without loading the table into memory.
+
+        The format is taken from `fmt` or the file extension. Parquet requires pyarrow.
+        Returns the number of rows written.
+        """
+        fmt = (fmt or str(path).rsplit(".", 1)[-1]).lower()
+        if fmt == "csv":
+            return self._export_csv(path, platform, batch_size)
+        if fmt == "parquet":
+            return self._export_parquet(path, platform, batch_size)
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    def _export_csv(self, path, platform, batch_size):
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(POST_COLUMNS)
+            for row in self.iter_posts(platform=platform, batch_size=batch_size):
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def _export_parquet(self, path, platform, batch_size):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow).") from exc
+
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("platform", pa.string()),
+            ("post_id", pa.string()),
+            ("author", pa.string()),
+            ("content", pa.string()),
+            ("url", pa.string()),
+            ("timestamp", pa.string()),
+        ])
+        def write(writer, rows):
+            columns = list(zip(*rows))
+            arrays = [pa.array(col, type=field.type) for col, field in zip(columns, schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+        count = 0
+        batch = []
+        with pq.ParquetWriter(str(path), schema) as writer:
+            for row in self.iter_posts(platform=platform, batch_size=batch_size):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    write(writer, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                write(writer, batch)
+                count += len(batch)
+        return count
 
     def check_post_exists(self, post_id):
         """Check if a post is already in the database."""
@@ -70,8 +193,12 @@ class Database:
         return self.cursor.fetchone() is not None
 
     def close(self):
-        """Close the database connection."""
-        self.conn.close()
+        """Flush pending writes and release the shared manager; it closes once no Database uses it."""
+        if not self._shared:
+            self.manager.submit(lambda conn: None).result()
+        elif not self._released:
+            self._released = True
+            storage.release_manager(self.db_name)
 
 # Usage Example
 if __name__ == "__main__":
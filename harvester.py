@@ -0,0 +1,274 @@
+import itertools
+import json
+import logging
+import re
+
+from config import config
+from database import MAX_SQL_VARIABLES
+from normalize import parse_post_link
+
+COUNT_RE = re.compile(r"([\d.,]+)\s*([KkMm]?)")
+
+REDDIT_HEADERS = {"User-Agent": "free-ride-investor-lead-bot/1.0"}
+
+def parse_count(text):
+    """Parse a rendered count such as '12', '1,204' or '3.4K' into an int (0 if absent)."""
+    match = COUNT_RE.search(text or "")
+    if not match:
+        return 0
+    number = float(match.group(1).replace(",", ""))
+    scale = {"k": 1_000, "m": 1_000_000}.get(match.group(2).lower(), 1)
+    return int(number * scale)
+
+def reddit_thread_id(url):
+    """Extract the base36 thread ID from a Reddit post URL, or None."""
+    parts = parse_post_link("reddit", url)
+    return parts["id"] if parts else None
+
+class CommentHarvester:
+    """Collects comments for threads whose comment count changed since the last visit.
+
+    Each thread is a dict with platform, post_id, url and comment_count (plus
+    optional author/content). Comments are streamed from a platform fetcher into
+    batched inserts; at most `max_per_thread` comments are read per thread.
+    """
+
+    def __init__(self, db, max_per_thread=None, batch_size=None):
+        self.db = db
+        self.max_per_thread = max_per_thread or config.MAX_COMMENTS_PER_THREAD
+        self.batch_size = batch_size or config.COMMENT_BATCH_SIZE
+
+    def known_counts(self, post_ids):
+        """Return {post_id: comment_count} from the change cache for the given IDs."""
+        post_ids = list(post_ids)
+        counts = {}
+        conn = self.db.conn
+        for start in range(0, len(post_ids), MAX_SQL_VARIABLES):
+            chunk = post_ids[start:start + MAX_SQL_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT post_id, comment_count FROM thread_state WHERE post_id IN ({placeholders})", chunk
+            )
+            counts.update(rows.fetchall())
+        return counts
+
+    def changed_threads(self, threads):
+        """Filter `threads` down to those with comments and a count that differs from the cache."""
+        # The same thread often comes back for several search keywords; fetch it once
+        unique = {}
+        for thread in threads:
+            if thread.get("comment_count"):
+                seen = unique.get(thread["post_id"])
+                if seen is None or thread["comment_count"] > seen["comment_count"]:
+                    unique[thread["post_id"]] = thread
+        threads = list(unique.values())
+        known = self.known_counts(t["post_id"] for t in threads)
+        return [t for t in threads if known.get(t["post_id"]) != t["comment_count"]]
+
+    def harvest(self, threads, fetch_comments):
+        """Fetch and store comments for changed threads.
+
+        `fetch_comments(thread, limit)` yields (comment_id, author, content) tuples.
+        Returns a dict with threads_seen, threads_fetched and comments_saved counts.
+        """
+        threads = list(threads)
+        changed = self.changed_threads(threads)
+        stats = {"threads_seen": len(threads), "threads_fetched": 0, "comments_saved": 0}
+        if not changed:
+            return stats
+
+        # Comments reference posts, so make sure every thread has a post row first
+        self.db.insert_posts_many(
+            (t["platform"], t["post_id"], t.get("author"), t.get("content"), t.get("url")) for t in changed
+        )
+
+        buffer, finished = [], []
+        for thread in changed:
+            try:
+                comments = fetch_comments(thread, self.max_per_thread)
+                for comment_id, author, content in itertools.islice(comments, self.max_per_thread):
+                    buffer.append((thread["platform"], thread["post_id"], comment_id, author, content))
+                    if len(buffer) >= self.batch_size:
+                        stats["comments_saved"] += self._flush(buffer, finished)
+                        buffer, finished = [], []
+            except Exception as ex:
+                logging.error(f"Error harvesting comments for {thread['platform']} thread {thread['post_id']}: {ex}")
+                continue
+            finished.append(thread)
+            stats["threads_fetched"] += 1
+
+        stats["comments_saved"] += self._flush(buffer, finished)
+        logging.info(
+            f"Comment harvest: {stats['threads_fetched']}/{stats['threads_seen']} threads changed, "
+            f"{stats['comments_saved']} new comments."
+        )
+        return stats
+
+    def _flush(self, comments, finished):
+        """Store a batch of comments and the updated counts of fully read threads in one transaction."""
+        def write(conn):
+            saved = self.db.insert_comments_many(comments) if comments else 0
+            conn.executemany(
+                """INSERT INTO thread_state (post_id, platform, comment_count, last_visited)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (post_id) DO UPDATE SET
+                    comment_count = excluded.comment_count, last_visited = excluded.last_visited""",
+                [(t["post_id"], t["platform"], t["comment_count"]) for t in finished]
+            )
+            return saved
+
+        return self.db.manager.write(write)
+
+# ============================== REDDIT ==============================
+def _reddit_session(session):
+    if session is not None:
+        return session
+    import requests
+    session = requests.Session()
+    session.headers.update(REDDIT_HEADERS)
+    return session
+
+def _get_json(url, session, params=None, cache=None, traffic=None):
+    """GET a Reddit JSON endpoint, optionally through the page cache and traffic controller.
+
+    Fresh cache hits return before the traffic controller, so they neither wait
+    for a rate-limit slot nor count as fast responses when the rate adapts.
+    """
+    if cache is not None:
+        body = cache.fresh(url, platform="Reddit", params=params)
+        if body is not None:
+            return json.loads(body)
+
+    def get():
+        if cache is not None:
+            return cache.fetch(url, session, platform="Reddit", params=params)
+        response = session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        return response.content
+
+    body = traffic.run("Reddit", url, get) if traffic is not None else get()
+    return json.loads(body)
+
+def fetch_reddit_threads(thread_ids, session=None, cache=None, traffic=None):
+    """Look up title, author and comment count for Reddit threads, 100 per request.
+
+    With a PageCache the lookups are served from disk until stale and then revalidated.
+    """
+    session = _reddit_session(session)
+    thread_ids = list(dict.fromkeys(thread_ids))
+    threads = []
+    for start in range(0, len(thread_ids), 100):
+        names = ",".join(f"t3_{tid}" for tid in thread_ids[start:start + 100])
+        payload = _get_json(f"https://www.reddit.com/by_id/{names}.json", session, cache=cache, traffic=traffic)
+        for child in payload["data"]["children"]:
+            data = child["data"]
+            threads.append({
+                "platform": "Reddit",
+                "post_id": data["id"],
+                "author": data.get("author"),
+                "content": data.get("title"),
+                "url": f"https://www.reddit.com{data['permalink']}",
+                "comment_count": data.get("num_comments", 0),
+            })
+    return threads
+
+def search_reddit(query, limit=None, session=None, cache=None, traffic=None):
+    """Return Reddit posts matching `query` from the JSON search API, newest first.
+
+    Each post is a dict with post_id, title, content, link, author and comment_count.
+    """
+    session = _reddit_session(session)
+    payload = _get_json(
+        "https://www.reddit.com/search.json", session, cache=cache, traffic=traffic,
+        params={"q": query, "sort": "new", "type": "link", "limit": limit or config.MAX_RESULTS_PER_QUERY, "raw_json": 1},
+    )
+    return [
+        {
+            "post_id": child["data"]["id"],
+            "title": child["data"].get("title", ""),
+            "content": f"{child['data'].get('title', '')}\n{child['data'].get('selftext', '')}".strip(),
+            "link": f"https://www.reddit.com{child['data']['permalink']}",
+            "author": child["data"].get("author"),
+            "comment_count": child["data"].get("num_comments", 0),
+        }
+        for child in payload["data"]["children"]
+    ]
+
+def fetch_reddit_comments(thread, limit, session=None, traffic=None):
+    """Yield (comment_id, author, body) for a Reddit thread, loading the whole tree in one request."""
+    session = _reddit_session(session)
+    payload = _get_json(
+        f"https://www.reddit.com/comments/{thread['post_id']}.json", session,
+        params={"limit": limit, "sort": "new", "raw_json": 1}, traffic=traffic,
+    )
+    stack = list(reversed(payload[1]["data"]["children"]))
+    while stack:
+        node = stack.pop()
+        if node.get("kind") != "t1":
+            continue  # "more" stubs would need one request each; the cap makes them unnecessary
+        data = node["data"]
+        yield data["name"], data.get("author"), data.get("body", "")
+        replies = data.get("replies")
+        if replies:
+            stack.extend(reversed(replies["data"]["children"]))
+
+def harvest_reddit(db, links, session=None, cache=None, traffic=None):
+    """Harvest comments for the Reddit threads behind `links`."""
+    thread_ids = [tid for tid in map(reddit_thread_id, links) if tid]
+    if not thread_ids:
+        return None
+    session = _reddit_session(session)
+    threads = fetch_reddit_threads(thread_ids, session=session, cache=cache, traffic=traffic)
+    return CommentHarvester(db).harvest(
+        threads, lambda thread, limit: fetch_reddit_comments(thread, limit, session=session, traffic=traffic)
+    )
+
+# ============================== TWITTER ==============================
+def twitter_thread(article):
+    """Build a thread dict from a Twitter search-result <article> element, or None."""
+    from selenium.webdriver.common.by import By
+
+    links = article.find_elements(By.XPATH, ".//a[contains(@href, '/status/')]")
+    link = links[0].get_attribute("href") if links else None
+    status = parse_post_link("twitter", link)
+    if not status:
+        return None
+    replies = article.find_elements(By.XPATH, ".//*[@data-testid='reply']")
+    return {
+        "platform": "Twitter",
+        "post_id": status["id"],
+        "author": status["author"],
+        "content": article.text.strip(),
+        "url": link,
+        "comment_count": parse_count(replies[0].get_attribute("aria-label")) if replies else 0,
+    }
+
+def fetch_twitter_comments(driver, thread, limit, traffic=None):
+    """Yield (comment_id, author, text) for replies on a Twitter conversation page."""
+    from selenium.webdriver.common.by import By
+    from browser import load_page, wait_for_elements
+
+    def open_thread():
+        load_page(driver, thread["url"])
+        wait_for_elements(driver, "//article")
+
+    if traffic is not None:
+        traffic.run("Twitter", thread["url"], open_thread)
+    else:
+        open_thread()
+    seen = 0
+    for article in driver.find_elements(By.XPATH, "//article"):
+        links = article.find_elements(By.XPATH, ".//a[contains(@href, '/status/')]")
+        status = parse_post_link("twitter", links[0].get_attribute("href")) if links else None
+        if not status or status["id"] == thread["post_id"]:
+            continue  # Skip the original tweet
+        yield status["id"], status["author"], article.text.strip()
+        seen += 1
+        if seen >= limit:
+            break
+
+def harvest_twitter(db, driver, threads, traffic=None):
+    """Harvest replies for Twitter threads collected from search results."""
+    return CommentHarvester(db).harvest(
+        threads, lambda thread, limit: fetch_twitter_comments(driver, thread, limit, traffic=traffic)
+    )
@@ -0,0 +1,172 @@
+import json
+import logging
+import queue
+import threading
+
+import storage
+from config import config
+
+CATCH_UP_LIMIT = 500  # Most rows replayed to a client that reconnects after falling behind
+
+def format_event(lead):
+    """Encode a lead dict as one Server-Sent Events message."""
+    return f"id: {lead['id']}\nevent: lead\ndata: {json.dumps(lead, default=str)}\n\n"
+
+def leads_after(last_id, limit=CATCH_UP_LIMIT, db_file=None):
+    """Return leads with id greater than `last_id` as dicts, oldest first."""
+    rows = storage.get_manager(db_file).connection().execute(
+        f"SELECT {', '.join(storage.LEAD_COLUMNS)} FROM leads WHERE id > ? ORDER BY id LIMIT ?",
+        (last_id, limit)
+    ).fetchall()
+    return [dict(zip(storage.LEAD_COLUMNS, row)) for row in rows]
+
+class Subscription:
+    """One connected client's queue of new leads."""
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize)
+        self.closed = False
+
+    def get(self, timeout=None):
+        """Return the next lead, or None if none arrived within `timeout` or the subscription was dropped."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class LeadFeed:
+    """Fans new leads out to every subscriber from a single polling thread.
+
+    The poller checks PRAGMA data_version, which only changes when another
+    connection commits, and reads rows past the last seen lead id only then.
+    The database cost is therefore the same for one open dashboard or a hundred.
+    """
+
+    def __init__(self, db_file=None, poll_interval=None, queue_size=1000, autostart=True):
+        self.db_file = db_file
+        self.poll_interval = config.LEAD_FEED_POLL_SECONDS if poll_interval is None else poll_interval
+        self.queue_size = queue_size
+        self.autostart = autostart
+        self.subscribers = set()
+        self.last_id = None
+        self._data_version = None
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._stopped = False
+
+    def _connection(self):
+        return storage.get_manager(self.db_file).connection()
+
+    def current_id(self):
+        return self._connection().execute("SELECT COALESCE(MAX(id), 0) FROM leads").fetchone()[0]
+
+    def subscribe(self):
+        """Register a new client and make sure the poller is running."""
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            if not self.subscribers:
+                # Nobody was listening, so start from the newest lead rather than replaying the gap
+                self.last_id = self.current_id()
+            self.subscribers.add(subscription)
+            if self.autostart and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="lead-feed", daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self.subscribers.discard(subscription)
+        subscription.closed = True
+
+    def poll_once(self):
+        """Publish leads committed since the last poll. Returns how many were published."""
+        with self._poll_lock:
+            conn = self._connection()
+            # data_version is per connection, so only compare values read on the same thread
+            data_version = (threading.get_ident(), conn.execute("PRAGMA data_version").fetchone()[0])
+            with self._lock:
+                if self.last_id is None:
+                    self.last_id = self.current_id()
+                last_id = self.last_id
+            if data_version == self._data_version:
+                return 0
+            published = 0
+            while True:
+                leads = leads_after(last_id, db_file=self.db_file)
+                if not leads:
+                    break
+                last_id = leads[-1]["id"]
+                with self._lock:
+                    self.last_id = last_id
+                    subscribers = list(self.subscribers)
+                for subscription in subscribers:
+                    self._deliver(subscription, leads)
+                published += len(leads)
+            # Only remember the version once every row it covers has been read
+            self._data_version = data_version
+            return published
+
+    def _deliver(self, subscription, leads):
+        for lead in leads:
+            try:
+                subscription.queue.put_nowait(lead)
+            except queue.Full:
+                # A stalled client is dropped; it resumes from Last-Event-ID on reconnect
+                logging.warning("Dropping slow lead feed subscriber.")
+                self.unsubscribe(subscription)
+                return
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(lambda: self.subscribers or self._stopped)
+                if self._stopped:
+                    return
+            try:
+                self.poll_once()
+            except Exception as ex:
+                logging.error(f"Lead feed poll failed: {ex}")
+            with self._lock:
+                if self._wakeup.wait_for(lambda: self._stopped, self.poll_interval):
+                    return
+
+    def stop(self, timeout=5):
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stream(self, last_event_id=None, heartbeat=None):
+        """Yield Server-Sent Events for leads after `last_event_id`, then for each new lead as it arrives."""
+        heartbeat = config.LEAD_FEED_HEARTBEAT_SECONDS if heartbeat is None else heartbeat
+        subscription = self.subscribe()
+        try:
+            sent_id = 0
+            if last_event_id is not None:
+                for lead in leads_after(last_event_id, db_file=self.db_file):
+                    sent_id = lead["id"]
+                    yield format_event(lead)
+            yield "retry: 5000\n\n"
+            while not subscription.closed:
+                lead = subscription.get(timeout=heartbeat)
+                if lead is None:
+                    yield ": keep-alive\n\n"
+                elif lead["id"] > sent_id:
+                    yield format_event(lead)
+        finally:
+            self.unsubscribe(subscription)
+
+_feed = None
+_feed_lock = threading.Lock()
+
+def get_lead_feed():
+    """Return the process-wide LeadFeed, creating it on first use."""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = LeadFeed()
+        return _feed
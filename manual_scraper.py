@@ -1,82 +1,41 @@
 import time
 import os
-import sqlite3
 import logging
 from datetime import datetime
-from dotenv import load_dotenv
-import discord
-from discord.ext import commands
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-
-# Load environment variables and config
-load_dotenv()
+
+# Heavy dependencies (discord, selenium, bs4) are imported where they are used,
+# so importing this module stays cheap for the CLI, dashboard and tests.
+from checkpoint import ALL_QUERIES, get_journal
 from config import config  # Assumes your config code is in config.py
+from storage import get_manager, init_db
+from database import Database
+from harvester import harvest_reddit, harvest_twitter, search_reddit, twitter_thread
+from memory import get_memory_monitor
+from normalize import normalize_page, page_fingerprint
+from notifier import Notifier, build_sinks, get_notifier, set_notifier
+from page_cache import get_page_cache
+from rate_limiter import get_traffic_controller
 
 # Discord settings
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
-DISCORD_CHANNEL_ID = int(os.getenv("DISCORD_CHANNEL_ID"))
 
 # Flag for generating a draft reply (proposal)
 GENERATE_REPLY_DRAFT = True  # Set to False to disable draft proposal generation
 
 # ============================== LOGGING SETUP ==============================
-LOG_DIR = config.LOG_DIR or "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(os.path.join(LOG_DIR, "scraper.log")),
-        logging.StreamHandler()
-    ]
-)
-logging.info("Scraper module started.")
-
-# ============================== DATABASE ==============================
-DB_FILE = "leads.db"
-
-def init_db():
-    """Initialize the SQLite database for storing freelance leads."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute(
-        """CREATE TABLE IF NOT EXISTS leads (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            platform TEXT,
-            post_id TEXT UNIQUE,
-            title TEXT,
-            content TEXT,
-            link TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )"""
+def setup_logging():
+    """Log to LOG_DIR/scraper.log and the console."""
+    log_dir = config.LOG_DIR or "logs"
+    os.makedirs(log_dir, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler(os.path.join(log_dir, "scraper.log")),
+            logging.StreamHandler()
+        ]
     )
-    conn.commit()
-    conn.close()
-    logging.info("Database initialized.")
-
-def save_lead(platform, post_id, title, content, link):
-    """Save a new lead to the database if it doesn't already exist."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT INTO leads (platform, post_id, title, content, link) VALUES (?, ?, ?, ?, ?)",
-            (platform, post_id, title, content, link)
-        )
-        conn.commit()
-        logging.info(f"New lead saved: {platform} | {post_id}")
-        return True  # New lead added
-    except sqlite3.IntegrityError:
-        logging.info(f"Duplicate lead found, skipping: {platform} | {post_id}")
-        return False  # Lead already exists
-    finally:
-        conn.close()
+    logging.info("Scraper module started.")
 
 # ============================== DRAFT REPLY MODULE ==============================
 def generate_proposal(lead_details):
@@ -106,19 +65,36 @@ def prepare_reply(lead_details):
     print(proposal)
     print("-" * 50)
 
-# ============================== SELENIUM SETUP ==============================
-def get_driver():
-    """Setup and return a Selenium Chrome WebDriver using config settings."""
-    options = Options()
-    if config.HEADLESS_MODE:
-        options.add_argument("--headless")
-    options.add_argument("--start-maximized")
-    if config.CHROME_PROFILE_PATH:
-        options.add_argument(f"user-data-dir={config.CHROME_PROFILE_PATH}")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    logging.info("Chrome WebDriver initialized.")
-    return driver
+# ============================== LEAD DELIVERY ==============================
+def publish_lead(platform, title, lead):
+    """Save a normalized lead; if it is new, alert on it and draft a reply. Returns True for new leads."""
+    pending = get_journal().save_lead(
+        platform, lead.post_id, title, lead.content, lead.link, draft=GENERATE_REPLY_DRAFT, **lead.details()
+    )
+    if pending:
+        dispatch_lead(pending)
+    return pending is not None
+
+def dispatch_lead(pending):
+    """Send the alert and draft reply a journaled lead still owes, marking each done in the journal.
+
+    An alert some sink failed or dropped stays owed, so the next start replays it.
+    """
+    journal = get_journal()
+
+    def alert_done(sent):
+        if sent:
+            journal.resolve(pending["post_id"], "alert")
+        else:
+            logging.warning(f"Alert for {pending['platform']} | {pending['post_id']} was not delivered; "
+                            f"it stays owed and is replayed on restart.")
+
+    if pending["alert"]:
+        get_notifier().notify(pending["platform"], pending["title"], pending["content"], pending["link"],
+                              on_done=alert_done)
+    if pending["draft"]:
+        prepare_reply(pending)
+        journal.resolve(pending["post_id"], "draft")
 
 # ============================== SCRAPERS ==============================
 FREELANCE_KEYWORDS = [
@@ -128,196 +104,337 @@ FREELANCE_KEYWORDS = [
 
 def scrape_twitter():
     """Scrapes Twitter for freelance job leads."""
+    from selenium.webdriver.common.by import By
+    from browser import load_page, managed_driver, submit_search
+
     logging.info("Starting Twitter scraping...")
-    driver = get_driver()
-    driver.get("https://twitter.com/explore")
-    time.sleep(5)
+    traffic = get_traffic_controller()
+    keywords = get_journal().remaining("twitter", config.platform("twitter").queries or FREELANCE_KEYWORDS)
+
+    def open_explore(driver):
+        traffic.run("Twitter", "https://twitter.com/explore", lambda: load_page(driver, "https://twitter.com/explore"))
+
+    with managed_driver(on_start=open_explore) as driver:
+        threads = []
+
+        for keyword in keywords:
+            driver.recycle_if_needed()  # A fresh browser reopens explore before the next search
+            try:
+                traffic.run("Twitter", "https://twitter.com/search", lambda: submit_search(
+                    driver, "//input[@aria-label='Search query']", keyword, "//article"
+                ))
+
+                # One round trip for every article's text and status link
+                rows = driver.execute_script(
+                    "return Array.from(document.querySelectorAll('article')).map(a => {"
+                    " const status = a.querySelector(\"a[href*='/status/']\");"
+                    " return [a.innerText, status ? status.href : null]; });"
+                )
+                leads = normalize_page("Twitter", rows)
+                results, results_url = page_fingerprint(leads), driver.current_url
+                if not get_page_cache().content_changed(results_url, results, platform="Twitter"):
+                    logging.info(f"Twitter results unchanged for '{keyword}', skipping extraction.")
+                    get_journal().complete("twitter", keyword)
+                    continue
+
+                failed = False
+                for lead in leads:
+                    try:
+                        publish_lead("Twitter", keyword, lead)
+                    except Exception as inner_ex:
+                        logging.error(f"Error processing a Twitter post: {inner_ex}")
+                        failed = True
+                        continue
+
+                # Comment thread info is best effort; a failure here must not cost the lead
+                for post in driver.find_elements(By.XPATH, "//article"):
+                    try:
+                        thread = twitter_thread(post)
+                        if thread:
+                            threads.append(thread)
+                    except Exception as thread_ex:
+                        logging.warning(f"Could not read Twitter thread info: {thread_ex}")
+
+                if not failed:
+                    get_page_cache().mark_processed(results_url, results)
+                    get_journal().complete("twitter", keyword)
+            except Exception as ex:
+                logging.error(f"Error in Twitter scraping for keyword '{keyword}': {ex}")
+                continue
 
-    for keyword in FREELANCE_KEYWORDS:
         try:
-            search_box = driver.find_element(By.XPATH, "//input[@aria-label='Search query']")
-            search_box.clear()
-            search_box.send_keys(keyword)
-            search_box.send_keys(Keys.RETURN)
-            time.sleep(5)
-
-            posts = driver.find_elements(By.XPATH, "//article")
-            for post in posts:
-                try:
-                    content = post.text.strip()
-                    link = post.find_element(By.TAG_NAME, "a").get_attribute("href")
-                    post_id = link.split("/")[-1]
-
-                    if save_lead("Twitter", post_id, keyword, content, link):
-                        bot.loop.create_task(send_discord_alert("Twitter", keyword, content, link))
-                        if GENERATE_REPLY_DRAFT:
-                            prepare_reply({
-                                "platform": "Twitter",
-                                "post_id": post_id,
-                                "title": keyword,
-                                "content": content,
-                                "link": link
-                            })
-                except Exception as inner_ex:
-                    logging.error(f"Error processing a Twitter post: {inner_ex}")
-                    continue
+            harvest_twitter(Database(manager=get_manager()), driver, threads, traffic=traffic)
         except Exception as ex:
-            logging.error(f"Error in Twitter scraping for keyword '{keyword}': {ex}")
-            continue
+            logging.error(f"Error harvesting Twitter comments: {ex}")
 
-    driver.quit()
     logging.info("Twitter scraping complete.")
 
 def scrape_linkedin():
     """Scrapes LinkedIn for freelance job leads."""
-    logging.info("Starting LinkedIn scraping...")
-    driver = get_driver()
-    driver.get("https://www.linkedin.com/feed/")
-    time.sleep(5)
+    from bs4 import BeautifulSoup
+    from browser import load_page, managed_driver
 
-    for keyword in FREELANCE_KEYWORDS:
-        try:
-            search_url = f"https://www.linkedin.com/search/results/content/?keywords={keyword.replace(' ', '%20')}"
-            driver.get(search_url)
-            time.sleep(5)
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            posts = soup.find_all("div", class_="update")
-
-            for post in posts:
-                try:
-                    content = post.get_text(strip=True)
-                    link = post.find("a")["href"]
-                    post_id = link.split("/")[-1]
-
-                    if save_lead("LinkedIn", post_id, keyword, content, link):
-                        bot.loop.create_task(send_discord_alert("LinkedIn", keyword, content, link))
-                        if GENERATE_REPLY_DRAFT:
-                            prepare_reply({
-                                "platform": "LinkedIn",
-                                "post_id": post_id,
-                                "title": keyword,
-                                "content": content,
-                                "link": link
-                            })
-                except Exception as inner_ex:
-                    logging.error(f"Error processing a LinkedIn post: {inner_ex}")
+    logging.info("Starting LinkedIn scraping...")
+    traffic = get_traffic_controller()
+    keywords = get_journal().remaining("linkedin", config.platform("linkedin").queries or FREELANCE_KEYWORDS)
+
+    def open_feed(driver):
+        traffic.run("LinkedIn", "https://www.linkedin.com/feed/", lambda: load_page(driver, "https://www.linkedin.com/feed/"))
+
+    with managed_driver(on_start=open_feed) as driver:
+        for keyword in keywords:
+            driver.recycle_if_needed()
+            try:
+                search_url = f"https://www.linkedin.com/search/results/content/?keywords={keyword.replace(' ', '%20')}"
+                traffic.run("LinkedIn", search_url, lambda: load_page(driver, search_url))
+
+                soup = BeautifulSoup(driver.page_source, "html.parser")
+                posts = soup.find_all("div", class_="update")
+                rows = [(post.get_text("\n", strip=True), post.a.get("href") if post.a else None) for post in posts]
+                soup.decompose()  # Only plain strings are used from here on; free the tree now
+                leads = normalize_page("LinkedIn", rows)
+                results = page_fingerprint(leads)
+                if not get_page_cache().content_changed(search_url, results, platform="LinkedIn"):
+                    logging.info(f"LinkedIn results unchanged for '{keyword}', skipping extraction.")
+                    get_journal().complete("linkedin", keyword)
                     continue
-        except Exception as ex:
-            logging.error(f"Error in LinkedIn scraping for keyword '{keyword}': {ex}")
-            continue
 
-    driver.quit()
+                failed = False
+                for lead in leads:
+                    try:
+                        publish_lead("LinkedIn", keyword, lead)
+                    except Exception as inner_ex:
+                        logging.error(f"Error processing a LinkedIn post: {inner_ex}")
+                        failed = True
+                        continue
+
+                if not failed:
+                    get_page_cache().mark_processed(search_url, results)
+                    get_journal().complete("linkedin", keyword)
+            except Exception as ex:
+                logging.error(f"Error in LinkedIn scraping for keyword '{keyword}': {ex}")
+                continue
+
     logging.info("LinkedIn scraping complete.")
 
 def scrape_reddit():
     """Scrapes Reddit for freelance job leads."""
+    if config.platform("reddit").fetch_backend == "http":
+        return scrape_reddit_api()
+
+    from bs4 import BeautifulSoup
+    from browser import load_page, managed_driver
+
     logging.info("Starting Reddit scraping...")
-    driver = get_driver()
-    driver.get("https://www.reddit.com/")
-    time.sleep(5)
+    traffic = get_traffic_controller()
+    keywords = get_journal().remaining("reddit", config.platform("reddit").queries or FREELANCE_KEYWORDS)
+
+    def open_home(driver):
+        traffic.run("Reddit", "https://www.reddit.com/", lambda: load_page(driver, "https://www.reddit.com/"))
+
+    with managed_driver(on_start=open_home) as driver:
+        links = []
+
+        for keyword in keywords:
+            driver.recycle_if_needed()
+            try:
+                search_url = f"https://www.reddit.com/search/?q={keyword.replace(' ', '%20')}&type=link"
+                traffic.run("Reddit", search_url, lambda: load_page(driver, search_url))
+
+                soup = BeautifulSoup(driver.page_source, "html.parser")
+                posts = soup.find_all("a", {"data-click-id": "body"})
+                # Comment counts are not in the hashed result list, so threads are always rechecked
+                links.extend(post["href"] for post in posts if post.get("href"))
+                rows = [(post.get_text("\n", strip=True), post.get("href")) for post in posts]
+                soup.decompose()  # Only plain strings are used from here on; free the tree now
+                leads = normalize_page("Reddit", rows)
+                results = page_fingerprint(leads)
+                if not get_page_cache().content_changed(search_url, results, platform="Reddit"):
+                    logging.info(f"Reddit results unchanged for '{keyword}', skipping extraction.")
+                    get_journal().complete("reddit", keyword)
+                    continue
+
+                failed = False
+                for lead in leads:
+                    try:
+                        publish_lead("Reddit", keyword, lead)
+                    except Exception as inner_ex:
+                        logging.error(f"Error processing a Reddit post: {inner_ex}")
+                        failed = True
+                        continue
+
+                if not failed:
+                    get_page_cache().mark_processed(search_url, results)
+                    get_journal().complete("reddit", keyword)
+            except Exception as ex:
+                logging.error(f"Error in Reddit scraping for keyword '{keyword}': {ex}")
+                continue
 
-    for keyword in FREELANCE_KEYWORDS:
         try:
-            search_url = f"https://www.reddit.com/search/?q={keyword.replace(' ', '%20')}&type=link"
-            driver.get(search_url)
-            time.sleep(5)
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            posts = soup.find_all("a", {"data-click-id": "body"})
-
-            for post in posts:
-                try:
-                    content = post.get_text(strip=True)
-                    link = post["href"]
-                    post_id = link.split("/")[-2]
-
-                    if save_lead("Reddit", post_id, keyword, content, link):
-                        bot.loop.create_task(send_discord_alert("Reddit", keyword, content, link))
-                        if GENERATE_REPLY_DRAFT:
-                            prepare_reply({
-                                "platform": "Reddit",
-                                "post_id": post_id,
-                                "title": keyword,
-                                "content": content,
-                                "link": link
-                            })
-                except Exception as inner_ex:
-                    logging.error(f"Error processing a Reddit post: {inner_ex}")
-                    continue
+            harvest_reddit(Database(manager=get_manager()), links, cache=get_page_cache(), traffic=traffic)
+        except Exception as ex:
+            logging.error(f"Error harvesting Reddit comments: {ex}")
+
+    logging.info("Reddit scraping complete.")
+
+def scrape_reddit_api():
+    """Scrapes Reddit through its JSON search API, without a browser."""
+    logging.info("Starting Reddit scraping (JSON API)...")
+    traffic = get_traffic_controller()
+    links = []
+
+    for keyword in get_journal().remaining("reddit", config.platform("reddit").queries or FREELANCE_KEYWORDS):
+        try:
+            posts = search_reddit(keyword, cache=get_page_cache(), traffic=traffic)
         except Exception as ex:
             logging.error(f"Error in Reddit scraping for keyword '{keyword}': {ex}")
             continue
 
-    driver.quit()
+        links.extend(post["link"] for post in posts)
+        rows = [(post["content"], post["link"], None, post["author"]) for post in posts]
+        failed = False
+        for lead in normalize_page("Reddit", rows):
+            try:
+                publish_lead("Reddit", keyword, lead)
+            except Exception as inner_ex:
+                logging.error(f"Error processing a Reddit post: {inner_ex}")
+                failed = True
+                continue
+        if not failed:
+            get_journal().complete("reddit", keyword)
+
+    try:
+        harvest_reddit(Database(manager=get_manager()), links, cache=get_page_cache(), traffic=traffic)
+    except Exception as ex:
+        logging.error(f"Error harvesting Reddit comments: {ex}")
+
     logging.info("Reddit scraping complete.")
 
 def scrape_upwork():
     """Scrapes Upwork for freelance job listings."""
-    logging.info("Starting Upwork scraping...")
-    driver = get_driver()
-    driver.get("https://www.upwork.com/nx/jobs/search/?q=python")
-    time.sleep(5)
-
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    jobs = soup.find_all("section", class_="air-card")
+    from bs4 import BeautifulSoup
+    from browser import load_page, managed_driver
 
-    for job in jobs:
-        try:
-            title = job.find("h4").get_text(strip=True)
-            content = job.find("div", class_="job-description").get_text(strip=True)
-            link = job.find("a")["href"]
-            post_id = link.split("/")[-1]
-
-            if save_lead("Upwork", post_id, title, content, link):
-                bot.loop.create_task(send_discord_alert("Upwork", title, content, link))
-                if GENERATE_REPLY_DRAFT:
-                    prepare_reply({
-                        "platform": "Upwork",
-                        "post_id": post_id,
-                        "title": title,
-                        "content": content,
-                        "link": link
-                    })
-        except Exception as ex:
-            logging.error(f"Error processing an Upwork job: {ex}")
-            continue
+    logging.info("Starting Upwork scraping...")
+    with managed_driver() as driver:
+        traffic = get_traffic_controller()
+        traffic.run("Upwork", "https://www.upwork.com/nx/jobs/search/?q=python", lambda: load_page(driver, "https://www.upwork.com/nx/jobs/search/?q=python"))
+
+        soup = BeautifulSoup(driver.page_source, "html.parser")
+        jobs = soup.find_all("section", class_="air-card")
+        # The whole card is kept (minus chrome) so the budget line is available for extraction
+        rows = [
+            (job.get_text("\n", strip=True), job.a.get("href") if job.a else None,
+             job.h4.get_text(strip=True) if job.h4 else None)
+            for job in jobs
+        ]
+        soup.decompose()  # Only plain strings are used from here on; free the tree now
+        leads = normalize_page("Upwork", rows)
+        results_url, results = driver.current_url, page_fingerprint(leads)
+        if not get_page_cache().content_changed(results_url, results, platform="Upwork"):
+            logging.info("Upwork results unchanged, skipping extraction.")
+            leads = []
+
+        failed = False
+        for lead in leads:
+            try:
+                title = lead.title or lead.content.split("\n", 1)[0]
+                publish_lead("Upwork", title, lead)
+            except Exception as ex:
+                logging.error(f"Error processing an Upwork job: {ex}")
+                failed = True
+                continue
+
+        if leads and not failed:
+            get_page_cache().mark_processed(results_url, results)
 
-    driver.quit()
     logging.info("Upwork scraping complete.")
 
-# ============================== DISCORD ALERT ==============================
-intents = discord.Intents.default()
-bot = commands.Bot(command_prefix="!", intents=intents)
+# ============================== DISCORD BOT ==============================
+_bot = None
 
-async def send_discord_alert(platform, title, content, link):
-    """Sends a Discord alert when a new freelance job is found."""
-    channel = bot.get_channel(DISCORD_CHANNEL_ID)
-    if not channel:
-        channel = await bot.fetch_channel(DISCORD_CHANNEL_ID)
+def discord_channel_id():
+    """Return DISCORD_CHANNEL_ID as an int, failing with a clear message when it is unset."""
+    if not config.DISCORD_CHANNEL_ID:
+        raise ValueError("DISCORD_CHANNEL_ID must be set to a numeric Discord channel ID.")
+    return int(config.DISCORD_CHANNEL_ID)
 
-    embed = discord.Embed(title=f"🚀 New Freelance Lead ({platform})", color=discord.Color.blue())
-    embed.add_field(name="Title", value=title, inline=False)
-    embed.add_field(name="Description", value=content[:300] + "..." if len(content) > 300 else content, inline=False)
-    embed.add_field(name="Link", value=f"[View Post]({link})", inline=False)
-    embed.set_footer(text="Freelancer Lead Finder Bot")
-
-    await channel.send(embed=embed)
-    logging.info(f"Discord alert sent for {platform} | {title}")
+def get_bot():
+    """Create the Discord bot on first use."""
+    global _bot
+    if _bot is None:
+        import discord
+        from discord.ext import commands
+        _bot = commands.Bot(command_prefix="!", intents=discord.Intents.default())
+    return _bot
 
 # ============================== MAIN FUNCTION ==============================
+SCRAPERS = {
+    "twitter": scrape_twitter,
+    "linkedin": scrape_linkedin,
+    "reddit": scrape_reddit,
+    "upwork": scrape_upwork,
+}
+
 def run_scrapers():
     """Runs all the scrapers sequentially."""
     logging.info("Starting scraper cycle...")
-    scrape_twitter()
-    scrape_linkedin()
-    scrape_reddit()
-    scrape_upwork()
+    config.reload_if_changed()  # Pick up retuned settings without restarting the bot
+    journal = get_journal()
+    monitor = get_memory_monitor()
+    journal.begin_cycle()  # Resumes the cycle a crash interrupted, skipping finished work
+    for platform, scraper in SCRAPERS.items():
+        if not config.platform(platform).enabled or journal.is_done(platform, ALL_QUERIES):
+            continue
+        try:
+            with monitor.stage(platform):
+                scraper()
+            journal.complete(platform, ALL_QUERIES)
+        except Exception as ex:
+            # An open circuit or exhausted retries skips this platform, not the whole cycle
+            logging.error(f"{scraper.__name__} failed: {ex}")
+    journal.finish_cycle()
+    get_page_cache().log_report()
+    monitor.log_report()
+    for sink, counters in get_notifier().stats().items():
+        logging.info(f"Alerts [{sink}]: {counters}")
     logging.info("Scraper cycle complete. Waiting for next cycle...")
     time.sleep(config.SCRAPE_INTERVAL * 60)
 
+def run_forever():
+    """Run scraper cycles until the process stops."""
+    # Alerts and drafts a crash left undelivered go out before any new scraping
+    get_journal().recover(dispatch_lead)
+    while True:
+        try:
+            run_scrapers()
+        except Exception as ex:
+            # Nothing awaits the executor future, so an escaping error would end scraping silently
+            logging.error(f"Scraper cycle failed: {ex}")
+            time.sleep(config.SCRAPE_INTERVAL * 60)
+
 # ============================== EXECUTION ==============================
-if __name__ == "__main__":
+def main():
+    """Start the Discord bot and run the scrapers in a worker thread once it is connected."""
+    setup_logging()
+    channel_id = discord_channel_id()  # Fail fast on a missing channel before launching anything
     init_db()
-    bot.loop.create_task(run_scrapers())
+    get_memory_monitor().install_signal_handler()  # kill -USR1 <pid> logs the top Python allocations
+    bot = get_bot()
+    # Each sink (Discord, Telegram, email, webhook) sends from its own worker thread
+    set_notifier(Notifier(build_sinks(bot=bot, channel_id=channel_id)))
+    started = False
+
+    @bot.event
+    async def on_ready():
+        nonlocal started
+        if started:
+            return  # on_ready fires again after reconnects
+        started = True
+        # Selenium scraping blocks, so keep it off the bot's event loop
+        bot.loop.run_in_executor(None, run_forever)
+
     bot.run(DISCORD_TOKEN)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import contextlib
+import gc
+import logging
+import os
+import signal
+import threading
+import tracemalloc
+
+from config import config
+
+MIB = 1024 * 1024
+
+# ============================== MEASUREMENT ==============================
+def _proc_rss(pid, page_size):
+    with open(f"/proc/{pid}/statm") as fh:
+        return int(fh.read().split()[1]) * page_size
+
+def _child_pids(pid):
+    """All descendants of `pid` (chromedriver, Chrome and its renderers), from /proc."""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as fh:
+                # The command name may contain spaces, so read the fields after its closing paren
+                parents.setdefault(int(fh.read().rsplit(")", 1)[1].split()[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue  # The process exited while we were looking
+    found, stack = [], [pid]
+    while stack:
+        children = parents.get(stack.pop(), [])
+        found.extend(children)
+        stack.extend(children)
+    return found
+
+def rss_bytes(include_children=True):
+    """Resident memory of this process, plus its child processes such as Chrome, in bytes.
+
+    Read from /proc; returns None where that is unavailable, which disables the
+    ceiling. getrusage only reports a peak that never drops, so a browser
+    restart could never bring it back under the ceiling.
+    """
+    pid = os.getpid()
+    try:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        total = _proc_rss(pid, page_size)
+    except (OSError, ValueError, AttributeError):
+        return None
+    if include_children:
+        for child in _child_pids(pid):
+            try:
+                total += _proc_rss(child, page_size)
+            except OSError:
+                continue
+    return total
+
+# ============================== MONITOR ==============================
+class MemoryMonitor:
+    """Tracks resident memory per scraper stage and enforces MEMORY_CEILING_MB.
+
+    Each stage records the highest RSS sampled while it ran (at its start and
+    end and at every `over_ceiling()` check) and, when tracemalloc is tracing,
+    the Python heap peak. `snapshot()` logs the top allocation sites on demand,
+    for example from SIGUSR1.
+    """
+
+    def __init__(self, ceiling_mb=None, trace=None, rss=rss_bytes):
+        self._ceiling_mb = ceiling_mb
+        self.rss = rss
+        self.stages = {}
+        self.recycles = 0
+        self._current = None
+        self._lock = threading.Lock()
+        if (config.MEMORY_TRACE if trace is None else trace) and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def ceiling(self):
+        """The ceiling in bytes, or 0 when disabled. Read on each check so a config reload applies."""
+        return (config.MEMORY_CEILING_MB if self._ceiling_mb is None else self._ceiling_mb) * MIB
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Attribute memory sampled inside the block to stage `name`."""
+        with self._lock:
+            previous, self._current = self._current, name
+            entry = self.stages.setdefault(name, {"runs": 0, "peak_rss": 0, "last_rss": 0, "python_peak": 0})
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self.sample()
+        try:
+            yield
+        finally:
+            self.sample()
+            with self._lock:
+                entry["runs"] += 1
+                if tracemalloc.is_tracing():
+                    entry["python_peak"] = max(entry["python_peak"], tracemalloc.get_traced_memory()[1])
+                self._current = previous
+
+    def sample(self):
+        """Read RSS now, credit it to the running stage and return it (None if unknown)."""
+        rss = self.rss()
+        if rss is not None:
+            with self._lock:
+                entry = self.stages.get(self._current)
+                if entry is not None:
+                    entry["last_rss"] = rss
+                    entry["peak_rss"] = max(entry["peak_rss"], rss)
+        return rss
+
+    def over_ceiling(self):
+        """True when resident memory is above the configured ceiling."""
+        ceiling = self.ceiling
+        if not ceiling:
+            return False
+        rss = self.sample()
+        return rss is not None and rss > ceiling
+
+    def snapshot(self, limit=10):
+        """Log and return the top `limit` Python allocation sites.
+
+        Starts tracemalloc if it is not running, in which case the call only
+        arms tracing and the next snapshot shows allocations made since.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            logging.info("tracemalloc started; take another snapshot to see allocation sites.")
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        top = snapshot.statistics("lineno")[:limit]
+        current, peak = tracemalloc.get_traced_memory()
+        logging.info(f"Python heap: {current / MIB:.1f} MiB now, {peak / MIB:.1f} MiB peak. Top allocations:")
+        for stat in top:
+            logging.info(f"  {stat}")
+        return top
+
+    def install_signal_handler(self, signum=None):
+        """Log a tracemalloc snapshot whenever the process receives `signum` (default SIGUSR1, POSIX only)."""
+        signum = signum or getattr(signal, "SIGUSR1", None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signum, lambda *_: self.snapshot())
+        return True
+
+    def log_report(self):
+        """Log peak and last RSS per stage."""
+        with self._lock:
+            stages = {name: dict(entry) for name, entry in self.stages.items()}
+        for name, entry in stages.items():
+            line = (f"Memory [{name}]: peak RSS {entry['peak_rss'] / MIB:.0f} MiB, "
+                    f"last {entry['last_rss'] / MIB:.0f} MiB over {entry['runs']} runs")
+            if entry["python_peak"]:
+                line += f", Python heap peak {entry['python_peak'] / MIB:.1f} MiB"
+            logging.info(line)
+        if self.recycles:
+            logging.info(f"Browsers recycled for memory: {self.recycles}")
+
+# ============================== DRIVER RECYCLING ==============================
+class RecyclingDriver:
+    """Context manager around a WebDriver that restarts the browser when memory passes the ceiling.
+
+    Attribute access is forwarded to the current driver, so it can be passed
+    wherever a driver is expected. `on_start(driver)` runs after every (re)start,
+    e.g. to reopen the page a scraper works from. The browser is always quit on
+    exit, including when the block raises.
+    """
+
+    def __init__(self, factory, on_start=None, monitor=None):
+        self.factory = factory
+        self.on_start = on_start
+        self.monitor = monitor or get_memory_monitor()
+        self.driver = None
+        self.recycles = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.quit()
+        return False
+
+    def __getattr__(self, name):
+        driver = self.__dict__.get("driver")
+        if driver is None:
+            raise AttributeError(name)
+        return getattr(driver, name)
+
+    def start(self):
+        self.driver = self.factory()
+        if self.on_start is not None:
+            try:
+                self.on_start(self.driver)
+            except BaseException:
+                self.quit()
+                raise
+
+    def quit(self):
+        driver, self.driver = self.driver, None
+        if driver is not None:
+            driver.quit()
+
+    def recycle(self):
+        """Quit the browser and start a fresh one."""
+        self.quit()
+        gc.collect()
+        self.recycles += 1
+        self.monitor.recycles += 1
+        self.start()
+
+    def recycle_if_needed(self):
+        """Recycle the browser if memory is over the ceiling. Returns True if it did."""
+        if not self.monitor.over_ceiling():
+            return False
+        before = self.monitor.rss()
+        self.recycle()
+        after = self.monitor.sample()
+        logging.info(
+            f"Memory ceiling {self.monitor.ceiling / MIB:.0f} MiB exceeded; recycled the browser "
+            f"({(before or 0) / MIB:.0f} -> {(after or 0) / MIB:.0f} MiB)."
+        )
+        if after is not None and after > self.monitor.ceiling:
+            logging.warning("Still over the memory ceiling after recycling the browser; check snapshot() for leaks.")
+        return True
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+def get_memory_monitor():
+    """Return the process-wide MemoryMonitor."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = MemoryMonitor()
+        return _monitor
@@ -0,0 +1,250 @@
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+from urllib.parse import urljoin, urlsplit
+
+from page_cache import normalize_url
+
+# ============================== PATTERNS ==============================
+# Everything is compiled once at import; normalizing a page only runs matches.
+
+BASE_URLS = {
+    "twitter": "https://twitter.com/",
+    "linkedin": "https://www.linkedin.com/",
+    "reddit": "https://www.reddit.com/",
+    "upwork": "https://www.upwork.com/",
+}
+
+# Canonical post ID and URL per platform: (pattern over the absolute link, canonical URL template)
+POST_ID_PATTERNS = {
+    "twitter": (
+        re.compile(r"(?:twitter|x)\.com/(?P<author>\w{1,15})/status(?:es)?/(?P<id>\d+)", re.IGNORECASE),
+        "https://twitter.com/{author}/status/{id}",
+    ),
+    "reddit": (
+        re.compile(r"reddit\.com/(?:r/(?P<sub>\w+)/)?comments/(?P<id>[a-z0-9]+)|redd\.it/(?P<short>[a-z0-9]+)", re.IGNORECASE),
+        "https://www.reddit.com/comments/{id}",
+    ),
+    "linkedin": (
+        re.compile(r"urn(?::|%3A)li(?::|%3A)(?:activity|share|ugcPost)(?::|%3A)(?P<id>\d+)|activity-(?P<slug>\d{10,})", re.IGNORECASE),
+        "https://www.linkedin.com/feed/update/urn:li:activity:{id}",
+    ),
+    "upwork": (
+        re.compile(r"~(?P<id>0[0-9a-f]{10,})", re.IGNORECASE),
+        "https://www.upwork.com/jobs/~{id}",
+    ),
+}
+
+COUNT = r"[\d.,]+\s*[KkMm]?"
+COMMON_CHROME = (
+    r"show (?:more|less)|see (?:more|less|translation)|read more|(?:…|\.\.\.)\s*(?:see )?more|translate post|"
+    r"show translation|promoted|sponsored|follow|following|reply|replies|repost|retweet|quote|share|like|"
+    r"comment|send|save|edited|·|•|"
+    rf"{COUNT}|{COUNT}\s+(?:likes?|comments?|reposts?|retweets?|replies|repl(?:y|ies)|views?|reactions?|"
+    r"upvotes?|votes?|points?|quotes?|bookmarks?)"
+)
+PLATFORM_CHROME = {
+    "twitter": r"replying to @\w{1,15}|show this thread|views|pinned|ad",
+    "linkedin": r"(?P<degree>•?\s*(?:1st|2nd|3rd\+))|\+?\s*follow|visible to anyone on or off linkedin|view profile|connect|"
+                r"\d+\s+(?:followers|connections)",
+    "reddit": r"join|vote|award|crosspost|\d+\s+comments?|r/\w+",
+    "upwork": r"save job|payment (?:un)?verified|rating is [\d.]+ out of 5\.?|proposals?:.*|"
+              r"\$[\d.,]+[KkMm]?\+?\s+spent|more|less",
+}
+RELATIVE_TIME = (
+    r"(?:posted\s+)?(?P<amount>\d+|an?)\s*(?P<unit>s|sec|m|min|h|hr|d|w|mo|y|yr|seconds?|minutes?|hours?|"
+    r"days?|weeks?|months?|years?)(?:\s+ago)?\s*(?:•.*)?|(?P<now>just now|yesterday)"
+)
+ABSOLUTE_TIME = r"(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(?P<day>\d{1,2})(?:,\s*(?P<year>\d{4}))?"
+AUTHOR = r"@(?P<handle>\w{1,15})|(?:posted by\s+)?u/(?P<user>[\w-]{3,20})"
+
+# One full-line classifier per platform, so each line is matched once. Timestamps
+# come first so "5m" reads as five minutes rather than a five million count.
+LINE_PATTERNS = {
+    platform: re.compile(
+        rf"(?P<time>{RELATIVE_TIME}|{ABSOLUTE_TIME})|(?P<chrome>{COMMON_CHROME}|{chrome})|(?P<author>{AUTHOR})",
+        re.IGNORECASE,
+    )
+    for platform, chrome in PLATFORM_CHROME.items()
+}
+DEFAULT_LINE_PATTERN = re.compile(
+    rf"(?P<time>{RELATIVE_TIME}|{ABSOLUTE_TIME})|(?P<chrome>{COMMON_CHROME})|(?P<author>{AUTHOR})", re.IGNORECASE
+)
+
+# Budget and contact hints, found in a single scan of the cleaned text. Every
+# branch starts on a distinctive character so the scan stays cheap; the
+# "Hourly:"/"Fixed-price:" label is read from just before a budget match.
+HINTS_RE = re.compile(
+    r"(?P<budget>\$\s?\d[\d,]*(?:\.\d+)?\s?[kK]?(?:\s?(?:-|–|to)\s?\$?\s?\d[\d,]*(?:\.\d+)?\s?[kK]?)?"
+    r"(?:\s?(?:/\s?(?:hr|hour|h)\b|per hour|an hour))?)"
+    r"|(?P<email>(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)+)"
+    r"|(?P<telegram>\bt\.me/\w+)"
+    r"|(?P<dm>\b(?:dm|pm|message|email|contact|ping)\s+me\b|\breach out\b)",
+    re.IGNORECASE,
+)
+BUDGET_LABEL_RE = re.compile(r"(hourly|fixed[- ]price|budget)\W{0,3}$", re.IGNORECASE)
+WHITESPACE_RE = re.compile(r"[ \t\xa0]+")
+
+TIME_UNITS = {
+    "s": "seconds", "sec": "seconds", "second": "seconds",
+    "m": "minutes", "min": "minutes", "minute": "minutes",
+    "h": "hours", "hr": "hours", "hour": "hours",
+    "d": "days", "day": "days",
+    "w": "weeks", "week": "weeks",
+}
+MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
+# ============================== NORMALIZATION ==============================
+class NormalizedPost(NamedTuple):
+    """A scraped post with a canonical key, cleaned text and extracted hints."""
+
+    platform: str
+    post_id: str
+    link: str
+    content: str
+    title: str = None
+    author: str = None
+    posted: str = None  # UTC, formatted like SQLite's CURRENT_TIMESTAMP
+    budget: str = None
+    contact: str = None
+
+    def details(self):
+        """The extracted fields stored alongside the lead."""
+        return {"author": self.author, "posted": self.posted, "budget": self.budget, "contact": self.contact}
+
+def _absolute(platform, link):
+    url = link.strip()
+    if not url.startswith(("https://", "http://")):
+        url = urljoin(BASE_URLS.get(platform, ""), url)
+    return url
+
+def parse_post_link(platform, link):
+    """Return the named parts of a known post URL shape (always "id", plus e.g. "author"), or None."""
+    key = platform.lower()
+    pattern = POST_ID_PATTERNS.get(key)
+    match = pattern[0].search(_absolute(key, link)) if pattern and link else None
+    if not match:
+        return None
+    groups = {name: value for name, value in match.groupdict().items() if value}
+    post_id = groups.get("id") or groups.get("short") or groups.get("slug")
+    return {**groups, "id": post_id.lower() if key == "reddit" else post_id}
+
+def canonical_post(platform, link):
+    """Return (post_id, canonical URL) for a post link, or (None, None) if there is no link.
+
+    Known post URL shapes map to the platform's own ID (tweet status, Reddit
+    base36 thread, LinkedIn activity, Upwork job ciphertext), so query strings,
+    trailing slashes, mobile hosts and title slugs all give the same key.
+    """
+    if not link:
+        return None, None
+    key = platform.lower()
+    parts = parse_post_link(key, link)
+    if parts:
+        return parts["id"], POST_ID_PATTERNS[key][1].format(**parts)
+    # Unknown shape: fall back to the last path segment of the normalized URL
+    url = normalize_url(_absolute(key, link))
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+    return (segments[-1] if segments else url), url
+
+def _posted_at(match, now):
+    if match.group("now"):
+        return now - timedelta(days=1) if match.group("now").lower() == "yesterday" else now
+    if match.group("unit"):
+        amount = 1 if match.group("amount").lower() in ("a", "an") else int(match.group("amount"))
+        unit = match.group("unit").lower().rstrip("s") or "s"
+        if unit in ("mo", "month"):
+            return now - timedelta(days=30 * amount)
+        if unit in ("y", "yr", "year"):
+            return now - timedelta(days=365 * amount)
+        return now - timedelta(**{TIME_UNITS.get(unit, "minutes"): amount})
+    month = MONTHS.index(match.group("month").lower()[:3]) + 1
+    try:
+        return now.replace(year=int(match.group("year") or now.year), month=month, day=int(match.group("day")),
+                           hour=0, minute=0, second=0, microsecond=0)
+    except ValueError:
+        return None
+
+def normalize_post(platform, text, link, title=None, author=None, now=None):
+    """Clean one post's text and extract its canonical ID, author, timestamp, budget and contact hints."""
+    post_id, url = canonical_post(platform, link)
+    if post_id is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    line_pattern = LINE_PATTERNS.get(platform.lower(), DEFAULT_LINE_PATTERN)
+    twitter = platform.lower() == "twitter"
+    posted = None
+    kept = []
+    for line in (text or "").splitlines():
+        line = WHITESPACE_RE.sub(" ", line).strip()
+        if not line or line == title:
+            continue
+        match = line_pattern.fullmatch(line)
+        if match is None:
+            kept.append(line)
+        elif match.group("author"):
+            if author is None:
+                author = match.group("handle") or match.group("user")
+                if twitter and len(kept) <= 2:
+                    kept.clear()  # The display name above the handle is header chrome too
+            else:
+                kept.append(line)
+        elif match.group("time"):
+            if posted is None:
+                posted = _posted_at(match, now)
+        elif author is None and kept and match.groupdict().get("degree"):
+            author = kept.pop()  # LinkedIn puts the connection degree right under the author's name
+    content = "\n".join(kept)
+
+    budget = None
+    contacts = []
+    for hint in HINTS_RE.finditer(content):
+        if hint.group("budget"):
+            if budget is None:
+                label = BUDGET_LABEL_RE.search(content, max(0, hint.start() - 16), hint.start())
+                budget = f"{label.group(1)}: {hint.group().strip()}" if label else hint.group().strip()
+        elif hint.group(hint.lastgroup) not in contacts:
+            contacts.append(hint.group(hint.lastgroup))
+
+    if author is None and twitter:
+        author = (parse_post_link("twitter", url) or {}).get("author")
+    return NormalizedPost(
+        platform=platform,
+        post_id=post_id,
+        link=url,
+        content=content,
+        title=title,
+        author=author,
+        posted=posted.strftime("%Y-%m-%d %H:%M:%S") if posted else None,
+        budget=budget,
+        contact=", ".join(contacts) or None,
+    )
+
+def normalize_page(platform, posts, now=None):
+    """Normalize a page of posts given as (text, link[, title]) tuples.
+
+    Posts without a link are skipped, and a post listed twice on the page is
+    kept once, so callers only see one entry per canonical post_id.
+    """
+    now = now or datetime.now(timezone.utc)
+    seen = set()
+    normalized = []
+    for post in posts:
+        result = normalize_post(platform, *post, now=now)
+        if result is None:
+            logging.debug(f"Skipping a {platform} post without a link.")
+            continue
+        if result.post_id in seen:
+            continue
+        seen.add(result.post_id)
+        normalized.append(result)
+    return normalized
+
+def page_fingerprint(posts):
+    """Summarize normalized posts by canonical ID and link for page change detection.
+
+    Rendered text is left out: relative times and like counts change on every
+    visit even when the result list is the same.
+    """
+    return "\n".join(f"{post.post_id} {post.link}" for post in posts)
@@ -0,0 +1,429 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+
+from config import config
+from rate_limiter import RetryPolicy, TokenBucket
+
+_STOP = object()
+
+# ============================== SINKS ==============================
+# A sink turns a batch of lead alerts into one outgoing message. Transports
+# (HTTP post, SMTP, the Discord bot) are injected so every sink can run
+# offline against the Recording* stand-ins below.
+
+class Sink:
+    """Base class for alert channels. Subclasses implement `deliver(subject, text)`."""
+
+    name = "sink"
+    max_batch = 10  # Leads per outgoing message
+
+    def deliver(self, subject, text):
+        raise NotImplementedError
+
+    @staticmethod
+    def format_alert(alert):
+        content = alert["content"] or ""
+        if len(content) > 300:
+            content = content[:300] + "..."
+        return f"🚀 New Freelance Lead ({alert['platform']}): {alert['title']}\n{content}\n{alert['link']}"
+
+    @staticmethod
+    def format_digest(alerts):
+        counts = Counter(alert["platform"] for alert in alerts)
+        lines = [f"{len(alerts)} new leads: " + ", ".join(f"{p} {n}" for p, n in sorted(counts.items()))]
+        lines += [f"- [{a['platform']}] {a['title']}: {a['link']}" for a in alerts[:20]]
+        if len(alerts) > 20:
+            lines.append(f"...and {len(alerts) - 20} more")
+        return "\n".join(lines)
+
+    def send(self, alerts):
+        """Send one message covering `alerts` (at most max_batch of them)."""
+        subject = alerts[0]["title"] if len(alerts) == 1 else f"{len(alerts)} new freelance leads"
+        self.deliver(subject, "\n\n".join(self.format_alert(a) for a in alerts))
+
+    def send_digest(self, alerts):
+        """Send one summary message for everything collected in a digest window."""
+        self.deliver(f"Lead digest: {len(alerts)} new leads", self.format_digest(alerts))
+
+class DiscordSink(Sink):
+    """Posts embeds to a channel. `send` receives a Discord message payload dict."""
+
+    name = "discord"
+
+    def __init__(self, send):
+        self._send = send
+
+    def send(self, alerts):
+        embeds = []
+        for alert in alerts:
+            content = alert["content"] or ""
+            embeds.append({
+                "title": f"🚀 New Freelance Lead ({alert['platform']})",
+                "color": 0x3498DB,
+                "fields": [
+                    {"name": "Title", "value": alert["title"][:1024], "inline": False},
+                    {"name": "Description", "value": (content[:300] + "..." if len(content) > 300 else content) or "-",
+                     "inline": False},
+                    {"name": "Link", "value": f"[View Post]({alert['link']})", "inline": False},
+                ],
+                "footer": {"text": "Freelancer Lead Finder Bot"},
+            })
+        self._send({"embeds": embeds})
+
+    def deliver(self, subject, text):
+        self._send({"content": f"**{subject}**\n{text}"[:2000]})
+
+class TelegramSink(Sink):
+    """Sends messages through the Telegram Bot API."""
+
+    name = "telegram"
+
+    def __init__(self, token, chat_id, post=None, timeout=30):
+        self.url = f"https://api.telegram.org/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.post = post or _requests_post
+        self.timeout = timeout
+
+    def deliver(self, subject, text):
+        response = self.post(self.url, json={
+            "chat_id": self.chat_id,
+            "text": f"{subject}\n\n{text}"[:4096],
+            "disable_web_page_preview": True,
+        }, timeout=self.timeout)
+        response.raise_for_status()
+
+class EmailSink(Sink):
+    """Sends plain-text email over SMTP (STARTTLS when credentials are given)."""
+
+    name = "email"
+    max_batch = 50
+
+    def __init__(self, host, port, sender, recipients, username=None, password=None, smtp=None, timeout=30):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.smtp = smtp
+        self.timeout = timeout
+
+    def deliver(self, subject, text):
+        import smtplib
+        from email.message import EmailMessage
+
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        message.set_content(text)
+        with (self.smtp or smtplib.SMTP)(self.host, self.port, timeout=self.timeout) as server:
+            if self.username:
+                server.starttls()
+                server.login(self.username, self.password)
+            server.send_message(message)
+
+class WebhookSink(Sink):
+    """POSTs leads as JSON to an arbitrary URL (Slack-compatible `text` included)."""
+
+    name = "webhook"
+    max_batch = 100
+
+    def __init__(self, url, post=None, timeout=30):
+        self.url = url
+        self.post = post or _requests_post
+        self.timeout = timeout
+
+    def _post(self, payload):
+        self.post(self.url, json=payload, timeout=self.timeout).raise_for_status()
+
+    def send(self, alerts):
+        self._post({"type": "leads", "text": "\n\n".join(map(self.format_alert, alerts)), "leads": alerts})
+
+    def send_digest(self, alerts):
+        self._post({"type": "digest", "text": self.format_digest(alerts), "leads": alerts})
+
+    def deliver(self, subject, text):
+        self._post({"type": "message", "text": f"{subject}\n{text}"})
+
+def _requests_post(url, **kwargs):
+    import requests
+    return requests.post(url, **kwargs)
+
+def discord_bot_transport(bot, channel_id, timeout=30):
+    """Return a DiscordSink transport that sends through a running discord.py bot from any thread."""
+    import asyncio
+
+    async def send(payload):
+        import discord
+
+        channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+        embeds = [discord.Embed.from_dict(embed) for embed in payload.get("embeds", [])]
+        await channel.send(content=payload.get("content"), embeds=embeds)
+
+    return lambda payload: asyncio.run_coroutine_threadsafe(send(payload), bot.loop).result(timeout)
+
+# ============================== LOCAL STAND-INS ==============================
+class RecordingResponse:
+    status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+class RecordingTransport:
+    """Offline stand-in for an HTTP post or Discord send: records each call and optionally logs it."""
+
+    def __init__(self, label="transport", log=False, delay=0.0, fail=False):
+        self.label = label
+        self.log = log
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.label} unavailable")
+        self.calls.append((args, kwargs))
+        if self.log:
+            logging.info(f"[{self.label} dry run] {args} {kwargs.get('json', '')}")
+        return RecordingResponse()
+
+class RecordingSMTP:
+    """Offline stand-in for smtplib.SMTP: use the instance as the `smtp` factory of EmailSink."""
+
+    def __init__(self, log=False):
+        self.log = log
+        self.messages = []
+
+    def __call__(self, host, port, timeout=None):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def send_message(self, message):
+        self.messages.append(message)
+        if self.log:
+            logging.info(f"[email dry run] {message['Subject']} -> {message['To']}")
+
+# ============================== FAN-OUT ==============================
+class SinkWorker:
+    """Delivers alerts for one sink on its own thread, batching and rate limiting as configured.
+
+    With `digest_seconds` set, alerts are collected and sent as a single
+    summary per window instead of per-lead messages.
+    """
+
+    def __init__(self, sink, batch_size=None, batch_seconds=None, rate_per_minute=None, digest_seconds=None,
+                 queue_size=None, policy=None, sleep=time.sleep, on_finished=None):
+        self.sink = sink
+        self.on_finished = on_finished  # Called with (batch, sent) once it is sent, failed or dropped
+        self.batch_size = min(batch_size or config.NOTIFY_BATCH_SIZE, sink.max_batch)
+        self.batch_seconds = config.NOTIFY_BATCH_SECONDS if batch_seconds is None else batch_seconds
+        self.digest_seconds = config.NOTIFY_DIGEST_MINUTES * 60 if digest_seconds is None else digest_seconds
+        rate = (rate_per_minute or config.NOTIFY_RATE_PER_MINUTE) / 60
+        self.bucket = TokenBucket(rate, capacity=1, sleep=sleep)
+        self.policy = policy or RetryPolicy(max_attempts=3)
+        self.sleep = sleep
+        self.queue = queue.Queue(queue_size or config.NOTIFY_QUEUE_SIZE)
+        self.stats = Counter()
+        self.thread = threading.Thread(target=self._run, name=f"notify-{sink.name}", daemon=True)
+        self.thread.start()
+
+    def put(self, alert):
+        """Queue `alert` without blocking. Returns False if the sink is backed up and the alert was dropped."""
+        try:
+            self.queue.put_nowait(alert)
+            return True
+        except queue.Full:
+            self.stats["dropped"] += 1
+            logging.warning(f"{self.sink.name} alert queue is full; dropping alert for {alert['link']}")
+            self._finished([alert], sent=False)
+            return False
+
+    def _finished(self, alerts, sent):
+        if self.on_finished is not None:
+            self.on_finished(alerts, sent)
+
+    def flush(self, timeout=None):
+        """Send everything queued so far, including a partial digest. Returns True once done."""
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout=None):
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+
+    def _run(self):
+        pending, deadline = [], None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # Batch or digest window elapsed
+            if isinstance(item, dict):
+                if not pending:
+                    deadline = time.monotonic() + (self.digest_seconds or self.batch_seconds)
+                pending.append(item)
+                if self.digest_seconds or len(pending) < self.batch_size:
+                    continue
+            if pending:
+                self._deliver(pending)
+                pending, deadline = [], None
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _deliver(self, alerts):
+        if self.digest_seconds:
+            self._attempt(self.sink.send_digest, alerts)
+            return
+        for start in range(0, len(alerts), self.batch_size):
+            self._attempt(self.sink.send, alerts[start:start + self.batch_size])
+
+    def _attempt(self, send, alerts):
+        sent = False
+        try:
+            for attempt in range(1, self.policy.max_attempts + 1):
+                self.bucket.acquire()
+                try:
+                    send(alerts)
+                except Exception as ex:
+                    if attempt == self.policy.max_attempts:
+                        self.stats["failed"] += len(alerts)
+                        logging.error(f"{self.sink.name} alert failed for {len(alerts)} leads: {ex}")
+                        return
+                    self.sleep(self.policy.delay(attempt))
+                    continue
+                self.stats["sent"] += len(alerts)
+                self.stats["messages"] += 1
+                sent = True
+                return
+        finally:
+            self._finished(alerts, sent)
+
+class Notifier:
+    """Fans each lead alert out to every sink's worker; never blocks the scraper."""
+
+    def __init__(self, sinks=(), **worker_options):
+        self.workers = [SinkWorker(sink, on_finished=self._finished, **worker_options) for sink in sinks]
+        self._callbacks = {}  # id(alert) -> [sinks still to finish, all sent so far, on_done]
+        self._lock = threading.Lock()
+
+    def notify(self, platform, title, content, link, on_done=None):
+        """Queue an alert for every sink.
+
+        `on_done(sent)` runs once each sink has sent, failed or dropped it;
+        `sent` is True only if every sink delivered it (or there are no sinks).
+        """
+        alert = {"platform": platform, "title": title, "content": content, "link": link}
+        if on_done is not None:
+            if not self.workers:
+                on_done(True)
+                return
+            with self._lock:
+                self._callbacks[id(alert)] = [len(self.workers), True, on_done]
+        for worker in self.workers:
+            worker.put(alert)
+
+    def _finished(self, alerts, sent):
+        done = []
+        with self._lock:
+            for alert in alerts:
+                entry = self._callbacks.get(id(alert))
+                if entry is None:
+                    continue
+                entry[0] -= 1
+                entry[1] = entry[1] and sent
+                if entry[0] == 0:
+                    done.append(self._callbacks.pop(id(alert))[1:])
+        for all_sent, on_done in done:
+            try:
+                on_done(all_sent)
+            except Exception as ex:
+                logging.error(f"Alert completion callback failed: {ex}")
+
+    def flush(self, timeout=None):
+        return all([worker.flush(timeout) for worker in self.workers])
+
+    def stats(self):
+        """Return {sink name: counters} of sent, failed and dropped alerts."""
+        return {worker.sink.name: dict(worker.stats) for worker in self.workers}
+
+    def close(self, timeout=30):
+        """Send what is pending and stop every worker."""
+        for worker in self.workers:
+            worker.stop(timeout)
+
+def build_sinks(bot=None, channel_id=None, dry_run=None):
+    """Create the sinks named in NOTIFY_SINKS that have their credentials configured."""
+    dry_run = config.NOTIFY_DRY_RUN if dry_run is None else dry_run
+    sinks = []
+    for name in (n.strip().lower() for n in config.NOTIFY_SINKS.split(",") if n.strip()):
+        post = RecordingTransport(name, log=True) if dry_run else None
+        if name == "discord":
+            if dry_run:
+                sinks.append(DiscordSink(post))
+            elif bot is not None and channel_id:
+                sinks.append(DiscordSink(discord_bot_transport(bot, channel_id)))
+            else:
+                logging.warning("Discord sink needs a running bot and DISCORD_CHANNEL_ID; skipping.")
+        elif name == "telegram":
+            if config.TELEGRAM_BOT_TOKEN and config.TELEGRAM_CHAT_ID or dry_run:
+                sinks.append(TelegramSink(config.TELEGRAM_BOT_TOKEN, config.TELEGRAM_CHAT_ID, post=post))
+            else:
+                logging.warning("Telegram sink needs TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID; skipping.")
+        elif name == "email":
+            recipients = [r.strip() for r in config.ALERT_EMAIL_TO.split(",") if r.strip()]
+            if config.SMTP_HOST and recipients or dry_run:
+                sinks.append(EmailSink(
+                    config.SMTP_HOST, config.SMTP_PORT, config.ALERT_EMAIL_FROM, recipients,
+                    username=config.SMTP_USERNAME, password=config.SMTP_PASSWORD,
+                    smtp=RecordingSMTP(log=True) if dry_run else None,
+                ))
+            else:
+                logging.warning("Email sink needs SMTP_HOST and ALERT_EMAIL_TO; skipping.")
+        elif name == "webhook":
+            if config.ALERT_WEBHOOK_URL or dry_run:
+                sinks.append(WebhookSink(config.ALERT_WEBHOOK_URL, post=post))
+            else:
+                logging.warning("Webhook sink needs ALERT_WEBHOOK_URL; skipping.")
+        else:
+            logging.warning(f"Unknown notification sink '{name}'; skipping.")
+    return sinks
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+def get_notifier():
+    """Return the process-wide Notifier, creating one from config on first use."""
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            _notifier = Notifier(build_sinks())
+        return _notifier
+
+def set_notifier(notifier):
+    """Install `notifier` as the process-wide Notifier, closing the previous one."""
+    global _notifier
+    with _notifier_lock:
+        previous, _notifier = _notifier, notifier
+    if previous is not None:
+        previous.close()
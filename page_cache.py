@@ -0,0 +1,240 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import config
+from connection import ConnectionManager
+
+# Query parameters that never change the page content
+TRACKING_PARAMS = {"ref", "ref_src", "ref_url", "fbclid", "gclid", "igshid", "si", "trk", "trackingid"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def normalize_url(url, params=None):
+    """Return a canonical cache key for `url`: lowercase host, sorted query, no fragment or tracking params."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = parse_qsl(parts.query, keep_blank_values=True) + list((params or {}).items())
+    query = sorted(
+        (k, str(v)) for k, v in query
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+class PageCache:
+    """Disk-backed page cache keyed by normalized URL, with TTL, a size cap and LRU eviction.
+
+    HTTP fetches are served from disk while fresh and revalidated with
+    If-None-Match/If-Modified-Since once stale. Browser scrapes use
+    `content_changed()` to skip re-extraction when a result list hashes the
+    same as the last successfully processed copy. Hits, bytes saved and skipped
+    extractions are counted per platform.
+    """
+
+    def __init__(self, path=None, ttl=None, max_bytes=None):
+        self.ttl = config.PAGE_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = config.PAGE_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self.manager = ConnectionManager(path or config.PAGE_CACHE_PATH)
+        self.manager.write(self._create_tables)
+        self._total_bytes = self.manager.connection().execute(
+            "SELECT COALESCE(SUM(size), 0) FROM pages"
+        ).fetchone()[0]
+        self._stats = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create_tables(conn):
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                body BLOB,
+                content_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL DEFAULT 0,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed_at ON pages (accessed_at)")
+
+    # ------------------------------ storage ------------------------------
+    def get(self, url, params=None):
+        """Return the cached entry for `url` as a dict, or None."""
+        key = normalize_url(url, params)
+        row = self.manager.connection().execute(
+            "SELECT body, content_hash, etag, last_modified, fetched_at FROM pages WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        # Touching the entry for LRU does not need to block the caller
+        self.manager.submit(lambda conn: conn.execute(
+            "UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key)
+        ))
+        body, content_hash, etag, last_modified, fetched_at = row
+        return {
+            "body": body, "content_hash": content_hash, "etag": etag,
+            "last_modified": last_modified, "fetched_at": fetched_at,
+            "fresh": time.time() - fetched_at < self.ttl,
+        }
+
+    def put(self, url, body=None, content_hash=None, etag=None, last_modified=None, params=None):
+        """Store or replace the entry for `url`, evicting least recently used pages past the size cap."""
+        key = normalize_url(url, params)
+        size = len(body or b"")
+        now = time.time()
+
+        def write(conn):
+            old = conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                """INSERT OR REPLACE INTO pages
+                (key, body, content_hash, etag, last_modified, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (key, body, content_hash, etag, last_modified, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict(conn)
+
+        self.manager.write(write)
+
+    def _touch_fetched(self, url, params=None):
+        key = normalize_url(url, params)
+        now = time.time()
+        self.manager.write(lambda conn: conn.execute(
+            "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+        ))
+
+    def _evict(self, conn):
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM pages ORDER BY accessed_at").fetchall():
+            conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self._total_bytes -= size
+            self._record(None, "evictions")
+            if self._total_bytes <= self.max_bytes:
+                break
+
+    # ------------------------------ HTTP path ------------------------------
+    def _serve_fresh(self, entry, platform):
+        if entry and entry["fresh"] and entry["body"] is not None:
+            self._record(platform, "hits")
+            self._record(platform, "bytes_saved", len(entry["body"]))
+            return entry["body"]
+        return None
+
+    def fresh(self, url, platform=None, params=None):
+        """Return the cached body for `url` while it is within the TTL, else None.
+
+        Lets callers skip rate limiting entirely when no request is needed.
+        """
+        return self._serve_fresh(self.get(url, params), platform)
+
+    def fetch(self, url, session, platform=None, params=None, timeout=30):
+        """GET `url` through the cache and return the response body as bytes.
+
+        Fresh entries are returned without a request. Stale entries are
+        revalidated with a conditional GET; a 304 reuses the cached body.
+        """
+        entry = self.get(url, params)
+        body = self._serve_fresh(entry, platform)
+        if body is not None:
+            return body
+
+        headers = {}
+        if entry and entry["body"] is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and headers:
+            self._touch_fetched(url, params)
+            self._record(platform, "revalidated")
+            self._record(platform, "bytes_saved", len(entry["body"]))
+            return entry["body"]
+
+        response.raise_for_status()
+        body = response.content
+        self._record(platform, "misses")
+        self._record(platform, "bytes_fetched", len(body))
+        self.put(
+            url, body=body,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            params=params,
+        )
+        return body
+
+    # ------------------------------ browser path ------------------------------
+    def content_changed(self, url, content, platform=None):
+        """Return False if `content` (e.g. a rendered result list) hashes the same as the last processed copy for `url`.
+
+        The new hash is only stored by `mark_processed()`, so a page whose
+        extraction fails is tried again next cycle.
+        """
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        entry = self.get(url)
+        if entry and entry["content_hash"] == hashlib.sha256(data).hexdigest():
+            self._record(platform, "hits")
+            # The browser already downloaded the page; only the extraction is saved
+            self._record(platform, "extractions_skipped")
+            return False
+        self._record(platform, "misses")
+        return True
+
+    def mark_processed(self, url, content):
+        """Remember the hash of `content` once it has been extracted successfully."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        self.put(url, content_hash=hashlib.sha256(data).hexdigest())
+
+    # ------------------------------ reporting ------------------------------
+    def _record(self, platform, name, amount=1):
+        with self._lock:
+            self._stats[platform or "all"][name] += amount
+
+    def stats(self):
+        """Return {platform: counters} including hit_ratio, where revalidations count as hits."""
+        with self._lock:
+            report = {}
+            for platform, counters in self._stats.items():
+                counters = dict(counters)
+                hits = counters.get("hits", 0) + counters.get("revalidated", 0)
+                lookups = hits + counters.get("misses", 0)
+                counters["hit_ratio"] = hits / lookups if lookups else 0.0
+                report[platform] = counters
+            return report
+
+    def log_report(self):
+        """Log hit ratio, bytes saved and skipped extractions per platform."""
+        for platform, counters in sorted(self.stats().items()):
+            if platform == "all" and set(counters) <= {"evictions", "hit_ratio"}:
+                continue
+            logging.info(
+                f"Page cache [{platform}]: hit ratio {counters['hit_ratio']:.0%}, "
+                f"{counters.get('bytes_saved', 0) / 1024:.1f} KiB saved, "
+                f"{counters.get('bytes_fetched', 0) / 1024:.1f} KiB fetched, "
+                f"{counters.get('extractions_skipped', 0)} extractions skipped"
+            )
+
+    def close(self):
+        self.manager.close()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_page_cache():
+    """Return the process-wide PageCache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache()
+        return _cache
@@ -0,0 +1,260 @@
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config import config
+
+THROTTLE_STATUSES = {429, 503}
+
+class CircuitOpenError(Exception):
+    """Raised when a platform's circuit breaker is open and calls are being short-circuited."""
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self.platform = None  # Set by AdaptiveRateLimiter so reloads can retune the bucket
+        self.configured_rate = rate
+        self.max_rate = None  # Per-platform cap set by AdaptiveRateLimiter
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait before using it."""
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self):
+        """Block until a token is available. Returns the time spent waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """Hold all acquisitions for `seconds`, e.g. to honour a Retry-After header."""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+class AdaptiveRateLimiter:
+    """Per-domain token buckets whose rate adapts to observed latency and throttling.
+
+    Rates grow additively while responses are fast and successful, and are cut
+    multiplicatively on errors, 429/503 responses or slow pages (AIMD), staying
+    within [min_rate, max_rate] requests per second. Hosts of a configured
+    platform start at its `rate_limit_per_minute` and are capped at its
+    `rate_limit_max_per_minute` instead.
+    """
+
+    def __init__(self, rate=None, min_rate=None, max_rate=None, target_latency=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self._explicit = {"rate": rate, "min_rate": min_rate, "max_rate": max_rate, "target_latency": target_latency}
+        self.clock = clock
+        self.sleep = sleep
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self._apply_settings()
+
+    def _apply_settings(self):
+        explicit = self._explicit
+        self.initial_rate = (explicit["rate"] or config.RATE_LIMIT_PER_MINUTE) / 60
+        self.min_rate = (explicit["min_rate"] or config.RATE_LIMIT_MIN_PER_MINUTE) / 60
+        self.max_rate = (explicit["max_rate"] or config.RATE_LIMIT_MAX_PER_MINUTE) / 60
+        self.target_latency = explicit["target_latency"] or config.RATE_LIMIT_TARGET_LATENCY
+        self.step = self.initial_rate / 10
+
+    def _configured(self, platform):
+        """(rate, max rate, burst capacity) for buckets of `platform`, rates per second."""
+        if platform is None or self._explicit["rate"]:
+            return self.initial_rate, self.max_rate, 1
+        settings = config.platform(platform)
+        max_rate = settings.rate_limit_max_per_minute / 60
+        return min(settings.rate_limit_per_minute / 60, max_rate), max_rate, settings.concurrency
+
+    def retune(self):
+        """Re-read rate settings after a config reload, keeping each domain's learned state where still valid."""
+        with self.lock:
+            self._apply_settings()
+            buckets = list(self.buckets.values())
+        for bucket in buckets:
+            rate, max_rate, capacity = self._configured(bucket.platform)
+            with bucket.lock:
+                if rate != bucket.configured_rate:
+                    bucket.rate = bucket.configured_rate = rate
+                bucket.capacity = capacity
+                bucket.max_rate = max_rate
+                bucket.rate = min(max_rate, max(self.min_rate, bucket.rate))
+
+    @staticmethod
+    def domain(url):
+        """Return the host of `url`, or `url` itself when it is already a bare domain or platform name."""
+        return (urlsplit(url).hostname or url).lower().removeprefix("www.")
+
+    def bucket(self, url, platform=None):
+        key = self.domain(url)
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                rate, max_rate, capacity = self._configured(platform)
+                bucket = self.buckets[key] = TokenBucket(rate, capacity, clock=self.clock, sleep=self.sleep)
+                bucket.platform = platform
+                bucket.max_rate = max_rate
+            return bucket
+
+    def acquire(self, url, platform=None):
+        """Wait for the domain's next request slot. New domains start at `platform`'s configured rate."""
+        return self.bucket(url, platform).acquire()
+
+    def rate(self, url):
+        """Current requests per minute allowed for the domain."""
+        return self.bucket(url).rate * 60
+
+    def record(self, url, latency=None, throttled=False, error=False, retry_after=None):
+        """Feed back the outcome of a request so the domain's rate can adapt."""
+        bucket = self.bucket(url)
+        with bucket.lock:
+            if throttled or error:
+                bucket.rate = max(self.min_rate, bucket.rate / 2)
+            elif latency is not None and latency > 2 * self.target_latency:
+                bucket.rate = max(self.min_rate, bucket.rate * 0.8)
+            elif latency is None or latency <= self.target_latency:
+                bucket.rate = min(bucket.max_rate or self.max_rate, bucket.rate + self.step)
+        if retry_after:
+            bucket.pause(retry_after)
+
+class CircuitBreaker:
+    """Stops calling a platform after repeated failures, then lets a trial call through after a cool-down."""
+
+    def __init__(self, failure_threshold=None, reset_timeout=None, clock=time.monotonic):
+        self.failure_threshold = failure_threshold or config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or config.CIRCUIT_RESET_SECONDS
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """Return True if a call may be attempted now."""
+        return self.state != "open"
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                # A failed trial call in half-open state re-opens the circuit
+                self.opened_at = self.clock()
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts=None, base_delay=None, max_delay=None):
+        self.max_attempts = max_attempts or config.MAX_RETRIES
+        self.base_delay = config.BACKOFF_BASE_SECONDS if base_delay is None else base_delay
+        self.max_delay = config.BACKOFF_MAX_SECONDS if max_delay is None else max_delay
+
+    def delay(self, attempt):
+        """Seconds to wait before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+def _throttle_info(exc):
+    """Return (throttled, retry_after) for an exception raised by an HTTP client."""
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status not in THROTTLE_STATUSES:
+        return False, None
+    retry_after = (getattr(response, "headers", None) or {}).get("Retry-After")
+    try:
+        return True, float(retry_after) if retry_after else None
+    except ValueError:
+        return True, None  # HTTP-date form; fall back to backoff
+
+class TrafficController:
+    """Rate limiting, retries and circuit breaking shared by every fetch path."""
+
+    def __init__(self, limiter=None, policy=None, breaker_factory=CircuitBreaker, sleep=time.sleep, clock=time.monotonic):
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.policy = policy or RetryPolicy()
+        self.breaker_factory = breaker_factory
+        self.breakers = {}
+        self.sleep = sleep
+        self.clock = clock
+        self.lock = threading.Lock()
+
+    def breaker(self, platform):
+        with self.lock:
+            breaker = self.breakers.get(platform)
+            if breaker is None:
+                breaker = self.breakers[platform] = self.breaker_factory()
+            return breaker
+
+    def run(self, platform, url, fn):
+        """Call `fn()` for a request to `url`, pacing, retrying and tripping the platform breaker as needed.
+
+        Raises CircuitOpenError when the platform is cooling down, or the last
+        error once all attempts are used.
+        """
+        breaker = self.breaker(platform)
+        for attempt in range(1, self.policy.max_attempts + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"{platform} circuit is open; skipping {url}")
+            self.limiter.acquire(url, platform)
+            start = self.clock()
+            try:
+                result = fn()
+            except Exception as ex:
+                throttled, retry_after = _throttle_info(ex)
+                self.limiter.record(url, throttled=throttled, error=not throttled, retry_after=retry_after)
+                breaker.record_failure()
+                if attempt == self.policy.max_attempts:
+                    raise
+                delay = self.policy.delay(attempt)
+                logging.warning(
+                    f"{platform} request failed (attempt {attempt}/{self.policy.max_attempts}): {ex}. "
+                    f"Retrying in {delay:.1f}s."
+                )
+                self.sleep(delay)
+                continue
+            self.limiter.record(url, latency=self.clock() - start)
+            breaker.record_success()
+            return result
+
+_controller = None
+_controller_lock = threading.Lock()
+
+def get_traffic_controller():
+    """Return the process-wide TrafficController, creating it on first use."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = TrafficController()
+            config.on_reload(lambda _: _controller.limiter.retune())
+        return _controller
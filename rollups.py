@@ -0,0 +1,93 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import storage
+from config import config
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after `ttl` seconds, holding at most `max_entries`."""
+
+    def __init__(self, ttl, clock=time.monotonic, max_entries=256):
+        self.ttl = ttl
+        self.clock = clock
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for `key`, calling `compute()` when it is missing or expired."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl:
+                return entry[1]
+        value = compute()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: e for k, e in self._entries.items() if now - e[0] < self.ttl}
+                while len(self._entries) >= self.max_entries:
+                    del self._entries[next(iter(self._entries))]  # Oldest insertion first
+            self._entries[key] = (now, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_cache = TTLCache(config.STATS_CACHE_TTL)
+
+# Request parameters are clamped so the cache holds a bounded number of keys
+MAX_HOURS = 24 * 30
+MAX_KEYWORDS = 100
+
+def _query(sql, params, db_file):
+    conn = storage.get_manager(db_file).connection()
+    cursor = conn.execute(sql, params)
+    columns = [c[0] for c in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def leads_per_hour(hours=24, platform=None, db_file=None):
+    """Leads per platform per hour for the last `hours` hours, oldest bucket first."""
+    hours = min(max(int(hours), 1), MAX_HOURS)
+    def compute():
+        since = (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime("%Y-%m-%d %H:00:00")
+        sql = "SELECT bucket, platform, leads, drafts FROM lead_stats_hourly WHERE bucket >= ?"
+        params = [since]
+        if platform:
+            sql += " AND platform = ?"
+            params.append(platform)
+        return _query(sql + " ORDER BY bucket, platform", params, db_file)
+
+    return _cache.get_or_compute(("hourly", hours, platform, db_file), compute)
+
+def keyword_yield(limit=20, db_file=None):
+    """Keywords ranked by the number of leads they produced across platforms (Upwork has no keywords)."""
+    limit = min(max(int(limit), 1), MAX_KEYWORDS)
+    def compute():
+        return _query(
+            """SELECT keyword, SUM(leads) AS leads, SUM(drafts) AS drafts
+            FROM keyword_stats GROUP BY keyword HAVING SUM(leads) > 0
+            ORDER BY leads DESC, keyword LIMIT ?""",
+            (limit,), db_file
+        )
+
+    return _cache.get_or_compute(("keywords", limit, db_file), compute)
+
+def draft_conversion(db_file=None):
+    """Share of leads per platform that had a draft reply generated."""
+    def compute():
+        rows = _query(
+            """SELECT platform, SUM(leads) AS leads, SUM(drafts) AS drafts
+            FROM lead_stats_hourly GROUP BY platform ORDER BY platform""",
+            (), db_file
+        )
+        for row in rows:
+            row["conversion"] = row["drafts"] / row["leads"] if row["leads"] else 0.0
+        return rows
+
+    return _cache.get_or_compute(("conversion", db_file), compute)
+
+def clear_cache():
+    """Drop cached stats, e.g. after a bulk import or rebuild."""
+    _cache.clear()
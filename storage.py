@@ -0,0 +1,431 @@
+import logging
+import os
+import sqlite3
+import threading
+from collections import Counter
+
+from connection import ConnectionManager
+
+# Single SQLite file holding leads, posts and comments
+DB_FILE = os.getenv("LEADS_DB", "leads.db")
+LEGACY_DB_FILE = "scraper_data.db"
+
+LEAD_COLUMNS = ("id", "platform", "post_id", "title", "content", "link", "draft_generated", "timestamp")
+LEAD_DETAIL_COLUMNS = ("author", "posted", "budget", "contact")
+
+# ============================== MIGRATIONS ==============================
+# Each migration runs once, in order, inside a single transaction. The applied
+# version is stored in PRAGMA user_version. Append new migrations; never edit
+# ones that have shipped.
+
+def _create_base_tables(conn):
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            platform TEXT,
+            post_id TEXT UNIQUE,
+            title TEXT,
+            content TEXT,
+            link TEXT,
+            draft_generated INTEGER DEFAULT 0,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            platform TEXT NOT NULL,
+            post_id TEXT UNIQUE NOT NULL,
+            author TEXT,
+            content TEXT,
+            url TEXT,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+        )"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            platform TEXT NOT NULL,
+            post_id TEXT NOT NULL,
+            comment_id TEXT UNIQUE NOT NULL,
+            author TEXT,
+            content TEXT,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (post_id) REFERENCES posts (post_id) ON DELETE CASCADE
+        )"""
+    )
+
+def _add_draft_generated(conn):
+    # leads.db files created by manual_scraper.py lack this column
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(leads)")}
+    if "draft_generated" not in columns:
+        conn.execute("ALTER TABLE leads ADD COLUMN draft_generated INTEGER DEFAULT 0")
+
+def _create_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_timestamp ON leads (timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_platform_timestamp ON leads (platform, timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_platform ON posts (platform)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_comments_post_id ON comments (post_id)")
+
+def _create_leads_fts(conn):
+    try:
+        conn.execute(
+            """CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts
+            USING fts5(title, content, content='leads', content_rowid='id')"""
+        )
+    except sqlite3.OperationalError as exc:
+        logging.warning(f"Full-text search unavailable, skipping leads_fts: {exc}")
+        return
+    conn.execute(
+        """CREATE TRIGGER IF NOT EXISTS leads_fts_insert AFTER INSERT ON leads BEGIN
+            INSERT INTO leads_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END"""
+    )
+    conn.execute(
+        """CREATE TRIGGER IF NOT EXISTS leads_fts_delete AFTER DELETE ON leads BEGIN
+            INSERT INTO leads_fts (leads_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END"""
+    )
+    conn.execute(
+        """CREATE TRIGGER IF NOT EXISTS leads_fts_update AFTER UPDATE OF title, content ON leads BEGIN
+            INSERT INTO leads_fts (leads_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO leads_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END"""
+    )
+    conn.execute("INSERT INTO leads_fts (leads_fts) VALUES ('rebuild')")
+
+def _create_thread_state(conn):
+    # Last seen comment count per thread, so unchanged threads are not re-fetched
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS thread_state (
+            post_id TEXT PRIMARY KEY,
+            platform TEXT NOT NULL,
+            comment_count INTEGER NOT NULL DEFAULT 0,
+            last_visited DATETIME DEFAULT CURRENT_TIMESTAMP
+        )"""
+    )
+
+def _create_lead_rollups(conn):
+    # Incremental aggregates for the dashboard stats endpoints, maintained by
+    # triggers in the same transaction as the lead writes
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS lead_stats_hourly (
+            bucket TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            leads INTEGER NOT NULL DEFAULT 0,
+            drafts INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (bucket, platform)
+        )"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS keyword_stats (
+            keyword TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            leads INTEGER NOT NULL DEFAULT 0,
+            drafts INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (keyword, platform)
+        )"""
+    )
+    bucket = "strftime('%Y-%m-%d %H:00:00', {row}.timestamp)"
+    for table, key in (("lead_stats_hourly", "bucket"), ("keyword_stats", "keyword")):
+        new_key = bucket.format(row="new") if key == "bucket" else "COALESCE(new.title, '')"
+        old_key = bucket.format(row="old") if key == "bucket" else "COALESCE(old.title, '')"
+        # Upwork leads store the job title, not a search keyword, in leads.title;
+        # counting them would add one keyword_stats row per job
+        counted = "COALESCE({row}.platform, '') != 'Upwork'" if key == "keyword" else "1"
+        conn.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON leads
+            WHEN {counted.format(row="new")} BEGIN
+                INSERT INTO {table} ({key}, platform, leads, drafts)
+                VALUES ({new_key}, COALESCE(new.platform, ''), 1, COALESCE(new.draft_generated, 0))
+                ON CONFLICT ({key}, platform) DO UPDATE SET
+                    leads = leads + 1, drafts = drafts + excluded.drafts;
+            END"""
+        )
+        conn.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_draft AFTER UPDATE OF draft_generated ON leads
+            WHEN {counted.format(row="new")} AND COALESCE(new.draft_generated, 0) != COALESCE(old.draft_generated, 0) BEGIN
+                UPDATE {table} SET drafts = drafts + COALESCE(new.draft_generated, 0) - COALESCE(old.draft_generated, 0)
+                WHERE {key} = {new_key} AND platform = COALESCE(new.platform, '');
+            END"""
+        )
+        conn.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON leads
+            WHEN {counted.format(row="old")} BEGIN
+                UPDATE {table} SET leads = leads - 1, drafts = drafts - COALESCE(old.draft_generated, 0)
+                WHERE {key} = {old_key} AND platform = COALESCE(old.platform, '');
+            END"""
+        )
+    rebuild_lead_rollups(conn)
+
+def rebuild_lead_rollups(conn):
+    """Recompute the lead rollup tables from the leads table."""
+    conn.execute("DELETE FROM lead_stats_hourly")
+    conn.execute("DELETE FROM keyword_stats")
+    conn.execute(
+        """INSERT INTO lead_stats_hourly (bucket, platform, leads, drafts)
+        SELECT strftime('%Y-%m-%d %H:00:00', timestamp), COALESCE(platform, ''), COUNT(*),
+               SUM(COALESCE(draft_generated, 0))
+        FROM leads GROUP BY 1, 2"""
+    )
+    conn.execute(
+        """INSERT INTO keyword_stats (keyword, platform, leads, drafts)
+        SELECT COALESCE(title, ''), COALESCE(platform, ''), COUNT(*), SUM(COALESCE(draft_generated, 0))
+        FROM leads WHERE COALESCE(platform, '') != 'Upwork' GROUP BY 1, 2"""
+    )
+
+def _add_lead_details(conn):
+    # Fields extracted by normalize.py; NULL for leads saved before it existed
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(leads)")}
+    for column in LEAD_DETAIL_COLUMNS:
+        if column not in columns:
+            conn.execute(f"ALTER TABLE leads ADD COLUMN {column} TEXT")
+
+def _create_cycle_journal(conn):
+    # Crash recovery: which (platform, query) units the current cycle finished,
+    # and which new leads still owe an alert or a draft reply
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS cycles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at REAL NOT NULL,
+            finished_at REAL
+        )"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS cycle_units (
+            cycle_id INTEGER NOT NULL,
+            platform TEXT NOT NULL,
+            query TEXT NOT NULL,
+            completed_at REAL NOT NULL,
+            PRIMARY KEY (cycle_id, platform, query)
+        )"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS pending_leads (
+            post_id TEXT PRIMARY KEY,
+            platform TEXT NOT NULL,
+            title TEXT,
+            content TEXT,
+            link TEXT,
+            alert INTEGER NOT NULL DEFAULT 0,
+            draft INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL
+        )"""
+    )
+
+def _canonicalize_post_ids(conn):
+    # Leads saved before normalize.py keyed Reddit posts by title slug and
+    # Twitter posts by author handle; rekey them by the canonical ID the
+    # scrapers now use so old posts are not saved and alerted again. Links of
+    # no known post shape keep their ID. Where two old rows map to one post,
+    # the earliest is kept.
+    from normalize import parse_post_link
+
+    keep, rekey = {}, {}
+    for lead_id, platform, post_id, link in conn.execute(
+        "SELECT id, platform, post_id, link FROM leads ORDER BY id"
+    ).fetchall():
+        parts = parse_post_link(platform or "", link)
+        canonical = parts["id"] if parts else post_id
+        if canonical in keep:
+            conn.execute("DELETE FROM leads WHERE id = ?", (lead_id,))
+            conn.execute("DELETE FROM pending_leads WHERE post_id = ?", (post_id,))
+            continue
+        keep[canonical] = lead_id
+        if canonical != post_id:
+            rekey[lead_id] = (post_id, canonical)
+    # Park changed rows on a placeholder first so swapped IDs never collide mid-update
+    for table in ("leads", "pending_leads"):
+        conn.executemany(f"UPDATE {table} SET post_id = ? WHERE post_id = ?",
+                         [(f"\0rekey:{lead_id}", old) for lead_id, (old, _) in rekey.items()])
+        conn.executemany(f"UPDATE {table} SET post_id = ? WHERE post_id = ?",
+                         [(canonical, f"\0rekey:{lead_id}") for lead_id, (_, canonical) in rekey.items()])
+
+MIGRATIONS = [
+    (1, "Create leads, posts and comments tables", _create_base_tables),
+    (2, "Add leads.draft_generated", _add_draft_generated),
+    (3, "Add lookup indexes", _create_indexes),
+    (4, "Add leads full-text index", _create_leads_fts),
+    (5, "Add comment thread change cache", _create_thread_state),
+    (6, "Add lead rollup tables", _create_lead_rollups),
+    (7, "Add extracted author, posted time, budget and contact to leads", _add_lead_details),
+    (8, "Add cycle journal and pending lead deliveries", _create_cycle_journal),
+    (9, "Rekey leads by canonical post ID", _canonicalize_post_ids),
+]
+
+def schema_version(conn):
+    """Return the schema version recorded in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn, target=None):
+    """Apply pending migrations up to `target` (default: latest). Returns the resulting version."""
+    target = MIGRATIONS[-1][0] if target is None else target
+    version = schema_version(conn)
+    for number, description, apply in MIGRATIONS:
+        if number <= version or number > target:
+            continue
+        # DDL does not open an implicit transaction, so start one explicitly
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        try:
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logging.info(f"Applied migration {number}: {description}")
+        version = number
+    return version
+
+# ============================== CONNECTIONS ==============================
+_managers = {}
+_references = Counter()  # Open retain_manager() references per path
+_managers_lock = threading.Lock()
+
+def get_manager(db_file=None):
+    """Return the shared ConnectionManager for `db_file`, migrating the schema on first use."""
+    path = os.path.abspath(db_file or DB_FILE)
+    with _managers_lock:
+        manager = _managers.get(path)
+        if manager is None:
+            manager = _managers[path] = ConnectionManager(path)
+            manager.write(migrate)
+    return manager
+
+def retain_manager(db_file=None):
+    """Return the shared ConnectionManager for `db_file` and count a reference to it.
+
+    Pair each call with `release_manager()`; the last release closes the manager.
+    """
+    manager = get_manager(db_file)
+    with _managers_lock:
+        _references[os.path.abspath(db_file or DB_FILE)] += 1
+    return manager
+
+def release_manager(db_file=None):
+    """Drop a reference taken by `retain_manager()`, closing the manager once none remain."""
+    path = os.path.abspath(db_file or DB_FILE)
+    with _managers_lock:
+        _references[path] -= 1
+        if _references[path] > 0:
+            return
+        del _references[path]
+    close_manager(db_file)
+
+def close_manager(db_file=None):
+    """Close and forget the shared ConnectionManager for `db_file`, if one is open."""
+    path = os.path.abspath(db_file or DB_FILE)
+    with _managers_lock:
+        manager = _managers.pop(path, None)
+        _references.pop(path, None)
+    if manager is not None:
+        manager.close()
+
+def close_all():
+    """Close every shared connection manager."""
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+        _references.clear()
+    for manager in managers:
+        manager.close()
+
+# ============================== LEADS ==============================
+def init_db(db_file=None):
+    """Initialize the SQLite database for storing freelance leads."""
+    get_manager(db_file)
+    logging.info("Database initialized.")
+
+def insert_lead(conn, platform, post_id, title, content, link, **details):
+    """Insert a lead row on `conn`; raises sqlite3.IntegrityError if post_id exists.
+
+    `details` may carry the normalized author, posted, budget and contact fields.
+    """
+    unknown = set(details) - set(LEAD_DETAIL_COLUMNS)
+    if unknown:
+        raise TypeError(f"Unknown lead detail(s): {', '.join(sorted(unknown))}")
+    columns = ("platform", "post_id", "title", "content", "link") + tuple(details)
+    conn.execute(
+        f"INSERT INTO leads ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+        (platform, post_id, title, content, link, *details.values())
+    )
+
+def save_lead(platform, post_id, title, content, link, db_file=None, **details):
+    """Save a new lead to the database if it doesn't already exist."""
+    try:
+        get_manager(db_file).write(insert_lead, platform, post_id, title, content, link, **details)
+        logging.info(f"New lead saved: {platform} | {post_id}")
+        return True  # New lead added
+    except sqlite3.IntegrityError:
+        logging.info(f"Duplicate lead found, skipping: {platform} | {post_id}")
+        return False  # Lead already exists
+
+def mark_draft_generated(post_id, db_file=None):
+    """Mark a lead as having a draft reply generated."""
+    get_manager(db_file).write(
+        lambda conn: conn.execute("UPDATE leads SET draft_generated=1 WHERE post_id=?", (post_id,))
+    )
+    logging.info(f"Draft marked for lead: {post_id}")
+
+def get_leads(limit=None, db_file=None):
+    """Return leads newest first as tuples ordered like LEAD_COLUMNS."""
+    query = f"SELECT {', '.join(LEAD_COLUMNS)} FROM leads ORDER BY timestamp DESC"
+    params = ()
+    if limit:
+        query += " LIMIT ?"
+        params = (limit,)
+    return get_manager(db_file).connection().execute(query, params).fetchall()
+
+def search_leads(text, limit=50, db_file=None):
+    """Full-text search over lead titles and content, best matches first."""
+    conn = get_manager(db_file).connection()
+    columns = ", ".join(f"leads.{c}" for c in LEAD_COLUMNS)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'leads_fts'").fetchone() is None:
+        # SQLite built without FTS5: fall back to a (slower) substring scan
+        pattern = f"%{text}%"
+        return conn.execute(
+            f"""SELECT {columns} FROM leads WHERE title LIKE ? OR content LIKE ?
+            ORDER BY timestamp DESC LIMIT ?""",
+            (pattern, pattern, limit)
+        ).fetchall()
+    return conn.execute(
+        f"""SELECT {columns} FROM leads_fts JOIN leads ON leads.id = leads_fts.rowid
+        WHERE leads_fts MATCH ? ORDER BY rank LIMIT ?""",
+        (text, limit)
+    ).fetchall()
+
+def import_legacy(legacy_file=LEGACY_DB_FILE, db_file=None):
+    """Copy posts and comments from a legacy scraper_data.db into the unified store.
+
+    Returns (posts_copied, comments_copied).
+    """
+    def copy(conn):
+        # ATTACH cannot run inside a transaction
+        conn.commit()
+        conn.execute("ATTACH DATABASE ? AS legacy", (legacy_file,))
+        try:
+            conn.execute("BEGIN")
+            before = conn.total_changes
+            conn.execute(
+                """INSERT OR IGNORE INTO posts (platform, post_id, author, content, url, timestamp)
+                SELECT platform, post_id, author, content, url, timestamp FROM legacy.posts"""
+            )
+            posts = conn.total_changes - before
+            conn.execute(
+                """INSERT OR IGNORE INTO comments (platform, post_id, comment_id, author, content, timestamp)
+                SELECT platform, post_id, comment_id, author, content, timestamp FROM legacy.comments
+                WHERE post_id IN (SELECT post_id FROM posts)"""
+            )
+            comments = conn.total_changes - before - posts
+            conn.commit()
+        finally:
+            conn.execute("DETACH DATABASE legacy")
+        return posts, comments
+
+    return get_manager(db_file).write(copy)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    init_db()
+    print(f"{DB_FILE} is at schema version {schema_version(get_manager().connection())}")
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import storage
+from checkpoint import ALL_QUERIES, CycleJournal
+from config import config
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class TestCycleJournal(unittest.TestCase):
+    """Unit tests for resumable cycles and durable alert/draft deliveries."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp.name, "leads.db")
+        self.clock = Clock()
+
+    def tearDown(self):
+        storage.close_all()
+        self.tmp.cleanup()
+
+    def journal(self):
+        # A fresh instance stands in for the restarted process
+        return CycleJournal(self.db_file, clock=self.clock)
+
+    def test_restart_resumes_unfinished_units(self):
+        """Units finished before a crash are skipped; the rest still run."""
+        journal = self.journal()
+        cycle = journal.begin_cycle()
+        journal.complete("twitter", ALL_QUERIES)
+        journal.complete("reddit", "need a bot")
+        # Crash: finish_cycle() never runs
+
+        self.clock.now += 60
+        restarted = self.journal()
+        self.assertEqual(restarted.begin_cycle(), cycle)
+        self.assertTrue(restarted.resumed)
+        self.assertTrue(restarted.is_done("Twitter"))
+        self.assertFalse(restarted.is_done("LinkedIn"))
+        self.assertEqual(restarted.remaining("Reddit", ["need a bot", "hiring python"]), ["hiring python"])
+
+        restarted.finish_cycle()
+        self.assertNotEqual(restarted.begin_cycle(), cycle, "A finished cycle was resumed.")
+        self.assertEqual(restarted.remaining("reddit", ["need a bot"]), ["need a bot"])
+
+    def test_stale_cycle_starts_over(self):
+        journal = self.journal()
+        cycle = journal.begin_cycle()
+        journal.complete("twitter")
+        self.clock.now += config.CHECKPOINT_MAX_AGE_MINUTES * 60 + 1
+        restarted = self.journal()
+        self.assertNotEqual(restarted.begin_cycle(), cycle)
+        self.assertFalse(restarted.is_done("twitter"))
+
+    def test_deliveries_survive_a_crash(self):
+        """A lead's owed alert and draft are saved with it and replayed after a restart until resolved."""
+        journal = self.journal()
+        pending = journal.save_lead("Reddit", "abc12", "need a bot", "content", "https://www.reddit.com/comments/abc12",
+                                    draft=True, author="someone")
+        self.assertEqual((pending["alert"], pending["draft"]), (1, 1))
+        self.assertIsNone(journal.save_lead("Reddit", "abc12", "dup", "dup", "l"), "Duplicate lead owed deliveries.")
+        journal.resolve("abc12", "draft").result()
+        # Crash before the alert went out
+
+        replayed = []
+        report = self.journal().recover(replayed.append)
+        self.assertEqual([(p["post_id"], p["alert"], p["draft"]) for p in replayed], [("abc12", 1, 0)])
+        self.assertEqual((report["alerts"], report["drafts"]), (1, 0))
+        self.assertGreaterEqual(report["seconds"], 0)
+
+        journal.resolve("abc12", "alert").result()
+        self.assertEqual(self.journal().pending(), [], "Resolved deliveries were replayed.")
+        row = storage.get_manager(self.db_file).connection().execute(
+            "SELECT author FROM leads WHERE post_id = 'abc12'"
+        ).fetchone()
+        self.assertEqual(row, ("someone",))
+
+    def test_failed_replay_stays_pending(self):
+        journal = self.journal()
+        journal.save_lead("Reddit", "x1", "t", "c", "l")
+        with self.assertLogs(level="ERROR"):
+            report = journal.recover(mock.Mock(side_effect=RuntimeError("sink down")))
+        self.assertEqual(report["alerts"], 0)
+        self.assertEqual(len(journal.pending()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from basicbot import cli
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY_MODULES = ("discord", "selenium", "webdriver_manager", "bs4", "flask", "asyncio")
+
+class TestCli(unittest.TestCase):
+    """Unit tests for the basicbot command line entry point."""
+
+    def test_subcommands(self):
+        """The parser exposes scrape, dashboard, bench and migrate."""
+        parser = cli.build_parser()
+        for argv in (["scrape"], ["dashboard", "--port", "8000"], ["bench", "startup"], ["migrate"]):
+            self.assertIs(parser.parse_args(argv).func, getattr(cli, f"cmd_{argv[0]}"))
+
+    def test_migrate(self):
+        """migrate brings a new database to the latest schema version."""
+        import storage
+        with tempfile.TemporaryDirectory() as tmp:
+            db_file = os.path.join(tmp, "leads.db")
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(cli.main(["migrate", "--db", db_file]), 0)
+            self.assertIn(f"schema version {storage.MIGRATIONS[-1][0]}", out.getvalue())
+
+    def test_normalize_benchmark(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(cli.main(["bench", "normalize", "--posts", "20"]), 0)
+        self.assertIn("normalize Upwork", out.getvalue())
+
+    def test_unknown_benchmark(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(cli.main(["bench", "nope"]), 2)
+
+    def test_imports_stay_light(self):
+        """Importing the CLI and scraper modules does not load heavy dependencies or need Discord settings."""
+        env = dict(os.environ)
+        env.pop("DISCORD_CHANNEL_ID", None)
+        code = (
+            "import sys, basicbot.cli, auto_scraper, manual_scraper; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "", "❌ Heavy modules were imported at module load.")
+
+    def test_missing_channel_id_fails_clearly(self):
+        """DISCORD_CHANNEL_ID is validated when the scraper starts, not at import."""
+        import auto_scraper
+        from config import config
+        with mock.patch.object(config, "DISCORD_CHANNEL_ID", ""):
+            with self.assertRaises(ValueError):
+                auto_scraper.discord_channel_id()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
-import unittest
+import json
 import os
-from basicbot.config import config
+import tempfile
+import unittest
+from unittest import mock
+from basicbot.config import Config, ConfigError, config
+from rate_limiter import AdaptiveRateLimiter
 
 class TestConfig(unittest.TestCase):
     """Unit tests for config.py settings and environment variable handling."""
@@ -41,5 +45,90 @@ class TestConfig(unittest.TestCase):
         """Check that Chrome profile path exists (or is set correctly)."""
         self.assertIsInstance(config.CHROME_PROFILE_PATH, str, "❌ CHROME_PROFILE_PATH should be a string.")
 
+class TestTypedSettings(unittest.TestCase):
+    """Unit tests for validation, per-platform settings and hot reload."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings_file = os.path.join(self.tmp.name, "settings.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_settings(self, data, mtime):
+        with open(self.settings_file, "w") as fh:
+            json.dump(data, fh)
+        os.utime(self.settings_file, (mtime, mtime))
+
+    def test_invalid_values_are_rejected(self):
+        """Bad values fail at load with every problem listed."""
+        with self.assertRaises(ConfigError) as ctx:
+            Config(self.settings_file, environ={"SCRAPE_INTERVAL": "0", "DISCORD_CHANNEL_ID": "general",
+                                                "HEADLESS_MODE": "maybe"})
+        message = str(ctx.exception)
+        for name in ("SCRAPE_INTERVAL", "DISCORD_CHANNEL_ID", "HEADLESS_MODE"):
+            self.assertIn(name, message)
+
+    def test_platform_settings(self):
+        """Platform knobs come from the environment and the settings file, which wins."""
+        self.write_settings({"platforms": {"reddit": {"rate_limit_per_minute": 30, "queries": ["need a bot"]}}}, 1000)
+        settings = Config(self.settings_file, environ={
+            "REDDIT_FETCH_BACKEND": "http", "REDDIT_RATE_LIMIT_PER_MINUTE": "20", "REDDIT_USERNAME": "me",
+            "TWITTER_ENABLED": "false",
+        })
+        reddit = settings.platform("Reddit")
+        self.assertEqual((reddit.rate_limit_per_minute, reddit.queries, reddit.fetch_backend), (30.0, ("need a bot",), "http"))
+        self.assertEqual(settings.SOCIAL_MEDIA_CREDENTIALS["reddit"]["email"], "me")
+        self.assertFalse(settings.platform("twitter").enabled)
+        self.assertEqual(settings.platform("upwork").rate_limit_per_minute, settings.RATE_LIMIT_PER_MINUTE)
+
+    def test_http_backend_only_where_supported(self):
+        with self.assertRaises(ConfigError):
+            Config(self.settings_file, environ={"TWITTER_FETCH_BACKEND": "http"})
+
+    def test_hot_reload_on_mtime(self):
+        """A changed file is applied and listeners run; an invalid one keeps the previous values."""
+        self.write_settings({"SCRAPE_INTERVAL": 30}, 1000)
+        settings = Config(self.settings_file, environ={})
+        reloads = []
+        settings.on_reload(reloads.append)
+        self.assertFalse(settings.reload_if_changed(), "Unchanged file was reloaded.")
+
+        self.write_settings({"SCRAPE_INTERVAL": 5}, 2000)
+        self.assertTrue(settings.reload_if_changed())
+        self.assertEqual(settings.SCRAPE_INTERVAL, 5)
+        self.assertEqual(len(reloads), 1)
+
+        self.write_settings({"SCRAPE_INTERVAL": -1}, 3000)
+        with self.assertLogs(level="ERROR"):
+            self.assertFalse(settings.reload_if_changed())
+        self.assertEqual(settings.SCRAPE_INTERVAL, 5, "Invalid reload replaced the settings.")
+
+    def test_rate_limiter_retunes_on_reload(self):
+        """Per-platform rate limits apply to new buckets and to existing ones after retune()."""
+        limiter = AdaptiveRateLimiter(min_rate=1, max_rate=120)
+        platforms = dict(config._platforms)
+        with mock.patch.object(config, "_platforms", platforms):
+            platforms["reddit"] = config.platform("reddit")._replace(rate_limit_per_minute=30, concurrency=3)
+            bucket = limiter.bucket("https://www.reddit.com/search", "Reddit")
+            self.assertAlmostEqual(bucket.rate * 60, 30)
+            self.assertEqual(bucket.capacity, 3)
+            platforms["reddit"] = platforms["reddit"]._replace(rate_limit_per_minute=6)
+            limiter.retune()
+            self.assertAlmostEqual(limiter.rate("https://www.reddit.com/search"), 6)
+
+            platforms["reddit"] = platforms["reddit"]._replace(rate_limit_max_per_minute=8)
+            limiter.retune()
+            for _ in range(50):
+                limiter.record("https://www.reddit.com/search", latency=0.1)
+            self.assertAlmostEqual(limiter.rate("https://www.reddit.com/search"), 8,
+                                   msg="Fast responses pushed the rate past the platform cap.")
+
+    def test_platform_rate_above_cap_is_rejected(self):
+        self.write_settings({"platforms": {"reddit": {"rate_limit_per_minute": 30, "rate_limit_max_per_minute": 10}}}, 1000)
+        with self.assertRaises(ConfigError) as ctx:
+            Config(self.settings_file, environ={})
+        self.assertIn("REDDIT_RATE_LIMIT_PER_MINUTE must not exceed", str(ctx.exception))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from connection import ConnectionManager
+
+class TestConnectionManager(unittest.TestCase):
+    """Unit tests for per-thread connections and the single-writer queue."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manager = ConnectionManager(os.path.join(self.tmp.name, "test.db"))
+        self.manager.write(lambda conn: conn.execute("CREATE TABLE items (n INTEGER)"))
+
+    def tearDown(self):
+        self.manager.close()
+        self.tmp.cleanup()
+
+    def test_pragmas_applied(self):
+        """Connections use WAL, enforce foreign keys and wait on locks."""
+        conn = self.manager.connection()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal", "WAL mode is not enabled.")
+        self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1, "Foreign keys are not enforced.")
+        self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000, "busy_timeout was not set.")
+
+    def test_connection_per_thread(self):
+        """Each thread gets its own connection; the same thread reuses it."""
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(self.manager.connection()))
+        thread.start()
+        thread.join()
+        self.assertIs(self.manager.connection(), self.manager.connection(), "Connection was not reused.")
+        self.assertIsNot(seen[0], self.manager.connection(), "Threads shared a connection.")
+
+    def test_thread_connection_closed_on_exit(self):
+        """Connections opened by short-lived threads are closed when those threads finish."""
+        def reader():
+            self.manager.connection().execute("SELECT COUNT(*) FROM items").fetchone()
+
+        for _ in range(50):
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join()
+        # The writer thread and this test's thread may hold one each
+        self.assertLessEqual(len(self.manager._connections), 2, "Connections of finished threads leaked.")
+
+    def test_concurrent_writes_serialized(self):
+        """Writes from many threads all commit without 'database is locked' errors."""
+        def worker():
+            for i in range(100):
+                self.manager.write(lambda conn: conn.execute("INSERT INTO items VALUES (?)", (i,)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        count = self.manager.connection().execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        self.assertEqual(count, 800, "Some concurrent writes were lost.")
+
+    def test_failed_write_rolls_back(self):
+        """An exception inside a write job rolls back and propagates to the caller."""
+        def job(conn):
+            conn.execute("INSERT INTO items VALUES (1)")
+            raise sqlite3.IntegrityError("boom")
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.manager.write(job)
+        count = self.manager.connection().execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        self.assertEqual(count, 0, "Failed write was not rolled back.")
+
+    def test_memory_database_shared(self):
+        """An in-memory database is visible from the writer and reader threads."""
+        manager = ConnectionManager(":memory:")
+        try:
+            manager.write(lambda conn: conn.execute("CREATE TABLE t (n INTEGER)"))
+            manager.write(lambda conn: conn.execute("INSERT INTO t VALUES (1)"))
+            self.assertEqual(manager.connection().execute("SELECT n FROM t").fetchone()[0], 1)
+        finally:
+            manager.close()
+
+if __name__ == "__main__":
+    unittest.main()
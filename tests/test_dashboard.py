@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+import dashboard
+import lead_feed
+import rollups
+import storage
+from lead_feed import LeadFeed
+
+class TestDashboard(unittest.TestCase):
+    """Route tests for the Flask dashboard, run against a temporary lead store."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_db_file = storage.DB_FILE
+        storage.DB_FILE = os.path.join(self.tmp.name, "leads.db")
+        lead_feed._feed = LeadFeed(autostart=False)
+        self.client = dashboard.app.test_client()
+
+    def tearDown(self):
+        lead_feed._feed.stop()
+        lead_feed._feed = None
+        storage.DB_FILE = self.original_db_file
+        storage.close_all()
+        self.tmp.cleanup()
+
+    def save(self, post_id, title="kw"):
+        storage.save_lead("Reddit", post_id, title, "content", "link")
+
+    def test_stream_sends_leads_after_cursor(self):
+        """/stream replays leads newer than ?after and then waits for new ones."""
+        self.save("seen")
+        self.save("unseen")
+        response = self.client.get("/stream?after=1", buffered=False)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        chunks = iter(response.response)
+        first = next(chunks)
+        first = first.decode() if isinstance(first, bytes) else first
+        self.assertIn('"post_id": "unseen"', first)
+        self.assertNotIn('"post_id": "seen"', first)
+        response.close()
+        self.assertFalse(lead_feed._feed.subscribers, "Closed stream left its subscription behind.")
+
+    def test_index_embeds_stream_cursor(self):
+        self.save("a")
+        self.save("b")
+        page = self.client.get("/").get_data(as_text=True)
+        self.assertIn('/stream?after=2', page)
+
+    def test_stats_endpoints(self):
+        """The /api/stats routes return rollup rows as JSON."""
+        rollups.clear_cache()
+        self.save("r1", "need automation help")
+        self.save("r2", "need automation help")
+        hourly = self.client.get("/api/stats/hourly?hours=24").get_json()
+        self.assertEqual(sum(row["leads"] for row in hourly), 2)
+        keywords = self.client.get("/api/stats/keywords?limit=5").get_json()
+        self.assertEqual(keywords, [{"keyword": "need automation help", "leads": 2, "drafts": 0}])
+        conversion = self.client.get("/api/stats/conversion").get_json()
+        self.assertEqual(conversion[0]["platform"], "Reddit")
+        rollups.clear_cache()
+
+    def test_stats_parameters_are_clamped(self):
+        """Out-of-range query parameters are clamped instead of creating new cache keys."""
+        rollups.clear_cache()
+        self.client.get("/api/stats/hourly?hours=999999")
+        self.client.get("/api/stats/hourly?hours=-5")
+        self.client.get("/api/stats/keywords?limit=100000")
+        keys = set(rollups._cache._entries)
+        self.assertIn(("hourly", rollups.MAX_HOURS, None, None), keys)
+        self.assertIn(("hourly", 1, None, None), keys)
+        self.assertIn(("keywords", rollups.MAX_KEYWORDS, None), keys)
+        rollups.clear_cache()
+
+if __name__ == "__main__":
+    unittest.main()
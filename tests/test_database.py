@@ -1,3 +1,4 @@
+import os
 import unittest
 import sqlite3
 from database import Database
@@ -73,11 +74,86 @@ class TestDatabase(unittest.TestCase):
         self.assertTrue(self.db.check_comment_exists("456def"), "check_comment_exists returned False for an existing comment.")
         self.assertFalse(self.db.check_comment_exists("999xyz"), "check_comment_exists returned True for a non-existent comment.")
 
+    def test_insert_posts_many(self):
+        """Bulk insert stores new posts and skips duplicates within and across batches."""
+        self.db.insert_post("Reddit", "p0", "TraderJoe", "Existing post", "https://reddit.com/p0")
+        rows = [("Reddit", f"p{i}", "TraderJoe", f"Post {i}", f"https://reddit.com/p{i}") for i in range(5)]
+        rows.append(("Reddit", "p1", "TraderJoe", "Duplicate", "https://reddit.com/dup"))
+
+        inserted = self.db.insert_posts_many(rows)
+        self.assertEqual(inserted, 4, "insert_posts_many should only count new posts.")
+        self.db.cursor.execute("SELECT COUNT(*) FROM posts")
+        self.assertEqual(self.db.cursor.fetchone()[0], 5, "Unexpected number of posts after bulk insert.")
+
+    def test_insert_comments_many(self):
+        """Bulk insert stores comments for an existing post."""
+        self.db.insert_post("Reddit", "123abc", "TraderJoe", "This is a test post!", "https://reddit.com/test")
+        comments = [("Reddit", "123abc", f"c{i}", "InvestorMike", f"Comment {i}") for i in range(3)]
+
+        self.assertEqual(self.db.insert_comments_many(comments), 3, "Comments were not bulk inserted.")
+        self.assertEqual(self.db.insert_comments_many(comments), 0, "Duplicate comments were inserted.")
+
+    def test_existing_post_ids(self):
+        """Lookups spanning several IN chunks return only stored IDs."""
+        self.db.insert_posts_many(("Reddit", f"id{i}", None, "", "") for i in range(2000))
+        candidates = [f"id{i}" for i in range(0, 4000, 2)]
+
+        found = self.db.existing_post_ids(candidates)
+        self.assertEqual(found, {f"id{i}" for i in range(0, 2000, 2)}, "existing_post_ids returned the wrong subset.")
+
+    def test_iter_posts(self):
+        """Streaming iteration yields every post in insertion order."""
+        self.db.insert_posts_many(("Reddit", f"id{i}", None, "", "") for i in range(25))
+        self.db.insert_post("Twitter", "tw1", None, "", "")
+
+        post_ids = [row[2] for row in self.db.iter_posts(platform="Reddit", batch_size=10)]
+        self.assertEqual(post_ids, [f"id{i}" for i in range(25)], "iter_posts did not yield all Reddit posts.")
+
+    def test_export_posts_csv(self):
+        """CSV export writes a header plus one line per post."""
+        import csv
+        import tempfile
+        self.db.insert_posts_many(("Reddit", f"id{i}", "TraderJoe", "text, with comma", "") for i in range(5))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "posts.csv")
+            self.assertEqual(self.db.export_posts(path, batch_size=2), 5, "Export reported the wrong row count.")
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(rows[0][2], "post_id", "CSV header is missing.")
+        self.assertEqual(len(rows), 6, "CSV export is missing rows.")
+        self.assertEqual(rows[1][4], "text, with comma", "CSV content was not quoted correctly.")
+
+    def test_concurrent_inserts(self):
+        """Posts inserted from several threads at once are all stored."""
+        import threading
+
+        def worker(n):
+            for i in range(50):
+                self.db.insert_post("Reddit", f"t{n}-{i}", None, "", "")
+            self.db.check_post_exists(f"t{n}-0")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.db.cursor.execute("SELECT COUNT(*) FROM posts")
+        self.assertEqual(self.db.cursor.fetchone()[0], 400, "Concurrent inserts were lost.")
+
+    def test_close_keeps_shared_manager_for_other_instances(self):
+        """Closing one Database must not close the manager another one still uses."""
+        other = Database(db_name="test_scraper_data.db")
+        self.assertIs(other.manager, self.db.manager)
+        other.close()
+        other.close()  # A second close is a no-op
+        self.db.insert_post("Reddit", "after-close", "TraderJoe", "Still writable", "https://reddit.com/x")
+        self.assertTrue(self.db.check_post_exists("after-close"))
+
     @classmethod
     def tearDownClass(cls):
         """Clean up test database after tests are complete."""
-        cls.db.conn.close()
-        import os
+        cls.db.close()
         os.remove("test_scraper_data.db")  # Remove test database file after tests complete
 
 if __name__ == "__main__":
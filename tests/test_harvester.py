@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import unittest
+import storage
+from database import Database
+from unittest import mock
+from harvester import CommentHarvester, fetch_reddit_comments, parse_count, reddit_thread_id, search_reddit
+from page_cache import PageCache
+
+def make_thread(post_id, count):
+    return {"platform": "Reddit", "post_id": post_id, "url": f"https://reddit.com/{post_id}", "comment_count": count}
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode()
+
+    def raise_for_status(self):
+        pass
+
+class FakeSession:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return FakeResponse(self.payload)
+
+class TestCommentHarvester(unittest.TestCase):
+    """Unit tests for change-driven comment harvesting."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(manager=storage.get_manager(os.path.join(self.tmp.name, "leads.db")))
+        self.fetched = []
+
+    def tearDown(self):
+        storage.close_all()
+        self.tmp.cleanup()
+
+    def fetch(self, thread, limit):
+        self.fetched.append(thread["post_id"])
+        for i in range(thread["comment_count"]):
+            yield f"{thread['post_id']}-c{i}", "InvestorMike", f"Comment {i}"
+
+    def comment_count(self):
+        return self.db.conn.execute("SELECT COUNT(*) FROM comments").fetchone()[0]
+
+    def test_only_changed_threads_are_fetched(self):
+        """Threads are re-fetched only when their comment count changes."""
+        harvester = CommentHarvester(self.db, max_per_thread=50, batch_size=10)
+        harvester.harvest([make_thread("a", 3), make_thread("b", 2), make_thread("c", 0)], self.fetch)
+        self.assertEqual(self.fetched, ["a", "b"], "Threads without comments should be skipped.")
+        self.assertEqual(self.comment_count(), 5, "Harvested comments were not stored.")
+
+        self.fetched.clear()
+        stats = harvester.harvest([make_thread("a", 3), make_thread("b", 4)], self.fetch)
+        self.assertEqual(self.fetched, ["b"], "Unchanged thread was fetched again.")
+        self.assertEqual(stats["comments_saved"], 2, "Only the new comments should be saved.")
+
+    def test_duplicate_threads_fetched_once(self):
+        """A thread returned for several keywords is fetched once."""
+        harvester = CommentHarvester(self.db, max_per_thread=50, batch_size=10)
+        harvester.harvest([make_thread("a", 3), make_thread("a", 3)], self.fetch)
+        self.assertEqual(self.fetched, ["a"], "Duplicate thread was fetched twice.")
+
+    def test_cap_and_batches(self):
+        """At most max_per_thread comments are read, across several insert batches."""
+        harvester = CommentHarvester(self.db, max_per_thread=25, batch_size=7)
+        stats = harvester.harvest([make_thread("a", 100), make_thread("b", 10)], self.fetch)
+        self.assertEqual(stats["comments_saved"], 35, "Per-thread cap was not applied.")
+        self.assertEqual(self.comment_count(), 35)
+
+    def test_failed_thread_is_retried(self):
+        """A thread whose fetch fails is not cached and is fetched again next time."""
+        def broken(thread, limit):
+            raise RuntimeError("page did not load")
+            yield  # pragma: no cover
+
+        harvester = CommentHarvester(self.db)
+        stats = harvester.harvest([make_thread("a", 3)], broken)
+        self.assertEqual(stats["threads_fetched"], 0)
+        harvester.harvest([make_thread("a", 3)], self.fetch)
+        self.assertEqual(self.fetched, ["a"], "Failed thread was not retried.")
+
+class TestHarvesterHelpers(unittest.TestCase):
+    """Unit tests for count parsing and platform helpers."""
+
+    def test_parse_count(self):
+        self.assertEqual(parse_count("12 Replies. Reply"), 12)
+        self.assertEqual(parse_count("1,204"), 1204)
+        self.assertEqual(parse_count("3.4K replies"), 3400)
+        self.assertEqual(parse_count(None), 0)
+
+    def test_reddit_thread_id(self):
+        self.assertEqual(reddit_thread_id("/r/algotrading/comments/1AbC23/best_bot/"), "1abc23")
+        self.assertIsNone(reddit_thread_id("https://www.reddit.com/r/algotrading/"))
+
+    def test_fetch_reddit_comments_flattens_tree(self):
+        """Nested replies are yielded depth-first from a single request."""
+        reply = {"kind": "t1", "data": {"name": "t1_b", "author": "y", "body": "reply", "replies": ""}}
+        top = {"kind": "t1", "data": {"name": "t1_a", "author": "x", "body": "top",
+                                      "replies": {"data": {"children": [reply]}}}}
+        more = {"kind": "more", "data": {}}
+        session = FakeSession([{}, {"data": {"children": [top, more]}}])
+
+        comments = list(fetch_reddit_comments({"post_id": "abc"}, 10, session=session))
+        self.assertEqual([c[0] for c in comments], ["t1_a", "t1_b"])
+        self.assertEqual(len(session.calls), 1, "Comments should load in one request per thread.")
+
+    def test_fresh_cache_hits_bypass_rate_limiting(self):
+        """Only real requests go through the traffic controller."""
+        post = {"id": "x1", "title": "Need a bot", "permalink": "/r/forhire/comments/x1/need_a_bot/"}
+        session = FakeSession({"data": {"children": [{"data": post}]}})
+        traffic = mock.Mock()
+        traffic.run.side_effect = lambda platform, url, fn: fn()
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PageCache(os.path.join(tmp, "cache.db"), ttl=600)
+            try:
+                for _ in range(2):
+                    self.assertEqual(search_reddit("bot", session=session, cache=cache, traffic=traffic)[0]["post_id"], "x1")
+            finally:
+                cache.close()
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(traffic.run.call_count, 1, "A fresh cache hit waited for a rate-limit slot.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import unittest
+import lead_feed
+import storage
+from lead_feed import LeadFeed, format_event
+
+class TestLeadFeed(unittest.TestCase):
+    """Unit tests for the Server-Sent Events lead feed."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp.name, "leads.db")
+        storage.save_lead("Reddit", "old", "kw", "content", "link", db_file=self.db_file)
+        self.feed = LeadFeed(db_file=self.db_file, autostart=False)
+
+    def tearDown(self):
+        self.feed.stop()
+        storage.close_all()
+        self.tmp.cleanup()
+
+    def save(self, post_id):
+        storage.save_lead("Reddit", post_id, "kw", "content", "link", db_file=self.db_file)
+
+    def test_only_new_leads_reach_every_subscriber(self):
+        """Leads committed after subscribing are fanned out once per poll to all clients."""
+        first, second = self.feed.subscribe(), self.feed.subscribe()
+        self.feed.poll_once()
+        self.save("new1")
+        self.save("new2")
+        self.assertEqual(self.feed.poll_once(), 2)
+        for subscription in (first, second):
+            received = [subscription.get(timeout=0)["post_id"] for _ in range(2)]
+            self.assertEqual(received, ["new1", "new2"])
+            self.assertIsNone(subscription.get(timeout=0), "Existing lead was pushed to a new subscriber.")
+
+    def test_idle_poll_skips_query(self):
+        """With no commits since the last poll, data_version is unchanged and nothing is read."""
+        self.feed.subscribe()
+        self.feed.poll_once()
+        self.assertEqual(self.feed.poll_once(), 0)
+
+    def test_large_backlog_is_read_in_one_poll(self):
+        """Rows past one read batch are still published without waiting for another commit."""
+        subscription = self.feed.subscribe()
+        self.feed.poll_once()
+        storage.get_manager(self.db_file).write(lambda conn: conn.executemany(
+            "INSERT INTO leads (platform, post_id, title, content, link) VALUES ('Reddit', ?, 'kw', 'c', 'l')",
+            [(f"bulk{i}",) for i in range(lead_feed.CATCH_UP_LIMIT + 5)]
+        ))
+        self.assertEqual(self.feed.poll_once(), lead_feed.CATCH_UP_LIMIT + 5)
+        self.assertEqual(subscription.queue.qsize(), lead_feed.CATCH_UP_LIMIT + 5)
+        self.assertEqual(self.feed.poll_once(), 0)
+
+    def test_stop_wakes_poller(self):
+        """stop() returns promptly even with a long poll interval."""
+        feed = LeadFeed(db_file=self.db_file, poll_interval=3600)
+        feed.subscribe()
+        feed.stop(timeout=5)
+        self.assertFalse(feed._thread.is_alive(), "Poller thread did not stop.")
+
+    def test_slow_subscriber_is_dropped(self):
+        feed = LeadFeed(db_file=self.db_file, queue_size=1, autostart=False)
+        subscription = feed.subscribe()
+        feed.poll_once()
+        self.save("new1")
+        self.save("new2")
+        feed.poll_once()
+        self.assertTrue(subscription.closed, "Full subscriber queue was not dropped.")
+        self.assertFalse(feed.subscribers)
+        feed.stop()
+
+    def test_stream_replays_from_last_event_id(self):
+        """A reconnecting client first receives the leads it missed."""
+        self.save("missed")
+        events = self.feed.stream(last_event_id=1, heartbeat=0)
+        first = next(events)
+        self.assertTrue(first.startswith("id: 2\nevent: lead\n"))
+        self.assertEqual(json.loads(first.split("data: ", 1)[1])["post_id"], "missed")
+        self.assertEqual(next(events), "retry: 5000\n\n")
+        self.assertEqual(next(events), ": keep-alive\n\n")
+        events.close()
+        self.assertFalse(self.feed.subscribers, "Closed stream left its subscription behind.")
+
+    def test_format_event(self):
+        self.assertEqual(format_event({"id": 7, "title": "t"}), 'id: 7\nevent: lead\ndata: {"id": 7, "title": "t"}\n\n')
+
+if __name__ == "__main__":
+    unittest.main()
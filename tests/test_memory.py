@@ -0,0 +1,129 @@
+import tracemalloc
+import unittest
+from unittest import mock
+from memory import MIB, MemoryMonitor, RecyclingDriver, rss_bytes
+
+class FakeRSS:
+    """Stands in for rss_bytes with a settable reading in MiB."""
+
+    def __init__(self, mib=100):
+        self.mib = mib
+
+    def __call__(self):
+        return self.mib * MIB
+
+class FakeDriver:
+    started = 0
+
+    def __init__(self):
+        FakeDriver.started += 1
+        self.number = FakeDriver.started
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+class TestMemory(unittest.TestCase):
+    """Unit tests for per-stage RSS tracking and ceiling-driven browser recycling."""
+
+    def test_rss_is_measured(self):
+        rss = rss_bytes()
+        if rss is None:
+            self.skipTest("RSS is not available on this platform")
+        self.assertGreater(rss, MIB)
+
+    def test_no_rss_without_proc(self):
+        """Without /proc the reading is unknown, so the ceiling never triggers recycling."""
+        with mock.patch("memory._proc_rss", side_effect=FileNotFoundError):
+            self.assertIsNone(rss_bytes())
+        monitor = MemoryMonitor(ceiling_mb=1, trace=False, rss=lambda: None)
+        self.assertFalse(monitor.over_ceiling())
+
+    def test_stage_records_peak(self):
+        """The highest reading seen inside a stage is kept across runs."""
+        rss = FakeRSS(100)
+        monitor = MemoryMonitor(ceiling_mb=0, trace=False, rss=rss)
+        with monitor.stage("twitter"):
+            rss.mib = 300
+            monitor.sample()
+            rss.mib = 150
+        with monitor.stage("twitter"):
+            pass
+        stage = monitor.stages["twitter"]
+        self.assertEqual((stage["runs"], stage["peak_rss"], stage["last_rss"]), (2, 300 * MIB, 150 * MIB))
+        with self.assertLogs(level="INFO") as logs:
+            monitor.log_report()
+        self.assertIn("Memory [twitter]: peak RSS 300 MiB", logs.output[0])
+
+    def test_ceiling(self):
+        rss = FakeRSS(100)
+        self.assertFalse(MemoryMonitor(ceiling_mb=0, trace=False, rss=FakeRSS(10_000)).over_ceiling(), "0 should disable the ceiling.")
+        monitor = MemoryMonitor(ceiling_mb=200, trace=False, rss=rss)
+        self.assertFalse(monitor.over_ceiling())
+        rss.mib = 250
+        self.assertTrue(monitor.over_ceiling())
+
+    def test_driver_recycled_over_ceiling(self):
+        """Over the ceiling the browser is quit and restarted, reopening its start page."""
+        rss = FakeRSS(100)
+        monitor = MemoryMonitor(ceiling_mb=200, trace=False, rss=rss)
+        opened = []
+        with RecyclingDriver(FakeDriver, on_start=lambda d: opened.append(d.number), monitor=monitor) as driver:
+            first = driver.driver
+            self.assertFalse(driver.recycle_if_needed())
+            rss.mib = 250
+
+            def released(_driver):
+                rss.mib = 120  # Quitting the old browser frees its memory
+
+            first.quit = lambda: (FakeDriver.quit(first), released(first))
+            with self.assertLogs(level="INFO"):
+                self.assertTrue(driver.recycle_if_needed())
+            self.assertTrue(first.quit_called)
+            self.assertEqual(driver.number, first.number + 1, "Attribute access did not reach the new driver.")
+            last = driver.driver
+        self.assertTrue(last.quit_called, "The browser was not quit on exit.")
+        self.assertEqual(opened, [first.number, last.number])
+        self.assertEqual(monitor.recycles, 1)
+
+    def test_driver_quit_when_block_raises(self):
+        with self.assertRaises(RuntimeError):
+            with RecyclingDriver(FakeDriver, monitor=MemoryMonitor(ceiling_mb=0, trace=False)) as driver:
+                started = driver.driver
+                raise RuntimeError("scraper failed")
+        self.assertTrue(started.quit_called)
+
+    def test_failed_start_page_quits_driver(self):
+        drivers = []
+
+        def factory():
+            drivers.append(FakeDriver())
+            return drivers[-1]
+
+        def fail(_driver):
+            raise TimeoutError("explore page")
+
+        with self.assertRaises(TimeoutError):
+            with RecyclingDriver(factory, on_start=fail, monitor=MemoryMonitor(ceiling_mb=0, trace=False)):
+                pass
+        self.assertTrue(drivers[0].quit_called)
+
+    def test_snapshot_on_demand(self):
+        """The first snapshot arms tracemalloc; the next one lists allocation sites."""
+        was_tracing = tracemalloc.is_tracing()
+        monitor = MemoryMonitor(ceiling_mb=0, trace=False)
+        try:
+            with self.assertLogs(level="INFO"):
+                monitor.snapshot()
+            data = [bytearray(1024) for _ in range(100)]
+            with self.assertLogs(level="INFO") as logs:
+                top = monitor.snapshot(limit=5)
+            self.assertTrue(top)
+            self.assertIn("Top allocations", logs.output[0])
+            del data
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from datetime import datetime, timezone
+from normalize import canonical_post, normalize_page, normalize_post, page_fingerprint
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+class TestNormalize(unittest.TestCase):
+    """Unit tests for canonical post keys and lead text extraction."""
+
+    def test_canonical_ids_ignore_url_noise(self):
+        """Query strings, trailing slashes, hosts and slugs do not change the post_id."""
+        cases = {
+            "Reddit": ("/r/forhire/comments/AbC12/hiring_a_dev/?utm_source=share",
+                       "https://old.reddit.com/r/forhire/comments/abc12/", "https://redd.it/abc12"),
+            "Twitter": ("https://x.com/jane/status/1234567890?s=20", "https://twitter.com/jane/status/1234567890/photo/1"),
+            "LinkedIn": ("https://www.linkedin.com/feed/update/urn:li:activity:7123456789012345678/?trk=feed",
+                         "https://www.linkedin.com/posts/jane_hiring-activity-7123456789012345678-AbCd"),
+            "Upwork": ("/jobs/Python-scraper_~01abcdef0123456789/?referrer=search", "https://www.upwork.com/jobs/~01abcdef0123456789"),
+        }
+        for platform, links in cases.items():
+            with self.subTest(platform=platform):
+                keys = {canonical_post(platform, link) for link in links}
+                self.assertEqual(len(keys), 1, f"{platform} links gave different keys: {keys}")
+        self.assertEqual(canonical_post("Reddit", "/r/forhire/comments/AbC12/x/")[0], "abc12")
+
+    def test_unknown_links_fall_back_to_last_segment(self):
+        self.assertEqual(canonical_post("LinkedIn", "https://www.linkedin.com/jobs/view/123/?trk=x#top"),
+                         ("123", "https://www.linkedin.com/jobs/view/123"))
+        self.assertEqual(canonical_post("Twitter", None), (None, None))
+
+    def test_strips_chrome_and_extracts_fields(self):
+        """UI chrome is dropped and author, time, budget and contact come out in one call."""
+        post = normalize_post(
+            "Twitter",
+            "Jane Dev\n@janedev\n·\n5m\nHiring a python expert, $40-$60/hr.\nDM me or jane@example.com\n12\n3\n1.2K\nShow more",
+            "https://x.com/janedev/status/123?s=20", now=NOW,
+        )
+        self.assertEqual(post.content, "Hiring a python expert, $40-$60/hr.\nDM me or jane@example.com")
+        self.assertEqual((post.post_id, post.link), ("123", "https://twitter.com/janedev/status/123"))
+        self.assertEqual(post.author, "janedev")
+        self.assertEqual(post.posted, "2026-03-10 11:55:00")
+        self.assertEqual(post.budget, "$40-$60/hr")
+        self.assertEqual(post.contact, "DM me, jane@example.com")
+
+    def test_platform_specific_fields(self):
+        linkedin = normalize_post(
+            "LinkedIn", "Jane Doe\n• 2nd\nFounder at Acme\n3d •\nNeed automation help\n…see more\n45\n3 comments",
+            "https://www.linkedin.com/feed/update/urn:li:activity:7123456789012345678/", now=NOW,
+        )
+        self.assertEqual((linkedin.author, linkedin.content), ("Jane Doe", "Founder at Acme\nNeed automation help"))
+        self.assertEqual(linkedin.posted, "2026-03-07 12:00:00")
+
+        upwork = normalize_post(
+            "Upwork", "Python scraper\nPosted 2 hours ago\nHourly: $30.00-$50.00\nBuild a scraper\nPayment verified\nProposals: 5 to 10",
+            "/jobs/~01abcdef0123456789", title="Python scraper", now=NOW,
+        )
+        self.assertEqual(upwork.content, "Hourly: $30.00-$50.00\nBuild a scraper")
+        self.assertEqual(upwork.budget, "Hourly: $30.00-$50.00")
+        self.assertEqual(upwork.posted, "2026-03-10 10:00:00")
+
+    def test_page_dedupes_and_skips_missing_links(self):
+        """A page yields one post per canonical ID, in order, without link-less cards."""
+        page = normalize_page("Reddit", [
+            ("Need a bot", "/r/forhire/comments/x1/need_a_bot/"),
+            ("No link", None),
+            ("Need a bot", "/r/forhire/comments/x1/need_a_bot/?context=3"),
+            ("Need a scraper", "/r/forhire/comments/x2/need_a_scraper/", None, "someone"),
+        ], now=NOW)
+        self.assertEqual([(post.post_id, post.author) for post in page], [("x1", None), ("x2", "someone")])
+
+    def test_fingerprint_ignores_volatile_text(self):
+        """Relative times and counts do not change a page's fingerprint; a new post does."""
+        first = normalize_page("Twitter", [("Alice\n@alice\n5m\nNeed a bot\n12", "https://x.com/alice/status/1")], now=NOW)
+        later = normalize_page("Twitter", [("Alice\n@alice\n2h\nNeed a bot\n40", "https://x.com/alice/status/1")], now=NOW)
+        self.assertEqual(page_fingerprint(first), page_fingerprint(later))
+        more = later + normalize_page("Twitter", [("Need a scraper", "https://x.com/bob/status/2")], now=NOW)
+        self.assertNotEqual(page_fingerprint(first), page_fingerprint(more))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import time
+import unittest
+from notifier import (DiscordSink, EmailSink, Notifier, RecordingSMTP, RecordingTransport, SinkWorker,
+                      TelegramSink, WebhookSink)
+from rate_limiter import RetryPolicy
+
+def alert(i, platform="Reddit"):
+    return {"platform": platform, "title": f"Lead {i}", "content": "Need a bot", "link": f"https://example.com/{i}"}
+
+class TestNotifier(unittest.TestCase):
+    """Unit tests for sink fan-out, batching and digests using the offline stand-ins."""
+
+    def setUp(self):
+        self.workers = []
+
+    def tearDown(self):
+        for worker in self.workers:
+            worker.stop(5)
+
+    def worker(self, sink, **options):
+        options = dict(dict(batch_size=10, batch_seconds=60, rate_per_minute=6000, digest_seconds=0), **options)
+        worker = SinkWorker(sink, **options)
+        self.workers.append(worker)
+        return worker
+
+    def test_batches_leads_per_message(self):
+        """Queued leads are sent together, split at the batch size."""
+        transport = RecordingTransport()
+        worker = self.worker(DiscordSink(transport), batch_size=3)
+        for i in range(7):
+            worker.put(alert(i))
+        self.assertTrue(worker.flush(5))
+        self.assertEqual([len(args[0]["embeds"]) for args, _ in transport.calls], [3, 3, 1])
+        self.assertEqual(worker.stats["sent"], 7)
+
+    def test_batch_window_sends_partial_batch(self):
+        transport = RecordingTransport()
+        worker = self.worker(WebhookSink("https://hooks.example/x", post=transport), batch_seconds=0.05)
+        worker.put(alert(1))
+        deadline = time.monotonic() + 5
+        while not transport.calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(transport.calls[0][1]["json"]["leads"][0]["title"], "Lead 1")
+
+    def test_digest_mode_sends_one_summary(self):
+        smtp = RecordingSMTP()
+        sink = EmailSink("smtp.example", 587, "bot@example.com", ["me@example.com"], smtp=smtp)
+        worker = self.worker(sink, digest_seconds=3600)
+        for i in range(25):
+            worker.put(alert(i, platform="Twitter" if i % 5 else "Reddit"))
+        worker.flush(5)
+        self.assertEqual(len(smtp.messages), 1, "Digest mode sent per-lead messages.")
+        self.assertEqual(smtp.messages[0]["Subject"], "Lead digest: 25 new leads")
+        self.assertIn("Reddit 5, Twitter 20", smtp.messages[0].get_content())
+
+    def test_slow_sink_does_not_delay_others(self):
+        """notify() returns at once and a fast sink delivers while a slow one is still sending."""
+        slow = RecordingTransport(delay=0.5)
+        fast = RecordingTransport()
+        notifier = Notifier([TelegramSink("t", "1", post=slow), WebhookSink("https://hooks.example/x", post=fast)],
+                            batch_size=1, batch_seconds=0, rate_per_minute=6000, digest_seconds=0)
+        self.workers.extend(notifier.workers)
+        start = time.monotonic()
+        notifier.notify("Reddit", "Lead", "content", "https://example.com/1")
+        self.assertLess(time.monotonic() - start, 0.1, "notify() blocked on a sink.")
+        notifier.workers[1].flush(5)
+        self.assertEqual(len(fast.calls), 1)
+        self.assertEqual(len(slow.calls), 0, "Fast sink waited for the slow one.")
+        notifier.workers[0].flush(5)
+        self.assertEqual(len(slow.calls), 1)
+
+    def test_failed_sink_is_retried_then_counted(self):
+        transport = RecordingTransport(fail=True)
+        worker = self.worker(TelegramSink("t", "1", post=transport),
+                             policy=RetryPolicy(max_attempts=2, base_delay=0, max_delay=0))
+        worker.put(alert(1))
+        worker.flush(5)
+        self.assertEqual(worker.stats["failed"], 1)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        worker = self.worker(WebhookSink("https://hooks.example/x", post=RecordingTransport(delay=0.2)),
+                             batch_size=1, queue_size=1)
+        results = [worker.put(alert(i)) for i in range(5)]
+        self.assertIn(False, results)
+        self.assertGreater(worker.stats["dropped"], 0)
+
+    def test_on_done_runs_after_every_sink(self):
+        """The completion callback fires once, after all sinks sent or gave up, and reports whether all sent."""
+        done = []
+        ok = RecordingTransport()
+        down = RecordingTransport(fail=True)
+        options = dict(batch_size=1, batch_seconds=0, rate_per_minute=6000, digest_seconds=0,
+                       policy=RetryPolicy(max_attempts=1, base_delay=0, max_delay=0))
+        notifier = Notifier([WebhookSink("https://hooks.example/x", post=ok),
+                             TelegramSink("t", "1", post=down)], **options)
+        self.workers.extend(notifier.workers)
+        notifier.notify("Reddit", "Lead", "content", "https://example.com/1", on_done=done.append)
+        self.assertTrue(notifier.flush(5))
+        self.assertEqual(done, [False], "A failed sink must not count as delivered.")
+        self.assertNotIn("on_done", ok.calls[0][1]["json"]["leads"][0], "Callback leaked into the payload.")
+
+        down.fail = False
+        notifier.notify("Reddit", "Lead", "content", "https://example.com/2", on_done=done.append)
+        self.assertTrue(notifier.flush(5))
+        self.assertEqual(done, [False, True])
+
+        empty = Notifier([])
+        empty.notify("Reddit", "Lead", "content", "https://example.com/3", on_done=done.append)
+        self.assertEqual(done, [False, True, True], "With no sinks the alert is done immediately.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import time
+import unittest
+from page_cache import PageCache, normalize_url
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+class FakeSession:
+    """Serves a fixed body with an ETag and honours If-None-Match."""
+
+    def __init__(self, body=b"<html>results</html>", etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        if headers and headers.get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.body, {"ETag": self.etag})
+
+class TestPageCache(unittest.TestCase):
+    """Unit tests for the disk-backed page cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_normalize_url(self):
+        """Equivalent URLs map to the same cache key."""
+        a = normalize_url("HTTPS://www.Reddit.com:443/search/?type=link&q=bot&utm_source=x#top")
+        b = normalize_url("https://www.reddit.com/search", params={"q": "bot", "type": "link"})
+        self.assertEqual(a, b, "Equivalent URLs produced different keys.")
+        self.assertNotEqual(a, normalize_url("https://www.reddit.com/search?q=bot&type=link&t=week"))
+
+    def test_fresh_hit_and_conditional_revalidation(self):
+        """Fresh pages skip the network; stale pages are revalidated with If-None-Match."""
+        cache = PageCache(self.path, ttl=60)
+        session = FakeSession()
+        url = "https://www.reddit.com/by_id/t3_a.json"
+        self.assertEqual(cache.fetch(url, session, platform="Reddit"), session.body)
+        self.assertEqual(cache.fetch(url, session, platform="Reddit"), session.body)
+        self.assertEqual(len(session.requests), 1, "Fresh entry should not trigger a request.")
+
+        cache.ttl = 0
+        self.assertEqual(cache.fetch(url, session, platform="Reddit"), session.body)
+        self.assertEqual(session.requests[-1].get("If-None-Match"), '"v1"', "Stale entry was not revalidated.")
+
+        stats = cache.stats()["Reddit"]
+        self.assertEqual((stats["misses"], stats["hits"], stats["revalidated"]), (1, 1, 1))
+        self.assertEqual(stats["bytes_saved"], 2 * len(session.body))
+        cache.close()
+
+    def test_content_changed(self):
+        """Browser result lists are re-extracted only when their hash changes."""
+        cache = PageCache(self.path)
+        url = "https://www.reddit.com/search/?q=bot"
+        self.assertTrue(cache.content_changed(url, "post a", platform="Reddit"))
+        self.assertTrue(cache.content_changed(url, "post a", platform="Reddit"), "Unprocessed page was skipped.")
+        cache.mark_processed(url, "post a")
+        self.assertFalse(cache.content_changed(url, "post a", platform="Reddit"))
+        self.assertTrue(cache.content_changed(url, "post a\npost b", platform="Reddit"))
+        self.assertAlmostEqual(cache.stats()["Reddit"]["hit_ratio"], 1 / 4)
+        self.assertEqual(cache.stats()["Reddit"]["extractions_skipped"], 1)
+        self.assertNotIn("bytes_saved", cache.stats()["Reddit"], "The browser still downloaded the page.")
+        cache.close()
+
+    def test_lru_eviction(self):
+        """Least recently used pages are evicted once the size cap is exceeded."""
+        cache = PageCache(self.path, max_bytes=250)
+        cache.put("https://a.example/1", body=b"x" * 100)
+        time.sleep(0.01)
+        cache.put("https://a.example/2", body=b"x" * 100)
+        time.sleep(0.01)
+        cache.get("https://a.example/1")  # 1 is now more recent than 2
+        time.sleep(0.01)
+        cache.put("https://a.example/3", body=b"x" * 100)
+
+        self.assertIsNotNone(cache.get("https://a.example/1"), "Recently used page was evicted.")
+        self.assertIsNone(cache.get("https://a.example/2"), "Least recently used page was kept.")
+        self.assertIsNotNone(cache.get("https://a.example/3"))
+        cache.close()
+
+    def test_persists_across_instances(self):
+        """Entries survive a restart."""
+        cache = PageCache(self.path)
+        cache.put("https://a.example/1", body=b"body", etag='"e"')
+        cache.close()
+        cache = PageCache(self.path)
+        self.assertEqual(cache.get("https://a.example/1")["etag"], '"e"')
+        cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from rate_limiter import (AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError, RetryPolicy,
+                          TokenBucket, TrafficController)
+
+class FakeClock:
+    """Deterministic clock whose sleep() advances time instead of blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+class HTTPError(Exception):
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.response = type("Response", (), {"status_code": status, "headers": headers or {}})()
+
+class TestTokenBucket(unittest.TestCase):
+    """Unit tests for the token bucket."""
+
+    def test_paces_requests(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=0.5, capacity=1, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(clock.slept, [2.0, 2.0], "Requests were not spaced at the bucket rate.")
+
+    def test_pause_honours_retry_after(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=5, clock=clock, sleep=clock.sleep)
+        bucket.pause(30)
+        self.assertEqual(bucket.acquire(), 30)
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """Unit tests for latency/error driven rate adaptation."""
+
+    def setUp(self):
+        self.limiter = AdaptiveRateLimiter(rate=12, min_rate=2, max_rate=60, target_latency=1.0)
+
+    def test_domains_are_independent(self):
+        self.limiter.record("https://www.reddit.com/search", throttled=True)
+        self.assertEqual(self.limiter.rate("https://reddit.com/r/x"), 6, "429 should halve the rate.")
+        self.assertEqual(self.limiter.rate("https://twitter.com/explore"), 12, "Other domains must be unaffected.")
+
+    def test_fast_responses_increase_rate_up_to_max(self):
+        for _ in range(1000):
+            self.limiter.record("reddit.com", latency=0.2)
+        self.assertAlmostEqual(self.limiter.rate("reddit.com"), 60)
+
+    def test_errors_decrease_rate_down_to_min(self):
+        for _ in range(20):
+            self.limiter.record("reddit.com", error=True)
+        self.assertAlmostEqual(self.limiter.rate("reddit.com"), 2)
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Unit tests for the per-platform circuit breaker."""
+
+    def test_opens_then_half_opens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60, clock=clock)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        clock.now += 60
+        self.assertEqual(breaker.state, "half-open")
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+class TestTrafficController(unittest.TestCase):
+    """Unit tests for retries with backoff through the shared controller."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=600, clock=self.clock, sleep=self.clock.sleep)
+        self.controller = TrafficController(
+            limiter=limiter,
+            policy=RetryPolicy(max_attempts=3, base_delay=1, max_delay=10),
+            breaker_factory=lambda: CircuitBreaker(failure_threshold=3, reset_timeout=60, clock=self.clock),
+            sleep=self.clock.sleep, clock=self.clock,
+        )
+
+    def test_recovers_after_transient_failures(self):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise HTTPError(429, {"Retry-After": "5"})
+            return "ok"
+
+        self.assertEqual(self.controller.run("Reddit", "https://reddit.com/x", flaky), "ok")
+        self.assertEqual(len(calls), 3, "Transient failures were not retried.")
+        self.assertGreaterEqual(sum(self.clock.slept), 5, "Retry-After was not honoured.")
+
+    def test_gives_up_and_opens_circuit(self):
+        def broken():
+            raise RuntimeError("chrome crashed")
+
+        with self.assertRaises(RuntimeError):
+            self.controller.run("Reddit", "https://reddit.com/x", broken)
+        with self.assertRaises(CircuitOpenError):
+            self.controller.run("Reddit", "https://reddit.com/y", lambda: "ok")
+        self.assertEqual(self.controller.run("Twitter", "https://twitter.com", lambda: "ok"), "ok")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import rollups
+import storage
+
+class TestRollups(unittest.TestCase):
+    """Unit tests for the incremental lead rollups behind /api/stats."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp.name, "leads.db")
+        rollups.clear_cache()
+
+    def tearDown(self):
+        rollups.clear_cache()
+        storage.close_all()
+        self.tmp.cleanup()
+
+    def save(self, platform, post_id, keyword):
+        storage.save_lead(platform, post_id, keyword, "content", "link", db_file=self.db_file)
+
+    def test_rollups_follow_inserts_and_drafts(self):
+        """Inserts and draft updates are reflected without scanning leads."""
+        self.save("Reddit", "r1", "need automation help")
+        self.save("Reddit", "r2", "need automation help")
+        self.save("Twitter", "t1", "freelance programmer")
+        storage.mark_draft_generated("r1", db_file=self.db_file)
+
+        keywords = rollups.keyword_yield(db_file=self.db_file)
+        self.assertEqual(keywords[0], {"keyword": "need automation help", "leads": 2, "drafts": 1})
+
+        conversion = {row["platform"]: row for row in rollups.draft_conversion(db_file=self.db_file)}
+        self.assertEqual(conversion["Reddit"]["conversion"], 0.5)
+        self.assertEqual(conversion["Twitter"]["conversion"], 0.0)
+
+        hourly = rollups.leads_per_hour(db_file=self.db_file)
+        self.assertEqual(sum(row["leads"] for row in hourly), 3, "Hourly buckets are missing leads.")
+
+    def test_rollups_match_full_rebuild(self):
+        """Trigger-maintained rollups equal a from-scratch GROUP BY."""
+        for i in range(30):
+            self.save(["Reddit", "Twitter", "Upwork"][i % 3], f"p{i}", f"kw{i % 4}")
+        for i in range(0, 30, 5):
+            storage.mark_draft_generated(f"p{i}", db_file=self.db_file)
+        conn = storage.get_manager(self.db_file).connection()
+        incremental = conn.execute("SELECT * FROM keyword_stats ORDER BY 1, 2").fetchall()
+
+        storage.get_manager(self.db_file).write(storage.rebuild_lead_rollups)
+        self.assertEqual(conn.execute("SELECT * FROM keyword_stats ORDER BY 1, 2").fetchall(), incremental)
+
+    def test_upwork_job_titles_are_not_keywords(self):
+        """Upwork leads count towards hourly and conversion stats but not keyword yield."""
+        self.save("Upwork", "u1", "Build a trading bot")
+        self.save("Reddit", "r1", "kw")
+        self.assertEqual([row["keyword"] for row in rollups.keyword_yield(db_file=self.db_file)], ["kw"])
+        platforms = [row["platform"] for row in rollups.draft_conversion(db_file=self.db_file)]
+        self.assertEqual(platforms, ["Reddit", "Upwork"])
+
+    def test_responses_are_cached(self):
+        """Stats are served from the TTL cache until it expires."""
+        self.save("Reddit", "r1", "kw")
+        first = rollups.keyword_yield(db_file=self.db_file)
+        self.save("Reddit", "r2", "kw")
+        self.assertEqual(rollups.keyword_yield(db_file=self.db_file), first, "Cached stats were recomputed.")
+        rollups.clear_cache()
+        self.assertEqual(rollups.keyword_yield(db_file=self.db_file)[0]["leads"], 2)
+
+    def test_ttl_cache_expiry(self):
+        now = [0.0]
+        cache = rollups.TTLCache(ttl=10, clock=lambda: now[0])
+        self.assertEqual(cache.get_or_compute("k", lambda: 1), 1)
+        self.assertEqual(cache.get_or_compute("k", lambda: 2), 1)
+        now[0] = 10
+        self.assertEqual(cache.get_or_compute("k", lambda: 3), 3)
+
+    def test_ttl_cache_is_bounded(self):
+        cache = rollups.TTLCache(ttl=10, clock=lambda: 0.0, max_entries=3)
+        for key in range(10):
+            cache.get_or_compute(key, lambda: key)
+        self.assertEqual(len(cache._entries), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import auto_scraper
+import manual_scraper
+import storage
+from checkpoint import CycleJournal
+from rate_limiter import CircuitOpenError
+
+class TestScraperCycle(unittest.TestCase):
+    """A failing platform must not stop the other scrapers or the cycle."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = CycleJournal(os.path.join(self.tmp.name, "leads.db"))
+
+    def tearDown(self):
+        storage.close_all()
+        self.tmp.cleanup()
+
+    def run_cycle(self, module, crash=None):
+        calls = []
+
+        def record(name, error=None):
+            def scraper():
+                calls.append(name)
+                if error:
+                    raise error
+            scraper.__name__ = name
+            return scraper
+
+        scrapers = {
+            "twitter": record("scrape_twitter", CircuitOpenError("open")),
+            "linkedin": record("scrape_linkedin", RuntimeError("retries exhausted")),
+            "reddit": record("scrape_reddit"),
+            "upwork": record("scrape_upwork", crash),
+        }
+        with mock.patch.dict(module.SCRAPERS, scrapers), \
+             mock.patch.object(module, "get_journal", return_value=self.journal), \
+             mock.patch.object(module, "get_page_cache"), \
+             mock.patch.object(module.time, "sleep"):
+            module.run_scrapers()
+        return calls
+
+    def test_failed_platforms_are_skipped(self):
+        for module in (auto_scraper, manual_scraper):
+            with self.subTest(module=module.__name__):
+                self.assertEqual(
+                    self.run_cycle(module),
+                    ["scrape_twitter", "scrape_linkedin", "scrape_reddit", "scrape_upwork"],
+                    "A platform failure stopped the remaining scrapers."
+                )
+
+    def test_restart_skips_finished_platforms(self):
+        """After a crash mid-cycle, the next run only repeats platforms that had not finished."""
+        for module in (auto_scraper, manual_scraper):
+            with self.subTest(module=module.__name__):
+                with self.assertRaises(KeyboardInterrupt):
+                    self.run_cycle(module, crash=KeyboardInterrupt())
+                self.journal = CycleJournal(self.journal.db_file)  # The restarted process
+                # Reddit finished; Twitter and LinkedIn failed and Upwork was cut off, so those run again
+                self.assertEqual(self.run_cycle(module), ["scrape_twitter", "scrape_linkedin", "scrape_upwork"],
+                                 "Finished platforms were scraped again after the restart.")
+                self.assertEqual(self.run_cycle(module), ["scrape_twitter", "scrape_linkedin", "scrape_reddit",
+                                                          "scrape_upwork"], "The next cycle did not start fresh.")
+
+    def test_run_forever_survives_a_failed_cycle(self):
+        """An error escaping a cycle is logged and the next cycle still runs."""
+        for module in (auto_scraper, manual_scraper):
+            with self.subTest(module=module.__name__):
+                cycles = []
+
+                def run_scrapers():
+                    cycles.append(1)
+                    if len(cycles) == 1:
+                        raise RuntimeError("cache unavailable")
+                    raise KeyboardInterrupt  # Stop the loop after the second cycle
+
+                with mock.patch.object(module, "run_scrapers", run_scrapers), \
+                     mock.patch.object(module, "get_journal", return_value=self.journal), \
+                     mock.patch.object(module.time, "sleep"), \
+                     self.assertLogs(level="ERROR") as logs:
+                    with self.assertRaises(KeyboardInterrupt):
+                        module.run_forever()
+                self.assertEqual(len(cycles), 2, "Scraping stopped after a failed cycle.")
+                self.assertIn("cache unavailable", logs.output[0])
+
+    def test_undelivered_alert_stays_owed(self):
+        """An alert a sink failed to send is left in the journal for the restart to replay."""
+        for module in (auto_scraper, manual_scraper):
+            with self.subTest(module=module.__name__):
+                notifier = mock.Mock()
+                notifier.notify.side_effect = lambda *args, on_done: on_done(False)
+                with mock.patch.object(module, "get_journal", return_value=self.journal), \
+                     mock.patch.object(module, "get_notifier", return_value=notifier), \
+                     self.assertLogs(level="WARNING"):
+                    pending = self.journal.save_lead("Reddit", f"{module.__name__}1", "Lead", "content",
+                                                     "https://example.com/1")
+                    module.dispatch_lead(pending)
+                    self.assertIn(pending["post_id"], [owed["post_id"] for owed in self.journal.pending()])
+                    notifier.notify.side_effect = lambda *args, on_done: on_done(True)
+                    module.dispatch_lead(pending)
+                self.journal.manager.submit(lambda conn: None).result()  # Wait for the resolve write
+                self.assertNotIn(pending["post_id"], [owed["post_id"] for owed in self.journal.pending()])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+import storage
+from database import Database
+
+class TestStorage(unittest.TestCase):
+    """Unit tests for the unified lead store and its schema migrations."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp.name, "leads.db")
+
+    def tearDown(self):
+        storage.close_all()
+        self.tmp.cleanup()
+
+    def test_fresh_database_is_fully_migrated(self):
+        """A new database ends at the latest schema version with every table present."""
+        storage.init_db(self.db_file)
+        conn = storage.get_manager(self.db_file).connection()
+        self.assertEqual(storage.schema_version(conn), storage.MIGRATIONS[-1][0], "Schema is not at the latest version.")
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        for table in ("leads", "posts", "comments", "leads_fts"):
+            self.assertIn(table, tables, f"⚠️ Missing {table} table.")
+
+    def test_migrates_manual_scraper_schema(self):
+        """A leads.db created without draft_generated gains the column and keeps its rows."""
+        conn = sqlite3.connect(self.db_file)
+        conn.execute(
+            """CREATE TABLE leads (id INTEGER PRIMARY KEY AUTOINCREMENT, platform TEXT, post_id TEXT UNIQUE,
+            title TEXT, content TEXT, link TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)"""
+        )
+        conn.execute("INSERT INTO leads (platform, post_id, title, content, link) VALUES ('Reddit', 'a1', 't', 'c', 'l')")
+        conn.commit()
+        conn.close()
+
+        storage.mark_draft_generated("a1", db_file=self.db_file)
+        rows = storage.get_leads(db_file=self.db_file)
+        self.assertEqual(len(rows), 1, "Existing lead was lost during migration.")
+        self.assertEqual(rows[0][storage.LEAD_COLUMNS.index("draft_generated")], 1, "draft_generated was not added.")
+
+    def test_post_ids_rekeyed_to_canonical(self):
+        """Leads keyed the old way are rekeyed from their links, keeping the earliest of any duplicates."""
+        conn = sqlite3.connect(self.db_file)
+        storage.migrate(conn, target=8)
+        old = [
+            ("Reddit", "best_bot", "https://www.reddit.com/r/algotrading/comments/1AbC23/best_bot/"),
+            ("Reddit", "best_bot_v2", "https://old.reddit.com/r/algotrading/comments/1abc23/best_bot/?utm_source=x"),
+            ("Twitter", "alice", "https://x.com/alice/status/42"),
+            ("Twitter", "42", "https://twitter.com/bob/status/7"),  # Takes an ID another row is moving off
+            ("Upwork", "custom", "https://example.com/job"),
+        ]
+        conn.executemany("INSERT INTO leads (platform, post_id, title, content, link) VALUES (?, ?, 't', 'c', ?)",
+                         [(platform, post_id, link) for platform, post_id, link in old])
+        conn.execute("INSERT INTO pending_leads (post_id, platform, alert, created_at) VALUES ('alice', 'Twitter', 1, 0)")
+        conn.commit()
+        storage.migrate(conn)
+        self.assertEqual(conn.execute("SELECT post_id FROM leads ORDER BY id").fetchall(),
+                         [("1abc23",), ("42",), ("7",), ("custom",)])
+        self.assertEqual(conn.execute("SELECT post_id FROM pending_leads").fetchall(), [("42",)])
+        conn.close()
+
+    def test_migrate_is_idempotent(self):
+        """Running migrate again on an up-to-date database is a no-op."""
+        conn = sqlite3.connect(self.db_file)
+        first = storage.migrate(conn)
+        self.assertEqual(storage.migrate(conn), first, "Re-running migrations changed the version.")
+        conn.close()
+
+    def test_save_lead_and_search(self):
+        """Leads are deduplicated on post_id and indexed for full-text search."""
+        self.assertTrue(storage.save_lead("Reddit", "p1", "need automation help", "Looking for a Python bot", "l", db_file=self.db_file))
+        self.assertFalse(storage.save_lead("Reddit", "p1", "duplicate", "dup", "l", db_file=self.db_file))
+
+        results = storage.search_leads("python", db_file=self.db_file)
+        self.assertEqual([row[2] for row in results], ["p1"], "Full-text search did not find the lead.")
+
+    def test_save_lead_details(self):
+        """Normalized fields are stored with the lead; unknown ones are rejected."""
+        storage.save_lead("Upwork", "01ab", "Scraper", "c", "l", db_file=self.db_file, author="acme", budget="$500")
+        row = storage.get_manager(self.db_file).connection().execute(
+            "SELECT author, posted, budget, contact FROM leads WHERE post_id = '01ab'"
+        ).fetchone()
+        self.assertEqual(row, ("acme", None, "$500", None))
+        with self.assertRaises(TypeError):
+            storage.save_lead("Upwork", "01ac", "Scraper", "c", "l", db_file=self.db_file, salary="$1")
+
+    def test_search_without_fts_index(self):
+        """Search falls back to a substring scan when leads_fts could not be created."""
+        storage.save_lead("Reddit", "p1", "Need a python developer", "Build a bot", "l1", db_file=self.db_file)
+        storage.get_manager(self.db_file).write(lambda conn: conn.execute("DROP TABLE leads_fts"))
+        results = storage.search_leads("python", db_file=self.db_file)
+        self.assertEqual([row[2] for row in results], ["p1"], "Fallback search did not find the lead.")
+
+    def test_database_shares_storage_writer(self):
+        """A Database on the store's file reuses storage's manager instead of starting a second writer."""
+        db = Database(db_name=self.db_file)
+        self.assertIs(db.manager, storage.get_manager(self.db_file), "Database opened its own manager.")
+
+    def test_import_legacy(self):
+        """Posts and comments from scraper_data.db are copied into the unified store."""
+        legacy = Database(db_name=os.path.join(self.tmp.name, "scraper_data.db"))
+        legacy.insert_post("Reddit", "123abc", "TraderJoe", "Post", "https://reddit.com/test")
+        legacy.insert_comment("Reddit", "123abc", "456def", "InvestorMike", "Comment")
+        legacy.close()
+
+        copied = storage.import_legacy(os.path.join(self.tmp.name, "scraper_data.db"), db_file=self.db_file)
+        self.assertEqual(copied, (1, 1), "Legacy rows were not imported.")
+
+if __name__ == "__main__":
+    unittest.main()